@@ -0,0 +1,180 @@
+# Copyright (c) 2021-2022, Ethan Henderson, Jonxslays
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import typing as t
+from pathlib import Path
+
+import len8
+from benchmarks.corpus import Corpus, generate
+from len8.exclude import ExcludeMatcher
+
+# Excludes that are typical of real configurations, on top of the
+# defaults.
+EXCLUDES = ("build", "dist", "docs/conf.py", "**/migrations/*.py", "*_pb2.py")
+
+
+def _time(func: t.Callable[[], t.Any], repeat: int) -> t.Dict[str, t.Any]:
+    runs = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - start)
+
+    return {
+        "min": min(runs),
+        "median": statistics.median(runs),
+        "runs": runs,
+    }
+
+
+def run(
+    project: Path, *, repeat: int = 5, workers: int = 1
+) -> t.Dict[str, t.Dict[str, t.Any]]:
+    """Time each phase of a check of a generated tree.
+
+    Args:
+        project: ``pathlib.Path``
+            The tree to check.
+
+    Keyword Args:
+        repeat: ``int``
+            How many times to time each phase. Defaults to ``5``.
+        workers: ``int``
+            The number of processes to check files with. Defaults to
+            ``1``.
+
+    Returns:
+        ``dict[str, dict[str, Any]]``
+            The timings of each phase, in seconds.
+    """
+    checker = len8.Checker(exclude=list(EXCLUDES), workers=workers)
+    files = list(checker._iter_files([project]))
+    # Every path in the tree, excluded or not, so matching is timed on
+    # the whole of it.
+    paths = list(project.rglob("*"))
+
+    def check() -> None:
+        checker.check(project)
+
+    def traverse() -> None:
+        for _ in checker._iter_files([project]):
+            pass
+
+    def match() -> None:
+        matcher = ExcludeMatcher(checker.exclude)
+        for p in paths:
+            matcher.match(p)
+
+    check()
+    reports = checker.reports
+
+    def formatting() -> None:
+        len8.format_report(v for r in reports for v in r)
+
+    return {
+        "check": _time(check, repeat),
+        "traversal": _time(traverse, repeat),
+        "exclude_matching": _time(match, repeat),
+        "formatting": _time(formatting, repeat),
+        "counts": {
+            "files": len(files),
+            "paths": len(paths),
+            "problems": sum(len(r) for r in reports),
+        },
+    }
+
+
+def main(argv: t.Optional[t.Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Time len8 against a synthetic source tree.",
+    )
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--lines", type=int, default=200)
+    parser.add_argument("--long-ratio", type=float, default=0.02)
+    parser.add_argument("--docs-ratio", type=float, default=0.25)
+    parser.add_argument("--unicode-ratio", type=float, default=0.05)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--venv-files", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("-j", "--jobs", type=int, default=1)
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        help="The file to write results to. Defaults to stdout.",
+    )
+    args = parser.parse_args(argv)
+
+    corpus = Corpus(
+        files=args.files,
+        lines=args.lines,
+        long_ratio=args.long_ratio,
+        docs_ratio=args.docs_ratio,
+        unicode_ratio=args.unicode_ratio,
+        depth=args.depth,
+        venv_files=args.venv_files,
+        seed=args.seed,
+    )
+
+    with tempfile.TemporaryDirectory() as root:
+        project = generate(root, corpus)
+        results = run(project, repeat=args.repeat, workers=args.jobs)
+
+    output = json.dumps(
+        {
+            "len8": len8.__version__,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "workers": args.jobs,
+            "corpus": corpus.as_dict(),
+            "results": results,
+        },
+        indent=2,
+    )
+
+    if args.output:
+        args.output.write_text(output + "\n")
+    else:
+        print(output)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+# Copyright (c) 2021-2022, Ethan Henderson, Jonxslays
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+__all__ = ["Corpus", "generate"]
+
+import os
+import random
+import typing as t
+from pathlib import Path
+
+WORDS = (
+    "alpha beta gamma delta value result config handler request "
+    "response session buffer payload record index cursor token"
+).split()
+UNICODE_WORDS = ("café", "naïve", "résumé", "日本語", "данные", "🐍")
+
+
+class Corpus:
+    """The settings for a synthetic source tree.
+
+    Keyword Args:
+        files: ``int``
+            The number of files to check. Defaults to ``1000``.
+        lines: ``int``
+            The number of lines in each file. Defaults to ``200``.
+        long_ratio: ``float``
+            The ratio of lines which are too long. Defaults to ``0.02``.
+        docs_ratio: ``float``
+            The ratio of lines which are docstrings or comments.
+            Defaults to ``0.25``.
+        unicode_ratio: ``float``
+            The ratio of lines containing non-ASCII characters. Defaults
+            to ``0.05``.
+        depth: ``int``
+            How deeply the files are nested. Defaults to ``4``.
+        venv_files: ``int``
+            The number of files in an excluded virtual environment.
+            Defaults to ``2000``.
+        seed: ``int``
+            The seed to generate files with, so trees are reproducible.
+            Defaults to ``0``.
+    """
+
+    __slots__: t.Sequence[str] = (
+        "_files",
+        "_lines",
+        "_long_ratio",
+        "_docs_ratio",
+        "_unicode_ratio",
+        "_depth",
+        "_venv_files",
+        "_seed",
+    )
+
+    def __init__(
+        self,
+        *,
+        files: int = 1000,
+        lines: int = 200,
+        long_ratio: float = 0.02,
+        docs_ratio: float = 0.25,
+        unicode_ratio: float = 0.05,
+        depth: int = 4,
+        venv_files: int = 2000,
+        seed: int = 0,
+    ) -> None:
+        for name, ratio in (
+            ("long_ratio", long_ratio),
+            ("docs_ratio", docs_ratio),
+            ("unicode_ratio", unicode_ratio),
+        ):
+            if not 0 <= ratio <= 1:
+                raise ValueError(f"'{name}' should be between 0 and 1")
+
+        if files < 0 or lines < 0 or venv_files < 0 or depth < 0:
+            raise ValueError("corpus sizes cannot be less than 0")
+
+        self._files = files
+        self._lines = lines
+        self._long_ratio = long_ratio
+        self._docs_ratio = docs_ratio
+        self._unicode_ratio = unicode_ratio
+        self._depth = depth
+        self._venv_files = venv_files
+        self._seed = seed
+
+    def as_dict(self) -> t.Dict[str, t.Union[int, float]]:
+        """The settings as a dictionary, for reporting.
+
+        Returns:
+            ``dict[str, int | float]``
+        """
+        return {name[1:]: getattr(self, name) for name in self.__slots__}
+
+
+def _text(rng: random.Random, width: int, unicode: bool) -> str:
+    words: t.List[str] = []
+    length = 0
+
+    while length < width:
+        word = rng.choice(WORDS)
+        if unicode and not words:
+            word = rng.choice(UNICODE_WORDS)
+
+        words.append(word)
+        length += len(word) + 1
+
+    return " ".join(words)[:width].rstrip()
+
+
+def _source(corpus: Corpus, rng: random.Random) -> str:
+    out: t.List[str] = []
+    in_docs = False
+    budget = corpus._lines
+
+    while len(out) < budget:
+        unicode = rng.random() < corpus._unicode_ratio
+        long = rng.random() < corpus._long_ratio
+
+        if in_docs or rng.random() < corpus._docs_ratio:
+            width = rng.randint(73, 110) if long else rng.randint(10, 68)
+
+            if in_docs:
+                out.append(f"    {_text(rng, width - 4, unicode)}")
+                if rng.random() < 0.3:
+                    out.append('    """')
+                    in_docs = False
+            elif rng.random() < 0.5:
+                out.append(f"# {_text(rng, width - 2, unicode)}")
+            else:
+                out.append(f"def function_{len(out)}() -> None:")
+                out.append(f'    """{_text(rng, width - 7, unicode)}')
+                in_docs = True
+            continue
+
+        width = rng.randint(80, 130) if long else rng.randint(0, 76)
+        name = f"value_{len(out)}"
+        text = _text(rng, max(width - len(name) - 5, 1), unicode)
+        out.append(f'{name} = "{text}"')
+
+    if in_docs:
+        out.append('    """')
+
+    return "\n".join(out) + "\n"
+
+
+def _write(path: Path, source: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(source, encoding="utf-8")
+
+
+def generate(root: t.Union[str, Path], corpus: Corpus) -> Path:
+    """Generate a synthetic source tree.
+
+    The files to check are written to a ``project`` directory, and the
+    virtual environment to ``project/.venv``.
+
+    Args:
+        root: ``str`` | ``pathlib.Path``
+            The directory to generate the tree in.
+        corpus: ``Corpus``
+            The settings for the tree.
+
+    Returns:
+        ``pathlib.Path``
+            The ``project`` directory.
+    """
+    rng = random.Random(corpus._seed)
+    project = Path(root) / "project"
+
+    for i in range(corpus._files):
+        parts = [f"package_{rng.randrange(4)}"]
+        parts.extend(
+            f"module_{rng.randrange(3)}"
+            for _ in range(rng.randint(0, corpus._depth))
+        )
+        _write(project.joinpath(*parts, f"file_{i}.py"), _source(corpus, rng))
+
+    venv = project / ".venv" / "lib" / "site-packages"
+    for i in range(corpus._venv_files):
+        name = f"dist_{i % 50}{os.sep}module_{i}.py"
+        _write(venv / name, _source(corpus, rng))
+
+    return project
@@ -27,12 +27,23 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 __all__ = [
+    "AsyncChecker",
     "BadLines",
+    "Baseline",
+    "Cache",
     "Checker",
     "Config",
+    "ConfigResolver",
     "ConfigurationError",
+    "DaemonError",
+    "FileReport",
+    "GitError",
     "InvalidPath",
     "Len8Error",
+    "MemoryCache",
+    "Stats",
+    "Violation",
+    "format_report",
 ]
 
 __productname__ = "len8"
@@ -46,5 +57,50 @@ __bugtracker__ = "https://github.com/parafoxia/len8/issues"
 __ci__ = "https://github.com/parafoxia/len8/actions"
 __changelog__ = "https://github.com/parafoxia/len8/releases"
 
-from .checker import Checker, Config
+import sys as _sys
+import typing as _t
+
 from .errors import *
+
+# Submodules are only imported when one of their names is first used,
+# so the CLI and pre-commit hooks don't pay for what they don't use.
+_LAZY = {
+    "AsyncChecker": "aio",
+    "Baseline": "baseline",
+    "Cache": "cache",
+    "MemoryCache": "cache",
+    "Checker": "checker",
+    "Config": "checker",
+    "ConfigResolver": "checker",
+    "FileReport": "report",
+    "Violation": "report",
+    "format_report": "report",
+    "Stats": "stats",
+}
+
+if _t.TYPE_CHECKING or _sys.version_info < (3, 7):
+    # Module-level __getattr__ is not supported before Python 3.7.
+    from .aio import AsyncChecker
+    from .baseline import Baseline
+    from .cache import Cache, MemoryCache
+    from .checker import Checker, Config, ConfigResolver
+    from .report import FileReport, Violation, format_report
+    from .stats import Stats
+
+else:
+    import importlib as _importlib
+
+    def __getattr__(name: str) -> _t.Any:
+        try:
+            module = _importlib.import_module(f".{_LAZY[name]}", __name__)
+        except KeyError:
+            raise AttributeError(
+                f"module {__name__!r} has no attribute {name!r}"
+            ) from None
+
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+
+    def __dir__() -> _t.List[str]:
+        return sorted({*globals(), *__all__})
@@ -0,0 +1,208 @@
+# Copyright (c) 2021-2022, Ethan Henderson, Jonxslays
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+__all__ = ["AsyncChecker"]
+
+import asyncio
+import typing as t
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from len8 import errors
+from len8.checker import Checker, LineRanges
+from len8.report import FileReport, Violation, format_report
+
+
+class AsyncChecker:
+    """An object used to check line lengths without blocking an event
+    loop. Directory walking, file reads, and line checks all happen in
+    a bounded pool of threads, and results are produced in the same
+    order, and using the same rules, as the wrapped :obj:`Checker`.
+
+    Args:
+        checker: ``len8.Checker`` | ``None``
+            The checker to take settings from. Defaults to a new
+            checker with the default settings.
+
+    Keyword Args:
+        max_open_files: ``int``
+            The maximum number of files being read and checked at once.
+            Defaults to ``8``.
+    """
+
+    __slots__: t.Sequence[str] = ("_checker", "_max_open_files")
+
+    def __init__(
+        self, checker: t.Optional[Checker] = None, *, max_open_files: int = 8
+    ) -> None:
+        if max_open_files < 1:
+            raise ValueError("'max_open_files' cannot be less than 1")
+
+        self._checker = checker or Checker()
+        self._max_open_files = max_open_files
+
+    @property
+    def checker(self) -> Checker:
+        """The checker settings are taken from.
+
+        Returns:
+            ``len8.Checker``
+        """
+        return self._checker
+
+    @property
+    def max_open_files(self) -> int:
+        """The maximum number of files being read and checked at once.
+
+        Returns:
+            ``int``
+        """
+        return self._max_open_files
+
+    async def iter_reports(
+        self,
+        *paths: t.Union[Path, str],
+        lines: t.Optional[LineRanges] = None,
+    ) -> t.AsyncIterator[FileReport]:
+        """Check to ensure the line lengths conform to PEP 8 standards,
+        yielding a report for each file as soon as it, and every file
+        before it, has been checked.
+
+        If the iteration is cancelled or closed early, files which have
+        not been started are skipped, and the cache is not saved.
+
+        Args:
+            *paths: ``Path`` | ``str``
+                The path or paths to check.
+
+        Keyword Args:
+            lines: ``dict[pathlib.Path | str, list[tuple[int, int]]]``
+                If given, only lines inside these inclusive
+                ``(start, end)`` ranges are reported. Defaults to
+                ``None``, which reports every line.
+
+        Returns:
+            ``AsyncIterator[len8.FileReport]``
+
+        Raises:
+            :obj:`InvalidPath`:
+                If strict mode is set to ``True`` and the given path
+                does not exist.
+        """
+        loop = asyncio.get_event_loop()
+        checker = self._checker
+        cache = checker.cache
+        ranges = None
+        pending: t.Deque["asyncio.Future[FileReport]"] = deque()
+        executor = ThreadPoolExecutor(max_workers=self._max_open_files)
+
+        if lines is not None:
+            ranges = {f"{Path(p).resolve()}": r for p, r in lines.items()}
+
+        def _walk() -> t.List[Path]:
+            return list(checker._iter_files(paths))
+
+        def _check(path: Path) -> FileReport:
+            report = checker._check(path)
+            if ranges is not None:
+                report = report.filter(ranges.get(report.path, ()))
+
+            return checker._without_known(report)
+
+        try:
+            files = await loop.run_in_executor(executor, _walk)
+
+            if cache is not None:
+                await loop.run_in_executor(executor, cache.load)
+
+            for path in files:
+                pending.append(loop.run_in_executor(executor, _check, path))
+
+                if len(pending) >= self._max_open_files:
+                    yield await pending.popleft()
+
+            while pending:
+                yield await pending.popleft()
+
+            if cache is not None:
+                await loop.run_in_executor(executor, cache.save, paths)
+
+        finally:
+            for future in pending:
+                future.cancel()
+
+            executor.shutdown(wait=False)
+
+    async def iter_check(
+        self,
+        *paths: t.Union[Path, str],
+        lines: t.Optional[LineRanges] = None,
+    ) -> t.AsyncIterator[Violation]:
+        """Check to ensure the line lengths conform to PEP 8 standards,
+        yielding each problem as soon as the file it is in has been
+        checked. This takes the same arguments as :obj:`iter_reports`.
+
+        Returns:
+            ``AsyncIterator[len8.Violation]``
+        """
+        async for report in self.iter_reports(*paths, lines=lines):
+            for violation in report:
+                yield violation
+
+    async def check(
+        self,
+        *paths: t.Union[Path, str],
+        lines: t.Optional[LineRanges] = None,
+    ) -> t.Optional[str]:
+        """Check to ensure the line lengths conform to PEP 8 standards.
+        This takes the same arguments as :obj:`iter_reports`, and
+        stores the results on the wrapped checker.
+
+        Returns:
+            ``str`` | ``None``
+                A formatted string containing the lines that were too
+                long, or ``None`` if there were none.
+
+        Raises:
+            :obj:`InvalidPath`:
+                If strict mode is set to ``True`` and the given path
+                does not exist.
+            :obj:`BadLines`:
+                If strict mode is set to ``True`` and the files that
+                were checked contained lines what were too long.
+        """
+        reports = [
+            r async for r in self.iter_reports(*paths, lines=lines) if len(r)
+        ]
+        self._checker._bad_lines = reports
+
+        if reports and self._checker.strict:
+            raise errors.BadLines(self._checker.bad_lines)
+
+        return format_report(v for r in reports for v in r)
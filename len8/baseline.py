@@ -0,0 +1,263 @@
+# Copyright (c) 2021-2022, Ethan Henderson, Jonxslays
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+__all__ = ["Baseline"]
+
+import hashlib
+import itertools
+import json
+import os
+import typing as t
+from pathlib import Path
+
+from len8 import errors
+from len8.report import FileReport, Violation
+
+# The version of the file format, which is independent of len8's own,
+# so baselines survive upgrades.
+_VERSION = 1
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+def _digest(chunks: t.Iterable[bytes]) -> str:
+    # Lines are hashed without their surrounding whitespace, so
+    # reindenting a line keeps it in the baseline. Long lines can be
+    # hashed a chunk at a time.
+    digest = hashlib.blake2b(digest_size=8)
+
+    for chunk in chunks:
+        digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def _read_lines(file: str) -> t.Optional[t.List[bytes]]:
+    # Lines are split as the checker splits them, so the numbers match.
+    try:
+        with open(file, "rb") as f:
+            return f.read().splitlines()
+    except OSError:
+        return None
+
+
+class Baseline:
+    """A record of known problems, which are left out of reports so
+    only new problems fail a check.
+
+    Problems are keyed by the path of their file, relative to the root,
+    and a hash of the content of their line, so they stay known when
+    lines above them are added or removed. Each key is counted, so
+    adding a copy of a known long line is still reported.
+
+    Args:
+        root: ``pathlib.Path`` | ``str``
+            The directory paths are stored relative to. Files outside
+            of it are stored by their resolved path. Defaults to the
+            current working directory.
+    """
+
+    __slots__: t.Sequence[str] = ("_root", "_entries")
+
+    def __init__(self, root: t.Union[Path, str] = ".") -> None:
+        self._root = Path(root).resolve()
+        self._entries: t.Dict[str, t.Dict[str, int]] = {}
+
+    def __len__(self) -> int:
+        return sum(sum(c.values()) for c in self._entries.values())
+
+    @property
+    def root(self) -> Path:
+        """The resolved directory paths are stored relative to.
+
+        Returns:
+            ``pathlib.Path``
+        """
+        return self._root
+
+    @classmethod
+    def load(cls, file: t.Union[Path, str]) -> "Baseline":
+        """Read a baseline written by :obj:`save`. Its paths are taken
+        to be relative to the directory the file is in.
+
+        Args:
+            file: ``pathlib.Path`` | ``str``
+                The file to read. Files compressed with gzip are
+                decompressed, whatever their name.
+
+        Returns:
+            ``len8.Baseline``
+
+        Raises:
+            :obj:`ConfigurationError`:
+                If the file cannot be read, or is not a baseline.
+        """
+        baseline = cls(Path(file).resolve().parent)
+
+        try:
+            with open(file, "rb") as f:
+                data = f.read()
+
+            if data.startswith(_GZIP_MAGIC):
+                import gzip
+
+                data = gzip.decompress(data)
+
+            content = json.loads(data.decode("utf-8"))
+
+        except (OSError, ValueError) as e:
+            raise errors.ConfigurationError(
+                f"the baseline '{file}' could not be read ({e})"
+            ) from None
+
+        if (
+            not isinstance(content, dict)
+            or content.get("version") != _VERSION
+            or not isinstance(content.get("files"), dict)
+        ):
+            raise errors.ConfigurationError(f"'{file}' is not a len8 baseline")
+
+        for path, digests in content["files"].items():
+            counts = baseline._entries[path] = {}
+
+            for digest in digests:
+                counts[digest] = counts.get(digest, 0) + 1
+
+        return baseline
+
+    def save(self, file: t.Union[Path, str]) -> None:
+        """Write the baseline to a file. Paths and hashes are sorted,
+        so baselines of the same problems are identical and diff well.
+        The file is compressed with gzip if its name ends in ``.gz``.
+
+        Args:
+            file: ``pathlib.Path`` | ``str``
+                The file to write.
+        """
+        content = {
+            "version": _VERSION,
+            "files": {
+                path: sorted(
+                    itertools.chain.from_iterable(
+                        itertools.repeat(d, c) for d, c in counts.items()
+                    )
+                )
+                for path, counts in sorted(self._entries.items())
+            },
+        }
+        data = json.dumps(content, separators=(",", ":")).encode("utf-8")
+
+        tmp = f"{file}.tmp"
+
+        if f"{file}".endswith(".gz"):
+            import gzip
+
+            # Without a timestamp, the same baseline compresses to the
+            # same bytes.
+            with open(tmp, "wb") as f:
+                with gzip.GzipFile("", "wb", fileobj=f, mtime=0) as g:
+                    g.write(data)
+        else:
+            with open(tmp, "wb") as f:
+                f.write(data)
+
+        os.replace(tmp, file)
+
+    def _key(self, path: str) -> str:
+        resolved = Path(path).resolve()
+
+        try:
+            return resolved.relative_to(self._root).as_posix()
+        except ValueError:
+            return resolved.as_posix()
+
+    def add(self, violations: t.Iterable[Violation]) -> int:
+        """Add problems to the baseline. Each file is read once for
+        every run of its problems, so problems should be grouped by
+        file, as checkers yield them.
+
+        Args:
+            violations: ``Iterable[len8.Violation]``
+                The problems to add.
+
+        Returns:
+            ``int``
+                The number of problems added. Problems in files which
+                cannot be read are skipped.
+        """
+        added = 0
+
+        for path, group in itertools.groupby(violations, lambda v: v.path):
+            lines = _read_lines(path)
+            if lines is None:
+                continue
+
+            counts = self._entries.setdefault(self._key(path), {})
+
+            for violation in group:
+                if violation.line <= len(lines):
+                    digest = _digest((lines[violation.line - 1].strip(),))
+                    counts[digest] = counts.get(digest, 0) + 1
+                    added += 1
+
+        return added
+
+    def filter(self, report: FileReport) -> FileReport:
+        """Create a new report without the problems in the baseline.
+        Problems are matched by the hashes of their lines the checker
+        recorded while scanning, so files are never read again. Reports
+        without hashes are returned unchanged.
+
+        Args:
+            report: ``len8.FileReport``
+                The report to filter.
+
+        Returns:
+            ``len8.FileReport``
+        """
+        known = self._entries.get(self._key(report.path)) if report else None
+        hashes = report.hashes
+        if not known or hashes is None:
+            return report
+
+        # Counts are used up as lines match, so each known problem can
+        # only hide one line.
+        known = dict(known)
+        filtered = FileReport(
+            report.path, regions=report.regions, hashes=hashes
+        )
+
+        for v in report:
+            digest = hashes.get(v.line)
+
+            if digest is not None and known.get(digest):
+                known[digest] -= 1
+                continue
+
+            filtered.append(v.line, v.chars, v.limit)
+
+        return filtered
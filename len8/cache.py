@@ -0,0 +1,401 @@
+# Copyright (c) 2021-2022, Ethan Henderson, Jonxslays
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+__all__ = ["Cache", "MemoryCache"]
+
+import contextlib
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import tempfile
+import typing as t
+from pathlib import Path
+
+import len8
+from len8.report import FileReport
+
+CheckedPaths = t.Optional[t.Iterable[t.Union[Path, str]]]
+
+
+def _stale(entries: t.Iterable[str], paths: CheckedPaths) -> t.List[str]:
+    # Only entries under the checked paths are stat'ed, so small checks
+    # stay cheap however many files the cache holds.
+    if paths is None:
+        return [p for p in entries if not os.path.isfile(p)]
+
+    roots = tuple(f"{Path(p).resolve()}" for p in paths)
+    prefixes = tuple(f"{r.rstrip(os.sep)}{os.sep}" for r in roots)
+    return [
+        p
+        for p in entries
+        if (p in roots or p.startswith(prefixes)) and not os.path.isfile(p)
+    ]
+
+
+class Cache:
+    """A persistent, on-disk store of per-file check results.
+
+    Entries are keyed by the resolved path of the file, and are only
+    reused when the file's modification time, size, and the line
+    lengths and engine it was checked with are unchanged. If only the
+    modification time differs, the content digest is compared before
+    the file is rescanned.
+
+    Args:
+        directory: ``pathlib.Path`` | ``str``
+            The directory to store the cache in. Defaults to
+            ``.len8_cache``.
+    """
+
+    __slots__: t.Sequence[str] = ("_directory", "_entries", "_dirty")
+
+    def __init__(self, directory: t.Union[Path, str] = ".len8_cache") -> None:
+        if not isinstance(directory, Path):
+            directory = Path(directory)
+
+        self._directory = directory
+        self._entries: t.Dict[str, t.Dict[str, t.Any]] = {}
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def directory(self) -> Path:
+        """The directory the cache is stored in.
+
+        Returns:
+            ``pathlib.Path``
+        """
+        return self._directory
+
+    @property
+    def file(self) -> Path:
+        """The file the cache entries are stored in.
+
+        Returns:
+            ``pathlib.Path``
+        """
+        return self._directory / "results.json"
+
+    @staticmethod
+    def digest(data: t.Union[bytes, mmap.mmap]) -> str:
+        """Generate the content digest for a file's data.
+
+        Args:
+            data: ``bytes`` | ``mmap.mmap``
+                The contents of the file.
+
+        Returns:
+            ``str``
+        """
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    def load(self) -> None:
+        """Load the cache from disk. Caches written by other versions
+        of len8, or that cannot be read, are discarded.
+        """
+        self._entries = {}
+        self._dirty = False
+
+        try:
+            with open(self.file, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if (
+            not isinstance(data, dict)
+            or data.get("version") != len8.__version__
+        ):
+            return
+
+        self._entries = data.get("files", {})
+
+    def save(self, paths: CheckedPaths = None) -> None:
+        """Write the cache to disk, evicting entries for files which no
+        longer exist. Failing to write the cache is not an error, as
+        the next check only has to scan files again.
+
+        Args:
+            paths: ``Iterable[pathlib.Path | str]`` | ``None``
+                The paths which were checked. Only entries for files
+                under them are evicted. Defaults to ``None``, which
+                evicts entries under any path.
+        """
+        for path in _stale(self._entries, paths):
+            del self._entries[path]
+            self._dirty = True
+
+        if not self._dirty:
+            return
+
+        try:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            ignore = self._directory / ".gitignore"
+            if not ignore.is_file():
+                ignore.write_text("# Created by len8 automatically.\n*\n")
+
+            # Each writer has its own temporary file, so checks running
+            # at once, such as pre-commit batches, don't collide.
+            fd, tmp = tempfile.mkstemp(
+                prefix="results.", suffix=".tmp", dir=self._directory
+            )
+
+        except OSError:
+            return
+
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"version": len8.__version__, "files": self._entries},
+                    f,
+                    separators=(",", ":"),
+                )
+
+            os.replace(tmp, self.file)
+
+        except OSError:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp)
+            return
+
+        self._dirty = False
+
+    def clear(self) -> None:
+        """Remove all entries, and delete the cache directory."""
+        self._entries = {}
+        self._dirty = False
+        shutil.rmtree(self._directory, ignore_errors=True)
+
+    @staticmethod
+    def _report(path: str, entry: t.Dict[str, t.Any]) -> FileReport:
+        regions = entry.get("regions")
+        if regions is not None:
+            regions = [(s, e) for s, e in regions]
+
+        hashes = entry.get("hashes")
+        if hashes is not None:
+            hashes = dict(zip(entry["results"][0], hashes))
+
+        report = FileReport(path, regions=regions, hashes=hashes)
+        report.lines.fromlist(entry["results"][0])
+        report.chars.fromlist(entry["results"][1])
+        report.limits.fromlist(entry["results"][2])
+        return report
+
+    def get(
+        self,
+        path: str,
+        stat: os.stat_result,
+        code_length: int,
+        docs_length: int,
+        engine: str = "fast",
+    ) -> t.Optional[FileReport]:
+        """Get the cached results for a file if it is unchanged.
+
+        Args:
+            path: ``str``
+                The resolved path of the file.
+            stat: ``os.stat_result``
+                The current stat result of the file.
+            code_length: ``int``
+                The maximum line length for code.
+            docs_length: ``int``
+                The maximum line length for comments and documentation.
+            engine: ``str``
+                The engine used to classify lines. Defaults to
+                ``"fast"``.
+
+        Returns:
+            ``len8.FileReport`` | ``None``
+                The cached report, or ``None`` if the file needs to be
+                rescanned.
+        """
+        entry = self._entries.get(path)
+
+        if (
+            entry is None
+            or entry["mtime"] != stat.st_mtime_ns
+            or entry["size"] != stat.st_size
+            or entry["lengths"] != [code_length, docs_length]
+            or entry.get("engine", "fast") != engine
+        ):
+            return None
+
+        return self._report(path, entry)
+
+    def get_digest(
+        self,
+        path: str,
+        code_length: int,
+        docs_length: int,
+        engine: str = "fast",
+    ) -> t.Optional[str]:
+        """Get the content digest of a file's cached results, so long as
+        they were checked against the same line lengths and engine.
+
+        Args:
+            path: ``str``
+                The resolved path of the file.
+            code_length: ``int``
+                The maximum line length for code.
+            docs_length: ``int``
+                The maximum line length for comments and documentation.
+            engine: ``str``
+                The engine used to classify lines. Defaults to
+                ``"fast"``.
+
+        Returns:
+            ``str`` | ``None``
+        """
+        entry = self._entries.get(path)
+
+        if (
+            entry is None
+            or entry["lengths"] != [code_length, docs_length]
+            or entry.get("engine", "fast") != engine
+        ):
+            return None
+
+        return t.cast(str, entry["digest"])
+
+    def get_regions(
+        self, path: str
+    ) -> t.Optional[t.Tuple[str, t.List[t.Tuple[int, int]]]]:
+        """Get the documentation regions found in a file the last time
+        it was classified by the ``"tokenize"`` engine, along with the
+        digest of its content at the time. Regions don't depend on line
+        lengths, so they can be reused whenever the content matches.
+
+        Args:
+            path: ``str``
+                The resolved path of the file.
+
+        Returns:
+            ``tuple[str, list[tuple[int, int]]]`` | ``None``
+        """
+        entry = self._entries.get(path)
+
+        if entry is None or entry.get("regions") is None:
+            return None
+
+        return entry["digest"], [(s, e) for s, e in entry["regions"]]
+
+    def update(
+        self,
+        path: str,
+        stat: os.stat_result,
+        digest: str,
+        code_length: int,
+        docs_length: int,
+        report: t.Optional[FileReport],
+        engine: str = "fast",
+    ) -> FileReport:
+        """Store the results for a file.
+
+        Args:
+            path: ``str``
+                The resolved path of the file.
+            stat: ``os.stat_result``
+                The stat result of the file when it was read.
+            digest: ``str``
+                The content digest of the file.
+            code_length: ``int``
+                The maximum line length for code.
+            docs_length: ``int``
+                The maximum line length for comments and documentation.
+            report: ``len8.FileReport`` | ``None``
+                The report for the file. Passing ``None`` keeps the
+                report of the existing entry, whose content is known to
+                be unchanged.
+            engine: ``str``
+                The engine used to classify lines. Defaults to
+                ``"fast"``.
+
+        Returns:
+            ``len8.FileReport``
+                The report now stored for the file.
+        """
+        if report is None:
+            report = self._report(path, self._entries[path])
+
+        hashes = None
+        if report.hashes is not None:
+            hashes = [report.hashes.get(line) for line in report.lines]
+
+        self._entries[path] = {
+            "mtime": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "digest": digest,
+            "lengths": [code_length, docs_length],
+            "engine": engine,
+            "results": [
+                report.lines.tolist(),
+                report.chars.tolist(),
+                report.limits.tolist(),
+            ],
+            "regions": report.regions,
+            "hashes": hashes,
+        }
+        self._dirty = True
+        return report
+
+
+class MemoryCache(Cache):
+    """A cache of per-file check results that is only held in memory,
+    for long-running processes that check the same files repeatedly.
+    Entries for files which no longer exist are still evicted when the
+    cache is saved, but nothing is written to disk.
+    """
+
+    __slots__: t.Sequence[str] = ()
+
+    def __init__(self) -> None:
+        super().__init__(".len8_cache")
+
+    def load(self) -> None:
+        """Do nothing, as entries are only held in memory."""
+
+    def save(self, paths: CheckedPaths = None) -> None:
+        """Evict entries for files which no longer exist.
+
+        Args:
+            paths: ``Iterable[pathlib.Path | str]`` | ``None``
+                The paths which were checked. Only entries for files
+                under them are evicted. Defaults to ``None``, which
+                evicts entries under any path.
+        """
+        for path in _stale(self._entries, paths):
+            del self._entries[path]
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries = {}
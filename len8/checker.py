@@ -26,26 +26,861 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import bisect
+import codecs
+import contextlib
+import functools
+import io
+import mmap
+import os
 import re
+import sys
+import threading
+import time
 import typing as t
 from pathlib import Path
 
-import toml
-
 from len8 import errors
+from len8.exclude import ExcludeMatcher
+from len8.report import FileReport, Violation, format_report
+
+if t.TYPE_CHECKING:
+    # These are only imported when they're used, so checks which don't
+    # cache, keep baselines or stats, or tokenize start faster.
+    from len8 import gitignore
+    from len8.baseline import Baseline
+    from len8.cache import Cache
+    from len8.classify import Regions
+    from len8.stats import FileTiming, Stats
+
+Ranges = t.Sequence[t.Tuple[int, int]]
+LineRanges = t.Union[t.Mapping[Path, Ranges], t.Mapping[str, Ranges]]
+Source = t.Union[str, bytes, bytearray, memoryview]
+Buffer = t.Union[bytes, mmap.mmap]
+# The digest of a file's content, and the regions found in it.
+KnownRegions = t.Tuple[str, "Regions"]
+
+ENGINES = ("fast", "tokenize")
+
+# The state of the fast engine at the start of a line.
+_LICENSE = 1
+_DOCS = 2
+# The lines at which the state changes, and the state from that line on.
+Transitions = t.List[t.Tuple[int, int]]
+# The lengths, line count, transitions, and report of the last scan.
+LineStates = t.Tuple[int, int, int, Transitions, FileReport]
+CachedScan = t.Tuple[os.stat_result, str, t.Optional[FileReport]]
+# A prefetched file: its path, cached report, stat, and data (or None
+# if it should be mapped instead), and the bytes and time it took.
+Prefetched = t.Tuple[
+    str,
+    t.Optional[FileReport],
+    t.Optional[os.stat_result],
+    t.Optional[bytes],
+    int,
+    float,
+]
+
+
+@functools.lru_cache(maxsize=None)
+def _triple_quote_pattern() -> t.Pattern[str]:
+    # Compiled on first use, so importing len8 stays cheap.
+    return re.compile(r'[bfr]?"""[^.]')
+
+
+@functools.lru_cache(maxsize=None)
+def _marker_pattern() -> t.Pattern[bytes]:
+    return re.compile(rb"#[ \t]*len8:[ \t]*(ignore|off|on)\b")
+
+
+def _load_toml(text: str) -> t.Dict[str, t.Any]:
+    # The parser is imported here, as most runs have no configuration
+    # file to parse.
+    if sys.version_info >= (3, 11):
+        import tomllib
+
+        try:
+            return tomllib.loads(text)
+        except tomllib.TOMLDecodeError as e:
+            raise errors.ConfigurationError(
+                f"Failed to parse configuration file\n{e}"
+            ) from None
+
+    import toml
+
+    try:
+        return toml.loads(text)
+    except toml.TomlDecodeError as e:
+        raise errors.ConfigurationError(
+            f"Failed to parse configuration file\n{e}"
+        ) from None
+
+
+# Files at least this many bytes in size are memory-mapped instead of
+# being read, and split into lines a chunk at a time.
+MMAP_THRESHOLD = 16 * 1024 * 1024
+PREFETCH_BYTES = 64 * 1024 * 1024
+_CHUNK_SIZE = 1024 * 1024
+
+
+@contextlib.contextmanager
+def _open(file: str) -> t.Iterator[Buffer]:
+    with open(file, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+
+        # Empty files can't be mapped.
+        if size < MMAP_THRESHOLD or not size:
+            yield f.read()
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            if hasattr(buf, "madvise"):
+                # Python 3.8+. Lets the OS read ahead, and drop pages
+                # once they've been scanned.
+                buf.madvise(mmap.MADV_SEQUENTIAL)
+
+            yield buf
+
+
+class _Span:
+    # A line of a mapped file longer than a chunk, which is left in the
+    # mapping rather than copied out.
+
+    __slots__: t.Sequence[str] = ("buf", "start", "end")
+
+    def __init__(self, buf: mmap.mmap, start: int, end: int) -> None:
+        self.buf = buf
+        self.start = start
+        self.end = end
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def __contains__(self, sub: bytes) -> bool:
+        return self.buf.find(sub, self.start, self.end) != -1
+
+    def search(self, pattern: t.Pattern[bytes]) -> t.Optional[t.Match[bytes]]:
+        return pattern.search(self.buf, self.start, self.end)
+
+    def measure(self) -> t.Tuple[str, str, int]:
+        # The line is decoded a chunk at a time, keeping only enough of
+        # its start and end to tell its state, and its length.
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        head = tail = ""
+        chars = trailing = 0
+
+        for i in range(self.start, self.end, _CHUNK_SIZE):
+            j = min(i + _CHUNK_SIZE, self.end)
+            piece = decoder.decode(self.buf[i:j], j == self.end)
+            content = piece.rstrip()
+
+            if len(head) < 16:
+                head = (head + piece).lstrip()[:16]
+
+            if content:
+                # Any whitespace stands in for the whitespace between
+                # chunks, as only the end of the line is checked.
+                tail = f"{tail}{' ' * min(trailing, 3)}{content}"[-3:]
+                trailing = len(piece) - len(content)
+            else:
+                trailing += len(piece)
+
+            chars += len(piece)
+
+        return head, tail, chars - trailing
+
+    def strip(self) -> t.Iterator[bytes]:
+        # The line without surrounding whitespace, a chunk at a time.
+        buf, start, end = self.buf, self.start, self.end
+
+        while start < end and buf[start : start + 1].isspace():
+            start += 1
+
+        while end > start and buf[end - 1 : end].isspace():
+            end -= 1
+
+        for i in range(start, end, _CHUNK_SIZE):
+            yield buf[i : min(i + _CHUNK_SIZE, end)]
+
+
+Line = t.Union[bytes, _Span]
+
+
+def _measure(raw: Line) -> t.Tuple[str, str, int]:
+    # The line without leading whitespace, and without trailing
+    # whitespace, and its length in characters. Only the ends of lines
+    # left in a mapping are returned.
+    if isinstance(raw, _Span):
+        return raw.measure()
+
+    line = raw.decode("utf-8")
+    rs = line.rstrip()
+    return line.lstrip(), rs, len(rs)
+
+
+def _search(
+    pattern: t.Pattern[bytes], raw: Line
+) -> t.Optional[t.Match[bytes]]:
+    if isinstance(raw, _Span):
+        return raw.search(pattern)
+
+    return pattern.search(raw)
+
+
+def _line_end(buf: mmap.mmap, start: int) -> int:
+    # Lines end where bytes.splitlines would end them. Only the line
+    # itself is searched for a carriage return.
+    lf = buf.find(b"\n", start)
+    end = len(buf) if lf == -1 else lf + 1
+    cr = buf.find(b"\r", start, end)
+
+    if cr != -1:
+        end = cr + 2 if cr + 1 == lf else cr + 1
+
+    return end
+
+
+def _mapped_lines(buf: mmap.mmap) -> t.Iterator[Line]:
+    # Only one chunk is copied out of the mapping at a time, so memory
+    # use stays flat no matter how big the file is. The last line of
+    # each chunk may be incomplete, so the next chunk starts with it.
+    # Lines longer than a chunk are found in place, and never copied.
+    pos, size = 0, len(buf)
+
+    while pos < size:
+        chunk = buf[pos : pos + _CHUNK_SIZE]
+        lines = chunk.splitlines(True)
+        last = lines.pop()
+
+        if lines:
+            yield from lines
+            pos += len(chunk) - len(last)
+            continue
+
+        end = _line_end(buf, pos)
+        if end - pos <= _CHUNK_SIZE:
+            yield buf[pos:end]
+        else:
+            yield _Span(buf, pos, end)
+
+        pos = end
+
+
+def _scan_data(
+    data: Buffer, file: str, code_length: int, docs_length: int
+) -> FileReport:
+    report = FileReport(file)
+    triple_quote = _triple_quote_pattern()
+    shortest = min(code_length, docs_length)
+    in_docs = False
+    in_license = True
+
+    lines: t.Iterable[Line]
 
-TRIPLE_QUOTE_PATTERN = re.compile(r'[bfr]?"""[^.]')
+    if isinstance(data, bytes):
+        lines = data.splitlines(True)
+    else:
+        lines = _mapped_lines(data)
+
+    for i, raw in enumerate(lines):
+        # UTF-8 never encodes a character in less than one byte, so a
+        # line that is short in bytes is short in characters too. Such
+        # lines only need decoding if they could change the state.
+        if len(raw) <= shortest and not in_license and b'"""' not in raw:
+            continue
+
+        ls, rs, chars = _measure(raw)
+
+        if in_license:
+            if ls.startswith("#"):
+                continue
+
+            in_license = False
+
+        if triple_quote.match(ls):
+            in_docs = True
+
+        limit = docs_length if in_docs or ls.startswith("#") else code_length
+
+        if chars > limit:
+            report.append(i + 1, chars, limit)
+
+        if rs.endswith('"""'):
+            in_docs = False
+
+    return report
+
+
+def _state_at(transitions: Transitions, line: int) -> int:
+    i = bisect.bisect_right(transitions, (line, _LICENSE | _DOCS))
+    return transitions[i - 1][1] if i else _LICENSE
+
+
+def _scan_states(
+    lines: t.Sequence[bytes],
+    file: str,
+    code_length: int,
+    docs_length: int,
+    first: int = 1,
+    state: int = _LICENSE,
+    resync: t.Optional[
+        t.Tuple[int, t.Callable[[int], t.Optional[int]]]
+    ] = None,
+) -> t.Tuple[FileReport, Transitions, t.Optional[int]]:
+    # The fast engine, but starting from any line in a known state, and
+    # recording where the state changes. If resync is given, scanning
+    # stops at the first line after the given one at which the state
+    # matches the one returned for it, and that line is returned.
+    report = FileReport(file)
+    transitions: Transitions = []
+    triple_quote = _triple_quote_pattern()
+    shortest = min(code_length, docs_length)
+    in_license = bool(state & _LICENSE)
+    in_docs = bool(state & _DOCS)
+    after, previous = resync or (len(lines) + first, None)
+
+    for i, raw in enumerate(lines, first):
+        if i > after:
+            assert previous is not None
+            if previous(i) == (in_license | in_docs << 1):
+                return report, transitions, i
+
+        if len(raw) <= shortest and not in_license and b'"""' not in raw:
+            continue
+
+        line = raw.decode("utf-8")
+        ls = line.lstrip()
+        rs = line.rstrip()
+        before = in_license | in_docs << 1
+
+        if in_license:
+            if ls.startswith("#"):
+                continue
+
+            in_license = False
+
+        if triple_quote.match(ls):
+            in_docs = True
+
+        chars = len(rs)
+        limit = docs_length if in_docs or ls.startswith("#") else code_length
+
+        if chars > limit:
+            report.append(i, chars, limit)
+
+        if rs.endswith('"""'):
+            in_docs = False
+
+        if (in_license | in_docs << 1) != before:
+            transitions.append((i + 1, in_license | in_docs << 1))
+
+    return report, transitions, None
+
+
+def _has_lone_cr(data: Buffer) -> bool:
+    if isinstance(data, bytes):
+        return data.count(b"\r") != data.count(b"\r\n")
+
+    if data.find(b"\r") == -1:
+        return False
+
+    # Each slice overlaps the next by a byte, so a "\r\n" is counted
+    # in the slice it starts in.
+    cr = crlf = 0
+    for i in range(0, len(data), _CHUNK_SIZE):
+        cr += data[i : i + _CHUNK_SIZE].count(b"\r")
+        crlf += data[i : i + _CHUNK_SIZE + 1].count(b"\r\n")
+
+    return cr != crlf
+
+
+def _scan_tokens(
+    data: Buffer,
+    file: str,
+    code_length: int,
+    docs_length: int,
+    regions: t.Optional["Regions"] = None,
+) -> FileReport:
+    shortest = min(code_length, docs_length)
+    candidates: t.List[t.Tuple[int, int]] = []
+    in_license = True
+    lines: t.Iterable[Line]
+
+    if isinstance(data, bytes):
+        lines = data.splitlines(True)
+    else:
+        lines = _mapped_lines(data)
+
+    for i, raw in enumerate(lines):
+        if len(raw) <= shortest and not in_license:
+            continue
+
+        ls, _, chars = _measure(raw)
+
+        if in_license:
+            if ls.startswith("#"):
+                continue
+
+            in_license = False
+
+        if chars > shortest:
+            candidates.append((i + 1, chars))
+
+    # The tokenizer only runs on files with lines long enough to be a
+    # problem, so clean files cost no more than with the fast engine.
+    if not candidates:
+        return FileReport(file)
+
+    if _has_lone_cr(data):
+        # The tokenizer only splits lines on "\n", so its line numbers
+        # would drift from these in files with lone "\r" line endings.
+        return _scan_data(data, file, code_length, docs_length)
+
+    if regions is None:
+        readline: t.Callable[[], bytes]
+
+        if isinstance(data, bytes):
+            readline = io.BytesIO(data).readline
+        else:
+            data.seek(0)
+            readline = data.readline
+
+        from len8.classify import find_docs
+
+        regions = find_docs(readline)
+
+        if regions is None:
+            # Fall back on the fast engine for files which can't be
+            # tokenized, such as those with syntax errors.
+            return _scan_data(data, file, code_length, docs_length)
+
+    report = FileReport(file, regions=regions)
+    it = iter(regions)
+    region = next(it, None)
+
+    for number, chars in candidates:
+        while region is not None and region[1] < number:
+            region = next(it, None)
+
+        if region is not None and region[0] <= number:
+            limit = docs_length
+        else:
+            limit = code_length
+
+        if chars > limit:
+            report.append(number, chars, limit)
+
+    return report
+
+
+def _suppress(
+    report: FileReport,
+    data: Buffer,
+    lines: t.Optional[t.Iterable[Line]] = None,
+) -> FileReport:
+    # Markers are only looked for in files with lines that are too
+    # long, and only if a single search finds one, so clean files cost
+    # nothing more. "# len8: ignore" is only looked for on those lines.
+    # Mappings search from their position, which the tokenizer moves.
+    if not report or data.find(b"len8:", 0) == -1:
+        return report
+
+    marker = _marker_pattern()
+    has_blocks = any(m.group(1) == b"off" for m in marker.finditer(data))
+    wanted = {v.line for v in report}
+    last = max(wanted)
+
+    if lines is None:
+        if isinstance(data, bytes):
+            lines = data.splitlines()
+        else:
+            # Mapped lines are walked lazily, so memory stays flat.
+            lines = _mapped_lines(data)
+
+    ignored: t.Set[int] = set()
+    blocks: t.List[t.Tuple[int, int]] = []
+    start = None
+
+    # Lines after the last long one can't suppress anything.
+    for i, raw in enumerate(lines, 1):
+        if i > last:
+            break
+
+        if (not has_blocks and i not in wanted) or b"len8:" not in raw:
+            continue
+
+        match = _search(marker, raw)
+        if match is None:
+            continue
+
+        if match.group(1) == b"ignore":
+            if i in wanted:
+                ignored.add(i)
+        elif match.group(1) == b"off":
+            start = start or i
+        elif start is not None:
+            blocks.append((start, i))
+            start = None
+
+    # Blocks which are never turned back on run to the end.
+    if start is not None:
+        blocks.append((start, last))
+
+    suppressed = FileReport(
+        report.path, regions=report.regions, hashes=report.hashes
+    )
+    starts = [s for s, _ in blocks]
+
+    for v in report:
+        i = bisect.bisect_right(starts, v.line)
+        if v.line in ignored or (i and v.line <= blocks[i - 1][1]):
+            continue
+
+        suppressed.append(v.line, v.chars, v.limit)
+
+    return suppressed
+
+
+def _hash(
+    report: FileReport,
+    data: Buffer,
+    lines: t.Optional[t.Iterable[Line]] = None,
+) -> FileReport:
+    # Baselines match problems by the content of their lines, which is
+    # hashed while the file is still open, so it is never read again.
+    if not report:
+        return report
+
+    from len8.baseline import _digest
+
+    wanted = set(report.lines)
+    last = max(wanted)
+    hashes = {}
+
+    if lines is None:
+        if isinstance(data, bytes):
+            lines = data.splitlines()
+        else:
+            lines = _mapped_lines(data)
+
+    for i, raw in enumerate(lines, 1):
+        if i > last:
+            break
+
+        if i in wanted:
+            chunks = raw.strip() if isinstance(raw, _Span) else (raw.strip(),)
+            hashes[i] = _digest(chunks)
+
+    hashed = FileReport(report.path, regions=report.regions, hashes=hashes)
+    hashed.lines.extend(report.lines)
+    hashed.chars.extend(report.chars)
+    hashed.limits.extend(report.limits)
+    return hashed
+
+
+def _scan_buffer(
+    data: Buffer,
+    file: str,
+    code_length: int,
+    docs_length: int,
+    engine: str = "fast",
+    regions: t.Optional["Regions"] = None,
+    hashes: bool = False,
+) -> FileReport:
+    if engine == "tokenize":
+        report = _scan_tokens(data, file, code_length, docs_length, regions)
+    else:
+        report = _scan_data(data, file, code_length, docs_length)
+
+    report = _suppress(report, data)
+    return _hash(report, data) if hashes else report
+
+
+def _known_regions(
+    digest: str, known: t.Optional[KnownRegions]
+) -> t.Optional["Regions"]:
+    # Regions only depend on the content of a file, so they can be
+    # reused even if the line lengths have changed.
+    if known is not None and known[0] == digest:
+        return known[1]
+
+    return None
+
+
+def _scan(
+    file: str,
+    code_length: int,
+    docs_length: int,
+    engine: str = "fast",
+    hashes: bool = False,
+) -> FileReport:
+    try:
+        with _open(file) as data:
+            return _scan_buffer(
+                data, file, code_length, docs_length, engine, None, hashes
+            )
+
+    except (IsADirectoryError, PermissionError):
+        # Handle weird directories.
+        return FileReport(file)
+
+
+def _scan_cached(
+    file: str,
+    code_length: int,
+    docs_length: int,
+    digest: t.Optional[str],
+    engine: str = "fast",
+    known: t.Optional[KnownRegions] = None,
+    hashes: bool = False,
+) -> t.Optional[CachedScan]:
+    try:
+        stat = os.stat(file)
+        with _open(file) as data:
+            return _scan_cached_buffer(
+                data,
+                file,
+                stat,
+                code_length,
+                docs_length,
+                digest,
+                engine,
+                known,
+                hashes,
+            )
+
+    except (IsADirectoryError, PermissionError):
+        # Handle weird directories.
+        return None
+
+
+def _scan_cached_buffer(
+    data: Buffer,
+    file: str,
+    stat: os.stat_result,
+    code_length: int,
+    docs_length: int,
+    digest: t.Optional[str],
+    engine: str = "fast",
+    known: t.Optional[KnownRegions] = None,
+    hashes: bool = False,
+) -> CachedScan:
+    from len8.cache import Cache
+
+    new_digest = Cache.digest(data)
+    if new_digest == digest:
+        # The file was touched, but its content hasn't changed.
+        return stat, new_digest, None
+
+    report = _scan_buffer(
+        data,
+        file,
+        code_length,
+        docs_length,
+        engine,
+        _known_regions(new_digest, known),
+        hashes,
+    )
+    return stat, new_digest, report
+
+
+def _count_lines(data: Buffer) -> int:
+    if isinstance(data, bytes):
+        count = data.count(b"\n")
+    else:
+        count = sum(
+            data[i : i + _CHUNK_SIZE].count(b"\n")
+            for i in range(0, len(data), _CHUNK_SIZE)
+        )
+
+    return count + (data[-1:] not in (b"\n", b""))
+
+
+def _scan_timed(
+    file: str,
+    code_length: int,
+    docs_length: int,
+    engine: str = "fast",
+    hashes: bool = False,
+) -> t.Tuple[FileReport, "FileTiming"]:
+    start = time.perf_counter()
+
+    try:
+        with _open(file) as data:
+            read = time.perf_counter()
+            report = _scan_buffer(
+                data, file, code_length, docs_length, engine, None, hashes
+            )
+            end = time.perf_counter()
+            size, lines = len(data), _count_lines(data)
+
+    except (IsADirectoryError, PermissionError):
+        return FileReport(file), (0, 0, time.perf_counter() - start, 0.0)
+
+    return report, (size, lines, read - start, end - read)
+
+
+def _scan_cached_timed(
+    file: str,
+    code_length: int,
+    docs_length: int,
+    digest: t.Optional[str],
+    engine: str = "fast",
+    known: t.Optional[KnownRegions] = None,
+    hashes: bool = False,
+) -> t.Tuple[t.Optional[CachedScan], "FileTiming"]:
+    from len8.cache import Cache
+
+    start = time.perf_counter()
+
+    try:
+        stat = os.stat(file)
+        with _open(file) as data:
+            read = time.perf_counter()
+            new_digest = Cache.digest(data)
+            report = None
+
+            if new_digest != digest:
+                report = _scan_buffer(
+                    data,
+                    file,
+                    code_length,
+                    docs_length,
+                    engine,
+                    _known_regions(new_digest, known),
+                    hashes,
+                )
+
+            end = time.perf_counter()
+            size, lines = len(data), _count_lines(data)
+
+    except (IsADirectoryError, PermissionError):
+        return None, (0, 0, time.perf_counter() - start, 0.0)
+
+    return (stat, new_digest, report), (size, lines, read - start, end - read)
+
+
+def _scan_chunk(
+    files: t.List[str],
+    code_length: int,
+    docs_length: int,
+    engine: str,
+    hashes: bool,
+) -> t.List[FileReport]:
+    return [_scan(f, code_length, docs_length, engine, hashes) for f in files]
+
+
+def _scan_cached_chunk(
+    files: t.List[str],
+    code_length: int,
+    docs_length: int,
+    engine: str,
+    hashes: bool,
+    digests: t.List[t.Optional[str]],
+    known: t.List[t.Optional[KnownRegions]],
+) -> t.List[t.Optional[CachedScan]]:
+    return [
+        _scan_cached(f, code_length, docs_length, d, engine, k, hashes)
+        for f, d, k in zip(files, digests, known)
+    ]
+
+
+def _scan_timed_chunk(
+    files: t.List[str],
+    code_length: int,
+    docs_length: int,
+    engine: str,
+    hashes: bool,
+) -> t.List[t.Tuple[FileReport, "FileTiming"]]:
+    return [
+        _scan_timed(f, code_length, docs_length, engine, hashes) for f in files
+    ]
+
+
+def _scan_cached_timed_chunk(
+    files: t.List[str],
+    code_length: int,
+    docs_length: int,
+    engine: str,
+    hashes: bool,
+    digests: t.List[t.Optional[str]],
+    known: t.List[t.Optional[KnownRegions]],
+) -> t.List[t.Tuple[t.Optional[CachedScan], "FileTiming"]]:
+    return [
+        _scan_cached_timed(f, code_length, docs_length, d, engine, k, hashes)
+        for f, d, k in zip(files, digests, known)
+    ]
+
+
+class _ByteBudget:
+    # Limits the bytes held by prefetched files which haven't been
+    # scanned yet. Bytes are handed out in the order files were queued,
+    # so later files can never starve the one the scanner waits on. A
+    # file bigger than the whole budget is let through on its own.
+
+    __slots__: t.Sequence[str] = (
+        "_limit",
+        "_used",
+        "_queued",
+        "_turn",
+        "_closed",
+        "_cond",
+    )
+
+    def __init__(self, limit: int) -> None:
+        self._limit = limit
+        self._used = 0
+        self._queued = 0
+        self._turn = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def queue(self) -> int:
+        ticket = self._queued
+        self._queued += 1
+        return ticket
+
+    def acquire(self, ticket: int, size: int) -> bool:
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self._closed
+                or (
+                    self._turn == ticket
+                    and (not self._used or self._used + size <= self._limit)
+                )
+            )
+
+            if self._closed:
+                return False
+
+            self._used += size
+            self._turn += 1
+            self._cond.notify_all()
+            return True
+
+    def release(self, size: int) -> None:
+        with self._cond:
+            self._used -= size
+            self._cond.notify_all()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
 
 
 class Config:
     """A ``len8`` configuration generated from a toml file."""
 
     __slots__: t.Sequence[str] = (
+        "_cache",
         "_code_length",
         "_docs_length",
+        "_engine",
         "_include",
         "_exclude",
         "_is_configured",
+        "_respect_gitignore",
         "_strict",
     )
 
@@ -54,7 +889,10 @@ class Config:
         self._exclude: t.Optional[t.List[str]] = None
         self._code_length: t.Optional[int] = None
         self._docs_length: t.Optional[int] = None
+        self._engine: t.Optional[str] = None
         self._strict: bool = False
+        self._cache: bool = False
+        self._respect_gitignore: bool = False
         self._is_configured: bool = False
 
         if not isinstance(path, Path):
@@ -67,11 +905,7 @@ class Config:
 
         with open(path) as f:
             try:
-                len8 = toml.loads(f.read())["tool"]["len8"]
-            except toml.TomlDecodeError as e:
-                raise errors.ConfigurationError(
-                    f"Failed to parse configuration file\n{e}"
-                ) from None
+                len8 = _load_toml(f.read())["tool"]["len8"]
             except KeyError:
                 return None
 
@@ -79,7 +913,15 @@ class Config:
         self._exclude = len8.get("exclude")
         self._code_length = len8.get("code-length")
         self._docs_length = len8.get("docs-length")
+        self._engine = len8.get("engine")
+        if self._engine is not None and self._engine not in ENGINES:
+            raise errors.ConfigurationError(
+                f"'engine' in '{path}' should be 'fast' or 'tokenize'"
+            )
+
         self._strict = len8.get("strict", False)
+        self._cache = len8.get("cache", False)
+        self._respect_gitignore = len8.get("respect-gitignore", False)
         self._is_configured = True
 
     @property
@@ -102,6 +944,11 @@ class Config:
         """The optional maximum length for docs."""
         return self._docs_length
 
+    @property
+    def engine(self) -> t.Optional[str]:
+        """The optional engine to classify lines with."""
+        return self._engine
+
     @property
     def strict(self) -> bool:
         """If True, raises an error if the check method fails. Defaults
@@ -109,6 +956,20 @@ class Config:
         """
         return self._strict
 
+    @property
+    def cache(self) -> bool:
+        """Whether or not results should be cached between runs.
+        Defaults to ``False`` for ``Config``.
+        """
+        return self._cache
+
+    @property
+    def respect_gitignore(self) -> bool:
+        """Whether or not files ignored by git should be skipped.
+        Defaults to ``False`` for ``Config``.
+        """
+        return self._respect_gitignore
+
     @property
     def is_configured(self) -> bool:
         """Whether or not this ``Config`` was successfully
@@ -116,19 +977,138 @@ class Config:
         return self._is_configured
 
 
+class ConfigResolver:
+    """Finds the configuration governing each directory, which is the
+    nearest ``pyproject.toml`` file with a ``[tool.len8]`` table in it
+    or any of its parents. Lookups are memoized per directory, so each
+    configuration file is read and parsed at most once.
+
+    Args:
+        filename: ``str``
+            The name of the configuration files to look for. Defaults
+            to ``"pyproject.toml"``.
+    """
+
+    __slots__: t.Sequence[str] = ("_filename", "_configs", "_lock")
+
+    def __init__(self, filename: str = "pyproject.toml") -> None:
+        self._filename = filename
+        self._configs: t.Dict[str, t.Optional[Config]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def filename(self) -> str:
+        """The name of the configuration files to look for.
+
+        Returns:
+            ``str``
+        """
+        return self._filename
+
+    def clear(self) -> None:
+        """Forget every configuration found so far, so changes to
+        configuration files are picked up."""
+        with self._lock:
+            self._configs.clear()
+
+    def resolve(self, directory: t.Union[Path, str]) -> t.Optional[Config]:
+        """Find the configuration governing a directory.
+
+        Args:
+            directory: ``pathlib.Path`` | ``str``
+                The directory to find the configuration for.
+
+        Returns:
+            ``len8.Config`` | ``None``
+                The configuration, or ``None`` if there isn't one.
+
+        Raises:
+            :obj:`ConfigurationError`:
+                If a configuration file could not be parsed.
+        """
+        directory = os.path.abspath(directory)
+        configs = self._configs
+
+        with self._lock:
+            # Every directory between this one and the nearest one
+            # already looked up shares its answer.
+            unknown = []
+            config: t.Optional[Config] = None
+
+            while directory not in configs:
+                unknown.append(directory)
+                path = os.path.join(directory, self._filename)
+
+                if os.path.isfile(path):
+                    found = Config(path)
+                    if found.is_configured:
+                        config = found
+                        break
+
+                parent = os.path.dirname(directory)
+                if parent == directory:
+                    break
+
+                directory = parent
+
+            else:
+                config = configs[directory]
+
+            for d in unknown:
+                configs[d] = config
+
+        return config
+
+
 class Checker:
     """An object used to check line lengths.
 
     Keyword Args:
+        baseline: ``len8.Baseline`` | ``None``
+            Known problems to leave out of reports, so only new
+            problems are reported. Defaults to ``None``, which reports
+            every problem.
+        cache: ``len8.Cache`` | ``None``
+            The cache to reuse results for unchanged files from.
+            Defaults to ``None``, which disables caching.
         exclude: ``list[pathlib.Path | str]``
             A list of paths on top of the defaults (.nox, .venv, and
             venv) to exclude from checking. Defaults to an empty list.
+        engine: ``str``
+            How lines are classified as code or documentation. The
+            ``"fast"`` engine looks for lines starting with ``#`` or
+            triple double quotes. The ``"tokenize"`` engine uses the
+            tokenizer to find comments and string statements, such as
+            docstrings, with any quotes. It only runs on files with
+            lines long enough to be a problem. Defaults to ``"fast"``.
         extend: ``int``
             Increase the line length limit to set figures (pass ``1``
             to increase to 88, and ``2`` to increase to 99). This is
             designed to allow for an additive option in the CLI --
             consider using :obj:`max_code_length` and
             :obj:`max_docs_length` instead.
+        prefetch: ``int``
+            The number of threads to read files ahead of the scanner
+            with, while another thread walks directories. This hides
+            the latency of slow filesystems, such as network shares,
+            when checking in a single process. Defaults to ``0``,
+            which reads each file only when it is checked.
+        prefetch_bytes: ``int``
+            The most bytes that prefetched files which have not been
+            checked yet can hold in memory. Defaults to 64 MiB.
+        resolver: ``len8.ConfigResolver`` | ``None``
+            If given, the line lengths set in the nearest configuration
+            to each file are used, unless lengths are set on the
+            checker itself. This lets one check cover projects with
+            different limits. Defaults to ``None``, which uses the
+            checker's lengths for every file.
+        respect_gitignore: ``bool``
+            If True, skips files and directories ignored by
+            ``.gitignore`` files while walking directories. Defaults to
+            ``False``.
+        stats: ``len8.Stats`` | ``None``
+            The object to record statistics about each check in.
+            Defaults to ``None``, which disables recording.
         max_code_length: ``int`` | ``None``
             Set the maximum length for code.
         max_docs_length: ``int`` | ``None``
@@ -136,25 +1116,49 @@ class Checker:
         strict: ``bool``
             If True, raises an error if the check method fails. Defaults
             to ``True``.
+        workers: ``int``
+            The number of processes to check files with. Passing ``0``
+            uses one process per CPU. Defaults to ``1``, which checks
+            files serially in the current process.
     """
 
     __slots__: t.Sequence[str] = (
         "_bad_lines",
+        "_baseline",
+        "_cache",
         "_code_length",
         "_docs_length",
+        "_engine",
         "_exclude",
         "_extend",
+        "_line_states",
+        "_matcher",
+        "_prefetch",
+        "_prefetch_bytes",
+        "_resolver",
+        "_respect_gitignore",
+        "_stats",
         "_strict",
+        "_workers",
     )
 
     def __init__(
         self,
         *,
+        baseline: t.Optional["Baseline"] = None,
+        cache: t.Optional["Cache"] = None,
+        engine: str = "fast",
         exclude: t.Sequence[t.Union[Path, str]] = [],
         extend: int = 0,
         max_code_length: t.Optional[int] = None,
         max_docs_length: t.Optional[int] = None,
+        prefetch: int = 0,
+        prefetch_bytes: int = PREFETCH_BYTES,
+        resolver: t.Optional[ConfigResolver] = None,
+        respect_gitignore: bool = False,
+        stats: t.Optional["Stats"] = None,
         strict: bool = False,
+        workers: int = 1,
     ) -> None:
         def _ensure_path(value: t.Union[Path, str]) -> Path:
             if isinstance(value, Path):
@@ -171,12 +1175,35 @@ class Checker:
         if max_docs_length and max_docs_length < 0:
             raise ValueError("line lengths cannot be less than 0")
 
+        if workers < 0:
+            raise ValueError("'workers' cannot be less than 0")
+
+        if engine not in ENGINES:
+            raise ValueError("'engine' should be 'fast' or 'tokenize'")
+
+        if prefetch < 0:
+            raise ValueError("'prefetch' cannot be less than 0")
+
+        if prefetch_bytes < 1:
+            raise ValueError("'prefetch_bytes' cannot be less than 1")
+
+        self._baseline = baseline
+        self._cache = cache
+        self._engine = engine
         self._exclude = [_ensure_path(p) for p in exclude]
+        self._matcher: t.Optional[ExcludeMatcher] = None
         self._extend = extend
         self._code_length = max_code_length
         self._docs_length = max_docs_length
+        self._prefetch = prefetch
+        self._prefetch_bytes = prefetch_bytes
+        self._resolver = resolver
+        self._respect_gitignore = respect_gitignore
+        self._stats = stats
         self._strict = strict
-        self._bad_lines: t.List[t.Tuple[str, int, int, int]] = []
+        self._workers = workers
+        self._bad_lines: t.List[FileReport] = []
+        self._line_states: t.Dict[str, LineStates] = {}
 
     @classmethod
     def from_config(cls, config: t.Union[str, Path, Config]) -> "Checker":
@@ -193,10 +1220,20 @@ class Checker:
         if not isinstance(config, Config):
             config = Config(config)
 
+        cache = None
+
+        if config.cache:
+            from len8.cache import Cache
+
+            cache = Cache()
+
         return cls(
+            cache=cache,
+            engine=config.engine or "fast",
             exclude=config.exclude or [],
             max_code_length=config.code_length,
             max_docs_length=config.docs_length,
+            respect_gitignore=config.respect_gitignore,
             strict=config.strict,
         )
 
@@ -208,19 +1245,60 @@ class Checker:
         Returns:
             ``str`` | ``None``
         """
-        if not self._bad_lines:
-            return None
+        return format_report(v for r in self._bad_lines for v in r)
+
+    @property
+    def reports(self) -> t.List[FileReport]:
+        """The reports for each file that contained lines that were too
+        long during the last check.
+
+        Returns:
+            ``list[len8.FileReport]``
+        """
+        return self._bad_lines
+
+    @property
+    def baseline(self) -> t.Optional["Baseline"]:
+        """The known problems left out of reports, if any.
+
+        Returns:
+            ``len8.Baseline`` | ``None``
+        """
+        return self._baseline
 
-        bl = ""
+    @baseline.setter
+    def baseline(self, baseline: t.Optional["Baseline"]) -> None:
+        self._baseline = baseline
 
-        for file, line, chars, limit in self._bad_lines:
-            if file not in bl:
-                bl += f"\33[1m{file}\33[0m\n"
+    @property
+    def cache(self) -> t.Optional["Cache"]:
+        """The cache to reuse results for unchanged files from, or
+        ``None`` if caching is disabled.
 
-            bl += f"  * Line {line} ({chars}/{limit})\n"
+        Returns:
+            ``len8.Cache`` | ``None``
+        """
+        return self._cache
 
-        bl += f"\n\33[1m\33[31mFound {len(self._bad_lines):,} problem(s)\33[0m"
-        return bl
+    @cache.setter
+    def cache(self, cache: t.Optional["Cache"]) -> None:
+        self._cache = cache
+
+    @property
+    def engine(self) -> str:
+        """How lines are classified as code or documentation, either
+        ``"fast"`` or ``"tokenize"``.
+
+        Returns:
+            ``str``
+        """
+        return self._engine
+
+    @engine.setter
+    def engine(self, engine: str) -> None:
+        if engine not in ENGINES:
+            raise ValueError("'engine' should be 'fast' or 'tokenize'")
+        self._engine = engine
 
     @property
     def exclude(self) -> t.List[Path]:
@@ -234,6 +1312,7 @@ class Checker:
     @exclude.setter
     def exclude(self, excludes: t.List[Path]) -> None:
         self._exclude = excludes
+        self._matcher = None
 
     @property
     def extend(self) -> int:
@@ -278,6 +1357,80 @@ class Checker:
 
         return 72
 
+    @property
+    def prefetch(self) -> int:
+        """The number of threads to read files ahead of the scanner
+        with. ``0`` means files are only read when they are checked.
+
+        Returns:
+            ``int``
+        """
+        return self._prefetch
+
+    @prefetch.setter
+    def prefetch(self, prefetch: int) -> None:
+        if prefetch < 0:
+            raise ValueError("'prefetch' cannot be less than 0")
+        self._prefetch = prefetch
+
+    @property
+    def prefetch_bytes(self) -> int:
+        """The most bytes that prefetched files which have not been
+        checked yet can hold in memory.
+
+        Returns:
+            ``int``
+        """
+        return self._prefetch_bytes
+
+    @prefetch_bytes.setter
+    def prefetch_bytes(self, prefetch_bytes: int) -> None:
+        if prefetch_bytes < 1:
+            raise ValueError("'prefetch_bytes' cannot be less than 1")
+        self._prefetch_bytes = prefetch_bytes
+
+    @property
+    def resolver(self) -> t.Optional[ConfigResolver]:
+        """The resolver used to find the configuration governing each
+        file, if any.
+
+        Returns:
+            ``len8.ConfigResolver`` | ``None``
+        """
+        return self._resolver
+
+    @resolver.setter
+    def resolver(self, resolver: t.Optional[ConfigResolver]) -> None:
+        self._resolver = resolver
+
+    @property
+    def respect_gitignore(self) -> bool:
+        """If ``True``, files and directories ignored by ``.gitignore``
+        files are skipped while walking directories.
+
+        Returns:
+            ``bool``
+        """
+        return self._respect_gitignore
+
+    @respect_gitignore.setter
+    def respect_gitignore(self, respect_gitignore: bool) -> None:
+        self._respect_gitignore = respect_gitignore
+
+    @property
+    def stats(self) -> t.Optional["Stats"]:
+        """The object statistics about each check are recorded in, or
+        ``None`` if recording is disabled.
+
+        Returns:
+            ``len8.Stats`` | ``None``
+        """
+        return self._stats
+
+    @stats.setter
+    def stats(self, stats: t.Optional["Stats"]) -> None:
+        self._stats = stats
+
     @property
     def strict(self) -> bool:
         """If ``True``, raises an error if the check method fails for
@@ -292,64 +1445,612 @@ class Checker:
     def strict(self, strict: bool) -> None:
         self._strict = strict
 
+    @property
+    def workers(self) -> int:
+        """The number of processes to check files with. ``0`` means one
+        process per CPU.
+
+        Returns:
+            ``int``
+        """
+        return self._workers
+
+    @workers.setter
+    def workers(self, workers: int) -> None:
+        if workers < 0:
+            raise ValueError("'workers' cannot be less than 0")
+        self._workers = workers
+
+    def _lengths(self, file: str) -> t.Tuple[int, int]:
+        # Lengths set on the checker win, then those in the nearest
+        # configuration, then the defaults.
+        resolver = self._resolver
+
+        if resolver is None or (self._code_length and self._docs_length):
+            return self.code_length, self.docs_length
+
+        config = resolver.resolve(os.path.dirname(file))
+
+        if config is None:
+            return self.code_length, self.docs_length
+
+        return (
+            self._code_length or config.code_length or self.code_length,
+            self._docs_length or config.docs_length or self.docs_length,
+        )
+
+    def _is_excluded(self, path: Path) -> bool:
+        # The excludes are compiled on first use, and again only when
+        # they are changed.
+        if self._matcher is None:
+            self._matcher = ExcludeMatcher(self.exclude)
+
+        if self._stats is None:
+            return self._matcher.match(path)
+
+        start = time.perf_counter()
+        excluded = self._matcher.match(path)
+        self._stats._add_time("filter", time.perf_counter() - start)
+        return excluded
+
+    def _is_ignored(self, path: Path) -> bool:
+        if not self._respect_gitignore:
+            return False
+
+        from len8 import gitignore
+
+        absolute = os.path.abspath(path)
+        rules = gitignore.load_rules(os.path.dirname(absolute))
+        return gitignore.is_ignored(rules, absolute, path.is_dir())
+
     def _is_valid(self, path: Path) -> bool:
         if path.is_file() and path.suffix not in (".py", ".pyw"):
             return False
 
-        for e in self.exclude:
-            if path.absolute() == e:
-                return False
+        return not self._is_excluded(path)
 
-            if all(x in path.parts for x in e.parts):
-                return False
+    def _walk(
+        self, path: Path, dirs: t.Optional[t.List[Path]] = None
+    ) -> t.Iterator[Path]:
+        # Excluded directories are pruned before they are entered, so
+        # large trees such as virtual environments are never scanned.
+        if self._is_excluded(path):
+            return
 
-        return True
+        # When respecting .gitignore files, each directory carries the
+        # rules of its parents, so ignored directories are pruned just
+        # like excluded ones. Otherwise, no rules are ever loaded.
+        respect = self._respect_gitignore
+        rules: "gitignore.Rules" = ()
+        stats = self._stats
 
-    def _check_file(self, path: Path) -> None:
-        if self._is_valid(path):
-            self._check(path)
+        if respect:
+            from len8 import gitignore
 
-    def _check_dir(self, path: Path) -> None:
-        for p in path.rglob("*.*"):
-            self._check_file(p)
+            rules = gitignore.load_rules(path, inclusive=False)
 
-    def _check(self, path: Path) -> None:
-        in_docs = False
-        in_license = True
+        stack = [(path, os.path.abspath(path), rules)]
 
-        try:
-            with open(path, encoding="utf-8") as f:
-                for i, line in enumerate(f):
-                    ls = line.lstrip()
-                    rs = line.rstrip()
+        while stack:
+            directory, absolute, rules = stack.pop()
+            subdirs = []
+
+            if dirs is not None:
+                dirs.append(directory)
+
+            if stats is not None:
+                stats._dirs_visited += 1
+
+            if respect:
+                ignore = gitignore.load(absolute)
+                if ignore is not None:
+                    rules += (ignore,)
 
-                    if in_license:
-                        if ls.startswith("#"):
+            try:
+                with os.scandir(directory) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError:
+                # Handle weird directories.
+                continue
+
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        if entry.is_symlink():
+                            continue
+
+                        p = Path(entry.path)
+                        sub = os.path.join(absolute, entry.name)
+
+                        if self._is_excluded(p) or (
+                            respect
+                            and (
+                                entry.name == ".git"
+                                or gitignore.is_ignored(rules, sub, True)
+                            )
+                        ):
+                            if stats is not None:
+                                stats._dirs_skipped += 1
                             continue
 
-                        in_license = False
+                        subdirs.append((p, sub, rules))
+                        continue
 
-                    if TRIPLE_QUOTE_PATTERN.match(ls):
-                        in_docs = True
+                    if os.path.splitext(entry.name)[1] not in (".py", ".pyw"):
+                        continue
 
-                    chars = len(rs)
-                    limit: int = (
-                        self.docs_length
-                        if in_docs or ls.startswith("#")
-                        else self.code_length
+                    if not entry.is_file():
+                        continue
+                except OSError:
+                    continue
+
+                p = Path(entry.path)
+
+                if self._is_excluded(p) or (
+                    rules
+                    and gitignore.is_ignored(
+                        rules, os.path.join(absolute, entry.name), False
                     )
+                ):
+                    if stats is not None:
+                        stats._files_skipped += 1
+                    continue
 
-                    if chars > limit:
-                        self._bad_lines.append(
-                            (f"{path.resolve()}", i + 1, chars, limit)
-                        )
+                yield p
+
+            stack.extend(reversed(subdirs))
+
+    def _iter_files(
+        self, paths: t.Iterable[t.Union[Path, str]]
+    ) -> t.Iterator[Path]:
+        for p in paths:
+            if not isinstance(p, Path):
+                p = Path(p)
+
+            if not p.exists() and self.strict:
+                raise errors.InvalidPath(p)
+
+            if p.is_file():
+                if self._is_valid(p):
+                    yield p
+                elif self._stats is not None:
+                    self._stats._files_skipped += 1
+            else:
+                yield from self._walk(p)
+
+    def _check(self, path: Path) -> FileReport:
+        file = f"{path.resolve()}"
+
+        if self._cache is not None:
+            return self._check_cached(file)
 
-                    if rs.endswith('"""'):
-                        in_docs = False
+        return _scan(file, *self._lengths(file), self._engine, self._hashes())
 
+    def _check_timed(self, path: Path) -> FileReport:
+        assert self._stats is not None
+        file = f"{path.resolve()}"
+        code_length, docs_length = self._lengths(file)
+        timing: t.Optional[FileTiming] = None
+        self._stats._file_start(file)
+
+        if self._cache is None:
+            report, timing = _scan_timed(
+                file, code_length, docs_length, self._engine, self._hashes()
+            )
+
+        else:
+            cached = self._get_cached(file)
+
+            if cached is not None:
+                report = cached
+            else:
+                scanned, timing = _scan_cached_timed(
+                    file,
+                    code_length,
+                    docs_length,
+                    *self._get_cache_state(file),
+                    self._hashes(),
+                )
+                report = self._update_cache(file, scanned)
+
+        self._stats._file_done(file, report, timing)
+        return report
+
+    def _get_cached(self, file: str) -> t.Optional[FileReport]:
+        assert self._cache is not None
+
+        try:
+            stat = os.stat(file)
+        except OSError:
+            return FileReport(file)
+
+        return self._cache.get(file, stat, *self._lengths(file), self._engine)
+
+    def _get_cache_state(
+        self, file: str
+    ) -> t.Tuple[t.Optional[str], str, t.Optional[KnownRegions]]:
+        # The digest, engine, and known regions to rescan a file with.
+        assert self._cache is not None
+        engine = self._engine
+        digest = self._cache.get_digest(file, *self._lengths(file), engine)
+
+        if engine == "tokenize":
+            return digest, engine, self._cache.get_regions(file)
+
+        return digest, engine, None
+
+    def _check_cached(self, file: str) -> FileReport:
+        assert self._cache is not None
+        cached = self._get_cached(file)
+
+        if cached is not None:
+            return cached
+
+        code_length, docs_length = self._lengths(file)
+        return self._update_cache(
+            file,
+            _scan_cached(
+                file,
+                code_length,
+                docs_length,
+                *self._get_cache_state(file),
+                self._hashes(),
+            ),
+        )
+
+    def _update_cache(
+        self, file: str, scanned: t.Optional[CachedScan]
+    ) -> FileReport:
+        assert self._cache is not None
+
+        if scanned is None:
+            return FileReport(file)
+
+        stat, digest, report = scanned
+        return self._cache.update(
+            file, stat, digest, *self._lengths(file), report, self._engine
+        )
+
+    def _check_parallel(self, paths: t.List[Path]) -> t.Iterator[FileReport]:
+        if not paths:
+            return
+
+        files = [f"{p.resolve()}" for p in paths]
+        cached: t.List[t.Optional[FileReport]] = [None] * len(files)
+        pending = list(range(len(files)))
+
+        if self._cache is not None:
+            cached = [self._get_cached(file) for file in files]
+            pending = [i for i, r in enumerate(cached) if r is None]
+
+        stats = self._stats
+        if stats is not None:
+            for file in files:
+                stats._file_start(file)
+
+        workers = self.workers or os.cpu_count() or 1
+        size = max(1, min(64, len(pending) // (workers * 4)))
+        chunks: t.List[t.List[int]] = []
+        lengths: t.List[t.Tuple[int, int]] = []
+
+        # Each chunk is checked with one set of lengths, so a chunk is
+        # cut short when the next file is governed by other lengths.
+        for i in pending:
+            file_lengths = self._lengths(files[i])
+
+            if (
+                chunks
+                and len(chunks[-1]) < size
+                and lengths[-1] == file_lengths
+            ):
+                chunks[-1].append(i)
+            else:
+                chunks.append([i])
+                lengths.append(file_lengths)
+
+        func: t.Callable[..., t.List[t.Any]] = _scan_chunk
+        if stats is not None:
+            func = _scan_timed_chunk
+
+        args: t.List[t.List[t.Any]] = [
+            [[files[i] for i in c] for c in chunks],
+            [code for code, _ in lengths],
+            [docs for _, docs in lengths],
+            [self._engine] * len(chunks),
+            [self._hashes()] * len(chunks),
+        ]
+
+        if self._cache is not None:
+            func = _scan_cached_chunk
+            if stats is not None:
+                func = _scan_cached_timed_chunk
+
+            states = [
+                [self._get_cache_state(files[i]) for i in c] for c in chunks
+            ]
+            args.append([[d for d, _, _ in c] for c in states])
+            args.append([[k for _, _, k in c] for c in states])
+
+        # Imported here, as it pulls in multiprocessing, which serial
+        # checks never need.
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Chunks are mapped in submission order, so results come back
+        # in the same order a serial check would produce them.
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            scanned = (r for c in executor.map(func, *args) for r in c)
+
+            for file, report in zip(files, cached):
+                timing: t.Optional[FileTiming] = None
+
+                if report is None:
+                    report = next(scanned)
+
+                    if stats is not None:
+                        report, timing = report
+
+                    if self._cache is not None:
+                        report = self._update_cache(file, report)
+
+                if stats is not None:
+                    stats._file_done(file, report, timing)
+
+                yield report
+
+    def _prefetch_open(
+        self, path: Path
+    ) -> t.Tuple[
+        str,
+        t.Optional[FileReport],
+        t.Optional[os.stat_result],
+        t.Optional[t.BinaryIO],
+    ]:
+        file = f"{path.resolve()}"
+        stat = None
+
+        if self._cache is not None:
+            try:
+                stat = os.stat(file)
+            except OSError:
+                return file, FileReport(file), None, None
+
+            cached = self._cache.get(
+                file, stat, *self._lengths(file), self._engine
+            )
+            if cached is not None:
+                return file, cached, stat, None
+
+        try:
+            return file, None, stat, open(file, "rb")
         except (IsADirectoryError, PermissionError):
             # Handle weird directories.
-            ...
+            return file, FileReport(file), stat, None
+
+    def _prefetch_file(
+        self, path: Path, ticket: int, budget: _ByteBudget
+    ) -> t.Optional[Prefetched]:
+        # Runs in a reader thread. Every file takes its turn with the
+        # budget, even if it isn't read, so later files can go next.
+        start = time.perf_counter()
+
+        try:
+            file, report, stat, f = self._prefetch_open(path)
+        except BaseException:
+            budget.acquire(ticket, 0)
+            raise
+
+        if f is None:
+            budget.acquire(ticket, 0)
+            return file, report, stat, None, 0, 0.0
+
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            if size >= MMAP_THRESHOLD:
+                # Big files are mapped by the scanner instead.
+                budget.acquire(ticket, 0)
+                return file, None, stat, None, 0, 0.0
+
+            opened = time.perf_counter() - start
+            if not budget.acquire(ticket, size):
+                return None
+
+            try:
+                start = time.perf_counter()
+                data = f.read()
+            except BaseException:
+                budget.release(size)
+                raise
+
+        read = opened + time.perf_counter() - start
+        return file, None, stat, data, size, read
+
+    def _scan_prefetched(self, prefetched: Prefetched) -> FileReport:
+        file, report, stat, data, _, read = prefetched
+        code_length, docs_length = self._lengths(file)
+        stats = self._stats
+
+        if data is None:
+            if report is not None:
+                if stats is not None:
+                    stats._file_start(file)
+                    stats._file_done(file, report, None)
+
+                return report
+
+            if stats is not None:
+                return self._check_timed(Path(file))
+
+            return self._check(Path(file))
+
+        if stats is not None:
+            stats._file_start(file)
+
+        start = time.perf_counter()
+
+        if self._cache is None:
+            report = _scan_buffer(
+                data,
+                file,
+                code_length,
+                docs_length,
+                self._engine,
+                None,
+                self._hashes(),
+            )
+        else:
+            assert stat is not None
+            report = self._update_cache(
+                file,
+                _scan_cached_buffer(
+                    data,
+                    file,
+                    stat,
+                    code_length,
+                    docs_length,
+                    *self._get_cache_state(file),
+                    self._hashes(),
+                ),
+            )
+
+        if stats is not None:
+            timing = (
+                len(data),
+                _count_lines(data),
+                read,
+                time.perf_counter() - start,
+            )
+            stats._file_done(file, report, timing)
+
+        return report
+
+    def _check_prefetched(
+        self, paths: t.Iterator[Path]
+    ) -> t.Iterator[FileReport]:
+        # Imported here, as serial checks without prefetching never
+        # need them.
+        import queue
+        from concurrent.futures import ThreadPoolExecutor
+
+        # One thread walks the paths and queues a read for each file,
+        # the pool reads them within the byte budget, and this thread
+        # scans them in the order they were queued.
+        budget = _ByteBudget(self._prefetch_bytes)
+        executor = ThreadPoolExecutor(max_workers=self._prefetch)
+        # Queued reads are cheap, but still shouldn't grow without
+        # bound on huge trees.
+        pending: "queue.Queue[t.Any]" = queue.Queue(self._prefetch * 64)
+        stop = threading.Event()
+
+        def _produce() -> None:
+            try:
+                for path in paths:
+                    if stop.is_set():
+                        return
+
+                    pending.put(
+                        executor.submit(
+                            self._prefetch_file, path, budget.queue(), budget
+                        )
+                    )
+
+            except BaseException as e:
+                pending.put(e)
+
+            finally:
+                pending.put(None)
+
+        producer = threading.Thread(target=_produce, daemon=True)
+        producer.start()
+
+        try:
+            while True:
+                item = pending.get()
+
+                if item is None:
+                    break
+
+                if isinstance(item, BaseException):
+                    raise item
+
+                prefetched = item.result()
+                assert prefetched is not None
+
+                try:
+                    yield self._scan_prefetched(prefetched)
+                finally:
+                    budget.release(prefetched[4])
+
+        finally:
+            stop.set()
+            budget.close()
+
+            # Unblock the producer if it's waiting on a full queue,
+            # and cancel any reads that haven't started.
+            while producer.is_alive() or not pending.empty():
+                try:
+                    item = pending.get(timeout=0.01)
+                except queue.Empty:
+                    continue
+
+                if item is not None and not isinstance(item, BaseException):
+                    item.cancel()
+
+            executor.shutdown()
+
+    def _hashes(self) -> bool:
+        # Baselines match problems by hashes of their lines, which are
+        # taken while files are scanned. Cached reports may be filtered
+        # by a baseline later, so they always carry them.
+        return self._baseline is not None or self._cache is not None
+
+    def _without_known(self, report: FileReport) -> FileReport:
+        # Every path that hands out reports goes through here, so the
+        # baseline applies to all of them.
+        if self._baseline is None:
+            return report
+
+        return self._baseline.filter(report)
+
+    def _iter_reports(
+        self,
+        paths: t.Iterable[t.Union[Path, str]],
+        lines: t.Optional[LineRanges],
+    ) -> t.Iterator[FileReport]:
+        paths = tuple(paths)
+        files = self._iter_files(paths)
+        ranges: t.Dict[str, Ranges] = {}
+
+        if lines is not None:
+            ranges = {f"{Path(p).resolve()}": r for p, r in lines.items()}
+
+        if self._cache is not None:
+            self._cache.load()
+
+        checked: t.Iterator[FileReport]
+
+        if self._stats is not None:
+            files = self._stats._timed(files, "walk")
+
+        try:
+            if self.workers == 1:
+                if self._prefetch:
+                    checked = self._check_prefetched(files)
+                elif self._stats is None:
+                    checked = map(self._check, files)
+                else:
+                    checked = map(self._check_timed, files)
+            else:
+                checked = self._check_parallel(list(files))
+
+            for report in checked:
+                if lines is not None:
+                    report = report.filter(ranges.get(report.path, ()))
+
+                yield self._without_known(report)
+
+        finally:
+            if self._cache is not None:
+                self._cache.save(paths)
 
     def set_lengths(
         self, *, code: t.Optional[int] = -1, docs: t.Optional[int] = -1
@@ -374,13 +2075,25 @@ class Checker:
         if not docs or docs > 0:
             self._docs_length = docs
 
-    def check(self, *paths: t.Union[Path, str]) -> t.Optional[str]:
+    def check(
+        self,
+        *paths: t.Union[Path, str],
+        lines: t.Optional[LineRanges] = None,
+    ) -> t.Optional[str]:
         """Check to ensure the line lengths conform to PEP 8 standards.
 
         Args:
             *paths: ``Path`` | ``str``
                 The path or paths to check.
 
+        Keyword Args:
+            lines: ``dict[pathlib.Path | str, list[tuple[int, int]]]``
+                If given, only lines inside these inclusive
+                ``(start, end)`` ranges are reported, such as the lines
+                returned by :func:`len8.git.changed_lines`. Files which
+                are not in the mapping report nothing. Defaults to
+                ``None``, which reports every line.
+
         Returns:
             ``str`` | ``None``
                 A formatted string containing the lines that were too
@@ -394,21 +2107,294 @@ class Checker:
                 If strict mode is set to ``True`` and the files that
                 were checked contained lines what were too long.
         """
-        self._bad_lines = []
+        self._bad_lines = [
+            r for r in self._iter_reports(paths, lines) if len(r)
+        ]
 
-        for p in paths:
-            if not isinstance(p, Path):
-                p = Path(p)
+        if self._stats is None:
+            output = self.bad_lines
+        else:
+            start = time.perf_counter()
+            output = self.bad_lines
+            self._stats._add_time("report", time.perf_counter() - start)
 
-            if not p.exists() and self.strict:
-                raise errors.InvalidPath(p)
+        if output and self.strict:
+            raise errors.BadLines(output)
 
-            if p.is_file():
-                self._check_file(p)
+        return output
+
+    def check_source(
+        self, source: Source, name: str = "<string>"
+    ) -> t.Optional[str]:
+        """Check the line lengths of source code held in memory.
+
+        Args:
+            source: ``str`` | ``bytes`` | ``bytearray`` | ``memoryview``
+                The source code to check. Binary sources should be
+                UTF-8 encoded.
+            name: ``str``
+                The name to report problems under. Defaults to
+                ``"<string>"``.
+
+        Returns:
+            ``str`` | ``None``
+                A formatted string containing the lines that were too
+                long, or ``None`` if there were none.
+
+        Raises:
+            :obj:`BadLines`:
+                If strict mode is set to ``True`` and the source
+                contained lines what were too long.
+        """
+        return self.check_sources({name: source})
+
+    def check_sources(
+        self, sources: t.Mapping[str, Source]
+    ) -> t.Optional[str]:
+        """Check the line lengths of several sources held in memory.
+        Exclusions do not apply to sources.
+
+        Args:
+            sources: ``dict[str, str | bytes | bytearray | memoryview]``
+                The sources to check, mapped from the names to report
+                problems under.
+
+        Returns:
+            ``str`` | ``None``
+                A formatted string containing the lines that were too
+                long, or ``None`` if there were none.
+
+        Raises:
+            :obj:`BadLines`:
+                If strict mode is set to ``True`` and the sources
+                contained lines what were too long.
+        """
+        code_length, docs_length = self.code_length, self.docs_length
+        self._bad_lines = []
+
+        for name, source in sources.items():
+            if isinstance(source, str):
+                data = source.encode("utf-8")
             else:
-                self._check_dir(p)
+                data = bytes(source)
+
+            report = _scan_buffer(
+                data, name, code_length, docs_length, self._engine
+            )
+            if len(report):
+                self._bad_lines.append(report)
 
         if self._bad_lines and self.strict:
             raise errors.BadLines(self.bad_lines)
 
         return self.bad_lines
+
+    def fix(
+        self,
+        *paths: t.Union[Path, str],
+        lines: t.Optional[LineRanges] = None,
+    ) -> t.List[str]:
+        """Rewrap comments and docstrings with lines which are too long,
+        as :func:`len8.fix.fix_source` does, and write the fixed files
+        in place. Files are checked first, so files the cache shows to
+        be clean are never read, and files are fixed across
+        :obj:`workers` processes. Each fixed file is written to a
+        temporary file first, which then replaces it, so files are
+        never left half written.
+
+        Args:
+            *paths: ``Path`` | ``str``
+                The path or paths to fix.
+
+        Keyword Args:
+            lines: ``dict[pathlib.Path | str, list[tuple[int, int]]]``
+                If given, only lines inside these inclusive
+                ``(start, end)`` ranges are fixed. Defaults to
+                ``None``, which fixes every line.
+
+        Returns:
+            ``list[str]``
+                The resolved paths of the files which were changed.
+
+        Raises:
+            :obj:`InvalidPath`:
+                If strict mode is set to ``True`` and the given path
+                does not exist.
+        """
+        # Imported here, as only fixes need it.
+        from len8.fix import FixJob, _fix_chunk, _fix_file
+
+        jobs: t.List[FixJob] = []
+
+        for report in self._iter_reports(paths, lines):
+            docs_length = self._lengths(report.path)[1]
+            long = [
+                line
+                for line, limit in zip(report.lines, report.limits)
+                if limit == docs_length
+            ]
+
+            if long:
+                jobs.append((report.path, docs_length, long))
+
+        if self.workers == 1 or len(jobs) < 2:
+            fixed = [_fix_file(*job) for job in jobs]
+
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            workers = self.workers or os.cpu_count() or 1
+            size = max(1, min(64, len(jobs) // (workers * 4)))
+            chunks = [jobs[i : i + size] for i in range(0, len(jobs), size)]
+
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                fixed = [
+                    f for c in executor.map(_fix_chunk, chunks) for f in c
+                ]
+
+        return [job[0] for job, changed in zip(jobs, fixed) if changed]
+
+    def recheck(
+        self, path: t.Union[Path, str], changed: t.Optional[Ranges] = None
+    ) -> FileReport:
+        """Check a single file again after it was edited, only scanning
+        the lines that could have changed since it was last rechecked.
+        The state of each line from the last recheck is kept, so the
+        scan starts at the first changed line and stops as soon as the
+        state matches the last recheck again. Unlike :obj:`check`,
+        :obj:`BadLines` is never raised.
+
+        Args:
+            path: ``Path`` | ``str``
+                The path of the file to check.
+            changed: ``list[tuple[int, int]]`` | ``None``
+                The inclusive ``(start, end)`` ranges of lines which
+                changed since the last recheck, numbered as they are
+                now. Deleted lines are marked by the line after them.
+                Defaults to ``None``, which checks the whole file.
+
+        Returns:
+            ``len8.FileReport``
+                The problems in the file.
+        """
+        file = f"{Path(path).resolve()}"
+        code_length, docs_length = self._lengths(file)
+
+        if self._engine != "fast":
+            # The tokenizer keeps no state that scans could resume from.
+            self._line_states.pop(file, None)
+            report = _scan(
+                file, code_length, docs_length, self._engine, self._hashes()
+            )
+            report = self._without_known(report)
+            self._bad_lines = [report] if len(report) else []
+            return report
+
+        with open(file, "rb") as f:
+            data = f.read()
+
+        lines = data.splitlines(True)
+        previous = self._line_states.get(file)
+
+        if (
+            previous is None
+            or previous[:2] != (code_length, docs_length)
+            or changed is None
+        ):
+            report, transitions, _ = _scan_states(
+                lines, file, code_length, docs_length
+            )
+
+        elif not changed:
+            transitions, report = previous[3], previous[4]
+
+        else:
+            old_transitions, old_report = previous[3], previous[4]
+            first = max(min(s for s, _ in changed), 1)
+            last = max(e for _, e in changed)
+            delta = len(lines) - previous[2]
+
+            def old_state(line: int) -> int:
+                return _state_at(old_transitions, line - delta)
+
+            scanned, new, stop = _scan_states(
+                lines[first - 1 :],
+                file,
+                code_length,
+                docs_length,
+                first,
+                _state_at(old_transitions, first),
+                (last, old_state),
+            )
+
+            # Everything from the line the scan stopped at is the same
+            # as last time, just moved by the lines added or removed.
+            report = FileReport(file)
+            for v in old_report:
+                if v.line < first:
+                    report.append(v.line, v.chars, v.limit)
+
+            for v in scanned:
+                report.append(v.line, v.chars, v.limit)
+
+            transitions = [tr for tr in old_transitions if tr[0] <= first]
+            transitions.extend(new)
+
+            if stop is not None:
+                for v in old_report:
+                    if v.line >= stop - delta:
+                        report.append(v.line + delta, v.chars, v.limit)
+
+                transitions.extend(
+                    (line + delta, state)
+                    for line, state in old_transitions
+                    if line > stop - delta
+                )
+
+        # Reports are kept as scanned, as markers may be moved by edits
+        # which don't change the lines they apply to.
+        self._line_states[file] = (
+            code_length,
+            docs_length,
+            len(lines),
+            transitions,
+            report,
+        )
+        report = _suppress(report, data, lines)
+        if self._baseline is not None:
+            report = _hash(report, data, lines)
+
+        report = self._without_known(report)
+        self._bad_lines = [report] if len(report) else []
+        return report
+
+    def iter_check(
+        self,
+        *paths: t.Union[Path, str],
+        lines: t.Optional[LineRanges] = None,
+    ) -> t.Iterator[Violation]:
+        """Check to ensure the line lengths conform to PEP 8 standards,
+        yielding each problem as soon as the file it is in has been
+        checked. Unlike :obj:`check`, problems are not stored on the
+        checker, and :obj:`BadLines` is never raised.
+
+        Args:
+            *paths: ``Path`` | ``str``
+                The path or paths to check.
+
+        Keyword Args:
+            lines: ``dict[pathlib.Path | str, list[tuple[int, int]]]``
+                If given, only lines inside these inclusive
+                ``(start, end)`` ranges are reported. Defaults to
+                ``None``, which reports every line.
+
+        Returns:
+            ``Iterator[len8.Violation]``
+
+        Raises:
+            :obj:`InvalidPath`:
+                If strict mode is set to ``True`` and the given path
+                does not exist.
+        """
+        for report in self._iter_reports(paths, lines):
+            yield from report
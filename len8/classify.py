@@ -0,0 +1,100 @@
+# Copyright (c) 2021-2022, Ethan Henderson, Jonxslays
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+__all__ = ["Regions", "find_docs"]
+
+import tokenize
+import typing as t
+
+Regions = t.List[t.Tuple[int, int]]
+
+# Tokens which don't end or start a statement.
+_SKIPPED = frozenset((tokenize.NL, tokenize.COMMENT, tokenize.ENCODING))
+_STATEMENT_START = frozenset(
+    (tokenize.NEWLINE, tokenize.INDENT, tokenize.DEDENT)
+)
+_STATEMENT_END = frozenset((tokenize.NEWLINE, tokenize.ENDMARKER))
+
+
+def find_docs(readline: t.Callable[[], bytes]) -> t.Optional[Regions]:
+    """Find the lines of a file which are documentation, using the
+    tokenizer. These are lines holding only a comment, and lines spanned
+    by a string which is a statement of its own, such as a docstring.
+    Unlike the default engine, this handles any quotes and prefixes,
+    docstrings on a single line, and triple quotes inside other strings.
+
+    Args:
+        readline: ``Callable[[], bytes]``
+            A function returning the next line of the file, such as the
+            ``readline`` method of a binary file object.
+
+    Returns:
+        ``list[tuple[int, int]]`` | ``None``
+            The inclusive ``(start, end)`` line ranges, in order, or
+            ``None`` if the file could not be tokenized.
+    """
+    regions: Regions = []
+    # The string tokens which might make up a statement, and whether
+    # the previous token started a statement.
+    pending: t.Optional[t.Tuple[int, int]] = None
+    at_start = True
+
+    try:
+        for tok in tokenize.tokenize(readline):
+            kind = tok.type
+
+            if kind == tokenize.COMMENT:
+                if not tok.line[: tok.start[1]].strip():
+                    regions.append((tok.start[0], tok.start[0]))
+                continue
+
+            if kind in _SKIPPED:
+                continue
+
+            if kind == tokenize.STRING and (at_start or pending):
+                start = pending[0] if pending else tok.start[0]
+                pending = (start, tok.end[0])
+                at_start = False
+                continue
+
+            if pending and (
+                kind in _STATEMENT_END
+                or (kind == tokenize.OP and tok.string == ";")
+            ):
+                regions.append(pending)
+
+            pending = None
+            at_start = kind in _STATEMENT_START or (
+                kind == tokenize.OP and tok.string == ";"
+            )
+
+    except (tokenize.TokenError, SyntaxError):
+        return None
+
+    regions.sort()
+    return regions
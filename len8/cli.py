@@ -32,8 +32,9 @@ from pathlib import Path
 
 import click
 
-from len8 import Checker, Config
-from len8.errors import BadLines, ConfigurationError, InvalidPath
+from len8 import __version__, errors
+from len8.checker import ENGINES, Checker, Config, ConfigResolver, LineRanges
+from len8.report import FORMATS, format_report
 
 
 def _as_paths(value: str) -> t.Tuple[Path, ...]:
@@ -43,8 +44,31 @@ def _as_paths(value: str) -> t.Tuple[Path, ...]:
     return tuple(Path(p) for p in value.split(","))
 
 
+def _within(
+    files: t.Iterable[Path], targets: t.Iterable[t.Union[Path, str]]
+) -> t.List[Path]:
+    roots = [Path(p).resolve() for p in targets]
+    return [
+        f
+        for f in files
+        if any(f.resolve() == r or r in f.resolve().parents for r in roots)
+    ]
+
+
+def _watch(checker: Checker, targets: t.Sequence[t.Union[Path, str]]) -> None:
+    from len8.watch import Watcher
+
+    with Watcher(checker, *targets) as watcher:
+        while True:
+            report = format_report(v for r in watcher.reports for v in r)
+            # Clear the screen, as `watch` would.
+            print("\33[2J\33[H", end="")
+            print(report or "\33[1m\33[32mNo problems found\33[0m")
+            watcher.poll()
+
+
 @click.command()
-@click.version_option()
+@click.version_option(__version__)
 @click.argument("paths", type=Path, required=False, nargs=-1)
 @click.option(
     "-x",
@@ -77,6 +101,145 @@ def _as_paths(value: str) -> t.Tuple[Path, ...]:
     metavar="CHARS",
     help="Custom line length for comments and docstrings.",
 )
+@click.option(
+    "--engine",
+    type=click.Choice(ENGINES),
+    help=(
+        "How to tell code from comments and docs. 'tokenize' is more "
+        "accurate, but slower on files with long lines. Defaults to 'fast'."
+    ),
+)
+@click.option(
+    "--gitignore",
+    is_flag=True,
+    help="Skip files and directories ignored by .gitignore files.",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=0),
+    default=1,
+    metavar="N",
+    help="Number of processes to check files with (0 uses every CPU).",
+)
+@click.option(
+    "--prefetch",
+    type=click.IntRange(min=0),
+    default=0,
+    metavar="N",
+    help=(
+        "Number of threads to read files ahead of checking them with, "
+        "which helps on network filesystems (0 disables)."
+    ),
+)
+@click.option(
+    "--prefetch-budget",
+    type=click.IntRange(min=1),
+    default=64,
+    metavar="MIB",
+    help="Most memory prefetched files can use before they are checked.",
+)
+@click.option(
+    "--cache/--no-cache",
+    default=None,
+    help="Reuse results for unchanged files from the .len8_cache directory.",
+)
+@click.option(
+    "--clear-cache",
+    is_flag=True,
+    help="Clear the result cache before checking.",
+)
+@click.option(
+    "--changed-since",
+    metavar="REF",
+    help="Only check files changed since the given git ref.",
+)
+@click.option(
+    "--staged",
+    is_flag=True,
+    help="Only check files with changes staged in git.",
+)
+@click.option(
+    "--changed-lines",
+    is_flag=True,
+    help=(
+        "Only report lines changed according to git. Requires "
+        "--changed-since or --staged."
+    ),
+)
+@click.option(
+    "--fix",
+    is_flag=True,
+    help=(
+        "Rewrap comments and docstrings with lines that are too long, then "
+        "report what is left."
+    ),
+)
+@click.option(
+    "--baseline",
+    "baseline_file",
+    type=Path,
+    metavar="FILE",
+    help="Only report problems which are not in the given baseline.",
+)
+@click.option(
+    "--write-baseline",
+    type=Path,
+    metavar="FILE",
+    help=(
+        "Write every current problem to a baseline, compressed if FILE ends "
+        "in .gz, instead of reporting them."
+    ),
+)
+@click.option(
+    "--watch",
+    is_flag=True,
+    help="Keep running, and recheck files as they change.",
+)
+@click.option(
+    "--daemon",
+    "run_daemon",
+    is_flag=True,
+    help=(
+        "Keep a warm checker running in the foreground, and check paths "
+        "sent with 'python -m len8.daemon'."
+    ),
+)
+@click.option(
+    "--socket",
+    "socket_path",
+    type=Path,
+    metavar="PATH",
+    help=(
+        "The socket the daemon listens on. Defaults to "
+        ".len8_cache/daemon.sock."
+    ),
+)
+@click.option(
+    "-f",
+    "--format",
+    "output_format",
+    type=click.Choice(FORMATS),
+    default="text",
+    help=(
+        "The format to report problems in. Formats other than 'text' are "
+        "written as each file is checked."
+    ),
+)
+@click.option(
+    "--stats",
+    "show_stats",
+    is_flag=True,
+    help="Print statistics about the check, and the slowest files.",
+)
+@click.option(
+    "--discover-config",
+    is_flag=True,
+    help=(
+        "Take line lengths for each file from the nearest pyproject.toml "
+        "with a [tool.len8] table, unless given as options."
+    ),
+)
 @click.option(
     "--config",
     type=Path,
@@ -90,6 +253,25 @@ def len8(
     extend_length: int,
     code_length: t.Optional[int],
     docs_length: t.Optional[int],
+    engine: t.Optional[str],
+    gitignore: bool,
+    jobs: int,
+    prefetch: int,
+    prefetch_budget: int,
+    cache: t.Optional[bool],
+    clear_cache: bool,
+    changed_since: t.Optional[str],
+    staged: bool,
+    changed_lines: bool,
+    fix: bool,
+    baseline_file: t.Optional[Path],
+    write_baseline: t.Optional[Path],
+    watch: bool,
+    run_daemon: bool,
+    socket_path: t.Optional[Path],
+    output_format: str,
+    show_stats: bool,
+    discover_config: bool,
     config: Path,
 ) -> None:
     cfg: t.Optional[Config] = None
@@ -97,36 +279,172 @@ def len8(
     try:
         cfg = Config(config)
 
-    except ConfigurationError as e:
+    except errors.ConfigurationError as e:
+        # Without a configuration file, the defaults are used, but a
+        # file which is there should never be silently ignored.
+        if config.is_file():
+            print(
+                e, file=sys.stdout if output_format == "text" else sys.stderr
+            )
+            sys.exit(1)
+
         checker = Checker(
             exclude=exclude,
             extend=min(extend_length, 2),
             max_code_length=code_length,
             max_docs_length=docs_length,
             strict=True,
+            workers=jobs,
         )
 
     else:
         checker = Checker.from_config(cfg)
         checker.strict = True
+        checker.workers = jobs
         checker.extend = extend_length
         checker.set_lengths(code=code_length or -1, docs=docs_length or -1)
 
         if exclude:
             checker.exclude = list(exclude)
 
+    if discover_config:
+        # Only lengths given as options apply to every file.
+        checker.set_lengths(code=code_length, docs=docs_length)
+        checker.resolver = ConfigResolver()
+
+    if clear_cache:
+        from len8.cache import Cache
+
+        Cache().clear()
+
+        if not paths and not (cfg and cfg.include):
+            return
+
+    if engine:
+        checker.engine = engine
+
+    if gitignore:
+        checker.respect_gitignore = True
+
+    if baseline_file and not write_baseline:
+        from len8.baseline import Baseline
+
+        try:
+            checker.baseline = Baseline.load(baseline_file)
+        except errors.ConfigurationError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+    if prefetch:
+        checker.prefetch = prefetch
+        checker.prefetch_bytes = prefetch_budget * 1024 * 1024
+
+    if cache is not None:
+        checker.cache = None
+
+        if cache:
+            from len8.cache import Cache
+
+            checker.cache = Cache()
+
+    if run_daemon:
+        # The daemon, git, and watch modules are only imported when
+        # they are used, to keep startup fast.
+        from len8 import daemon
+
+        socket_path = socket_path or daemon.DEFAULT_SOCKET
+        print(f"Listening on '{socket_path}' (press Ctrl+C to stop)")
+
+        try:
+            daemon.serve(checker, socket_path)
+        except errors.DaemonError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        except KeyboardInterrupt:
+            pass
+
+        return
+
+    targets: t.Sequence[t.Union[Path, str]] = paths or (
+        cfg.include if cfg and cfg.include else ()
+    )
+    from_git = bool(changed_since or staged)
+
+    if changed_lines and not from_git:
+        print("Error: --changed-lines requires --changed-since or --staged.")
+        sys.exit(1)
+
+    if not targets:
+        if not from_git:
+            print(f"Error: Missing argument 'PATHS...'.")
+            sys.exit(1)
+
+        targets = (Path("."),)
+
+    if watch:
+        try:
+            _watch(checker, targets)
+        except KeyboardInterrupt:
+            pass
+
+        return
+
+    if show_stats:
+        from len8.stats import Stats
+
+        checker.stats = Stats()
+
+    if from_git:
+        from len8 import git
+
+    lines: t.Optional[LineRanges] = None
+
     try:
-        if paths:
-            checker.check(*paths)
+        if changed_lines:
+            lines = git.changed_lines(changed_since, staged=staged)
+            targets = _within(lines, targets)
+
+        elif from_git:
+            files = git.changed_files(changed_since, staged=staged)
+            targets = _within(files, targets)
+
+        if fix:
+            fixed = checker.fix(*targets, lines=lines)
+            print(
+                f"Fixed {len(fixed):,} file(s)",
+                file=sys.stdout if output_format == "text" else sys.stderr,
+            )
+
+        if write_baseline:
+            from len8.baseline import Baseline
+
+            baseline = Baseline(write_baseline.resolve().parent)
+            count = baseline.add(checker.iter_check(*targets, lines=lines))
+            baseline.save(write_baseline)
+            print(f"Wrote {count:,} problem(s) to '{write_baseline}'")
+
+        elif output_format == "text":
+            checker.check(*targets, lines=lines)
 
         else:
-            if cfg and cfg.include:
-                checker.check(*cfg.include)
+            from len8.formats import write_report
+
+            # Machine-readable reports are streamed to stdout, so
+            # anything else goes to stderr.
+            violations = checker.iter_check(*targets, lines=lines)
 
-            else:
-                print(f"Error: Missing argument 'PATHS...'.")
+            if write_report(violations, output_format, sys.stdout):
                 sys.exit(1)
 
-    except (BadLines, InvalidPath) as e:
-        print(e)
+    except (
+        errors.BadLines,
+        errors.ConfigurationError,
+        errors.GitError,
+        errors.InvalidPath,
+    ) as e:
+        print(e, file=sys.stdout if output_format == "text" else sys.stderr)
         sys.exit(1)
+
+    finally:
+        if checker.stats is not None:
+            print(checker.stats, file=sys.stderr)
@@ -0,0 +1,232 @@
+# Copyright (c) 2021-2022, Ethan Henderson, Jonxslays
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+__all__ = ["DEFAULT_SOCKET", "send", "serve", "stop"]
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import sys
+import typing as t
+from pathlib import Path
+
+from len8 import errors
+from len8.cache import MemoryCache
+
+if t.TYPE_CHECKING:
+    from len8.checker import Checker
+
+DEFAULT_SOCKET = Path(".len8_cache") / "daemon.sock"
+
+
+def _connect(path: t.Union[Path, str]) -> socket.socket:
+    if not hasattr(socket, "AF_UNIX"):
+        raise errors.DaemonError("The daemon requires Unix domain sockets.")
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+    try:
+        sock.connect(os.fspath(path))
+    except OSError as e:
+        sock.close()
+        raise errors.DaemonError(
+            f"Could not connect to the daemon at '{path}' ({e})"
+        ) from None
+
+    return sock
+
+
+def _request(
+    path: t.Union[Path, str], payload: t.Dict[str, t.Any]
+) -> t.Dict[str, t.Any]:
+    with _connect(path) as sock:
+        sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+
+        with sock.makefile("rb") as f:
+            response = f.readline()
+
+    if not response:
+        raise errors.DaemonError("The daemon closed the connection.")
+
+    return t.cast(t.Dict[str, t.Any], json.loads(response))
+
+
+def send(
+    *paths: t.Union[Path, str],
+    socket_path: t.Union[Path, str] = DEFAULT_SOCKET,
+) -> t.Tuple[int, t.Optional[str]]:
+    """Check paths using a running daemon.
+
+    Args:
+        *paths: ``pathlib.Path`` | ``str``
+            The path or paths to check. Relative paths are resolved
+            against the current working directory before being sent.
+
+    Keyword Args:
+        socket_path: ``pathlib.Path`` | ``str``
+            The path of the daemon's socket. Defaults to
+            ``.len8_cache/daemon.sock``.
+
+    Returns:
+        ``tuple[int, str | None]``
+            The exit status (``0`` if all lines were fine, ``1`` if
+            not), and the output to show.
+
+    Raises:
+        :obj:`DaemonError`:
+            If the daemon could not be reached.
+    """
+    response = _request(
+        socket_path, {"paths": [os.path.abspath(p) for p in paths]}
+    )
+    return response["status"], response["output"]
+
+
+def stop(socket_path: t.Union[Path, str] = DEFAULT_SOCKET) -> None:
+    """Stop a running daemon.
+
+    Args:
+        socket_path: ``pathlib.Path`` | ``str``
+            The path of the daemon's socket. Defaults to
+            ``.len8_cache/daemon.sock``.
+
+    Raises:
+        :obj:`DaemonError`:
+            If the daemon could not be reached.
+    """
+    _request(socket_path, {"command": "stop"})
+
+
+def serve(
+    checker: "Checker", socket_path: t.Union[Path, str] = DEFAULT_SOCKET
+) -> None:
+    """Serve check requests until the daemon is stopped. The checker
+    is kept between requests, along with an in-memory cache of results
+    for files which haven't changed.
+
+    Args:
+        checker: ``len8.Checker``
+            The checker to check paths with.
+        socket_path: ``pathlib.Path`` | ``str``
+            The path to create the socket at. Defaults to
+            ``.len8_cache/daemon.sock``.
+
+    Raises:
+        :obj:`DaemonError`:
+            If Unix domain sockets are unavailable, or a daemon is
+            already listening on the socket.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise errors.DaemonError("The daemon requires Unix domain sockets.")
+
+    socket_path = Path(socket_path)
+
+    if socket_path.exists():
+        try:
+            _connect(socket_path).close()
+        except errors.DaemonError:
+            # Left behind by a daemon that didn't shut down cleanly.
+            socket_path.unlink()
+        else:
+            raise errors.DaemonError(
+                f"A daemon is already listening at '{socket_path}'."
+            )
+
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    checker.cache = MemoryCache()
+    checker.strict = True
+    stopped = False
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            nonlocal stopped
+            status, output = 0, None
+            line = self.rfile.readline()
+
+            if not line:
+                # A probe checking whether the daemon is running.
+                return
+
+            try:
+                request = json.loads(line)
+
+                if request.get("command") == "stop":
+                    stopped = True
+                else:
+                    checker.check(*request["paths"])
+
+            except (errors.BadLines, errors.InvalidPath) as e:
+                status, output = 1, f"{e}"
+
+            except Exception as e:
+                status, output = 2, f"Error: {e!r}"
+
+            response = {"status": status, "output": output}
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+    with socketserver.UnixStreamServer(
+        os.fspath(socket_path), Handler
+    ) as server:
+        try:
+            while not stopped:
+                server.handle_request()
+        finally:
+            socket_path.unlink()
+
+
+def main(argv: t.Optional[t.Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m len8.daemon",
+        description="Check files using a running len8 daemon.",
+    )
+    parser.add_argument("paths", nargs="*", default=["."])
+    parser.add_argument("--socket", default=os.fspath(DEFAULT_SOCKET))
+    parser.add_argument("--stop", action="store_true", help="Stop the daemon.")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.stop:
+            stop(args.socket)
+            return 0
+
+        status, output = send(*args.paths, socket_path=args.socket)
+
+    except errors.DaemonError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    if output:
+        print(output)
+
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -26,7 +26,14 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-__all__ = ["Len8Error", "BadLines", "ConfigurationError", "InvalidPath"]
+__all__ = [
+    "Len8Error",
+    "BadLines",
+    "ConfigurationError",
+    "DaemonError",
+    "GitError",
+    "InvalidPath",
+]
 
 from pathlib import Path
 
@@ -43,6 +50,14 @@ class ConfigurationError(Len8Error):
     """Raised when configuration of the Checker fails."""
 
 
+class DaemonError(Len8Error):
+    """Raised when the len8 daemon cannot be started or reached."""
+
+
+class GitError(Len8Error):
+    """Raised when changed files cannot be read from git."""
+
+
 class InvalidPath(Len8Error):
     """Raised when an invalid path is passed to be checked."""
 
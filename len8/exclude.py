@@ -0,0 +1,165 @@
+# Copyright (c) 2021-2022, Ethan Henderson, Jonxslays
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+__all__ = ["ExcludeMatcher"]
+
+import re
+import typing as t
+from pathlib import Path
+
+GLOB_CHARS = frozenset("*?[")
+
+# Marks the end of an exclude in the trie.
+_END = ""
+
+
+def _translate(pattern: str) -> str:
+    # Translates a gitignore-style glob into a regex, where "*" and "?"
+    # don't cross directories, and "**" does.
+    i, n = 0, len(pattern)
+    out = []
+
+    while i < n:
+        c = pattern[i]
+
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+
+        if pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+
+        if c == "\\" and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 1
+        elif c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            end = pattern.find("]", i + 2)
+
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1 : end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end
+        else:
+            out.append(re.escape(c))
+
+        i += 1
+
+    return "".join(out)
+
+
+class ExcludeMatcher:
+    """A set of excludes compiled for fast matching.
+
+    Literal excludes are stored in a trie of path parts. Relative ones
+    match wherever their parts appear in a row in a path, and absolute
+    ones match the path they point to and everything inside it. Excludes
+    containing glob characters (``*``, ``?``, and ``[``) are combined
+    into one regex, where ``**`` can span any number of directories.
+
+    Args:
+        excludes: ``Iterable[pathlib.Path | str]``
+            The excludes to compile.
+    """
+
+    __slots__: t.Sequence[str] = ("_relative", "_absolute", "_pattern")
+
+    def __init__(self, excludes: t.Iterable[t.Union[Path, str]]) -> None:
+        self._relative: t.Dict[str, t.Any] = {}
+        self._absolute: t.Dict[str, t.Any] = {}
+        globs = []
+
+        for e in excludes:
+            if GLOB_CHARS.intersection(f"{e}"):
+                pattern = Path(e).as_posix()
+
+                if Path(e).is_absolute():
+                    globs.append(f"^{_translate(pattern)}(?:/|$)")
+                else:
+                    globs.append(f"(?:^|/){_translate(pattern)}(?:/|$)")
+                continue
+
+            e = Path(e)
+            node = self._absolute if e.is_absolute() else self._relative
+
+            for part in e.parts:
+                node = node.setdefault(part, {})
+
+            node[_END] = True
+
+        self._pattern = re.compile("|".join(globs)) if globs else None
+
+    @staticmethod
+    def _walk(node: t.Dict[str, t.Any], parts: t.Sequence[str]) -> bool:
+        for part in parts:
+            node = node.get(part)  # type: ignore
+
+            if node is None:
+                return False
+
+            if _END in node:
+                return True
+
+        return False
+
+    def match(self, path: Path) -> bool:
+        """Check whether a path is excluded.
+
+        Args:
+            path: ``pathlib.Path``
+                The path to check.
+
+        Returns:
+            ``bool``
+        """
+        parts = path.parts
+        relative = self._relative
+
+        if relative:
+            for i, part in enumerate(parts):
+                if part in relative and self._walk(relative, parts[i:]):
+                    return True
+
+        if self._absolute:
+            if self._walk(self._absolute, path.absolute().parts):
+                return True
+
+        if self._pattern is not None:
+            return self._pattern.search(path.as_posix()) is not None
+
+        return False
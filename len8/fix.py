@@ -0,0 +1,466 @@
+# Copyright (c) 2021-2022, Ethan Henderson, Jonxslays
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+__all__ = ["fix_source"]
+
+import io
+import os
+import re
+import stat
+import tempfile
+import textwrap
+import typing as t
+
+from len8.classify import Regions, find_docs
+
+# Comments which tools read, and which must be left alone.
+_DIRECTIVE = re.compile(r"#!|#\s*(?:type|noqa|pragma|fmt|isort|nosec|len8)\b")
+# The start of a list item, which is wrapped on its own.
+_ITEM = re.compile(r"(?:[-*+]|\d+[.)])\s+")
+# The starts of lines which are laid out by hand, such as doctests,
+# fields, and snippets of code or shell sessions.
+_VERBATIM = tuple(".:@|$#%<>=/\\~;{}[]")
+# The opening quotes of a docstring which can be rewrapped.
+_OPENER = re.compile(r"[rRuU]?(\"\"\"|''')")
+
+# The first and last lines of a paragraph, the prefixes for its first
+# and other lines, the text to end it with, and its words.
+Paragraph = t.Tuple[int, int, str, str, str, t.List[str]]
+# The first and last lines of a docstring, and its opening and closing
+# quotes.
+_String = t.Tuple[int, int, str, str]
+FixJob = t.Tuple[str, int, t.Optional[t.List[int]]]
+
+
+def _is_prose(text: str) -> bool:
+    # Whether the text of a line can be joined with its neighbours.
+    return bool(
+        text
+        and not text[0].isspace()
+        and not text.endswith("\\")
+        and '"""' not in text
+        and "'''" not in text
+        and not text.startswith(_VERBATIM)
+        and not _ITEM.match(text)
+    )
+
+
+def _split(line: str) -> t.Tuple[str, str]:
+    text = line.lstrip()
+    return line[: len(line) - len(text)], text
+
+
+class _Source:
+    # The lines of a file, and which of them are comments or docstrings
+    # according to the tokenizer.
+
+    __slots__: t.Sequence[str] = (
+        "raw",
+        "lines",
+        "comments",
+        "strings",
+        "doctests",
+    )
+
+    def __init__(self, text: str, regions: Regions) -> None:
+        # Lines are split only on "\n", as the tokenizer splits them.
+        parts = text.split("\n")
+        self.raw = [f"{line}\n" for line in parts[:-1]]
+        if parts[-1]:
+            self.raw.append(parts[-1])
+
+        self.lines = [line.rstrip() for line in self.raw]
+        self.comments: t.Set[int] = set()
+        self.strings: t.Dict[int, _String] = {}
+        self.doctests: t.Set[int] = set()
+
+        # The license header is left alone, as the checker skips it.
+        header = 0
+        while header < len(self.lines) and self.lines[header][:1] == "#":
+            header += 1
+
+        for start, end in regions:
+            first = self.lines[start - 1].lstrip()
+
+            if start == end and first.startswith("#"):
+                if start > header:
+                    self.comments.add(start)
+                continue
+
+            match = _OPENER.match(first)
+            if match is None:
+                continue
+
+            # Strings joined to others can't be rewrapped.
+            quote = match.group(1)
+            joined = "\n".join(self.lines[start - 1 : end]).strip()
+            if not joined.endswith(quote) or joined.count(quote) != 2:
+                continue
+
+            string = (start, end, match.group(), quote)
+            doctest = False
+
+            for number in range(start, end + 1):
+                self.strings[number] = string
+
+                # Doctests run until the next blank line, and their
+                # output must be left as it is.
+                text = self.lines[number - 1].lstrip()
+                doctest = text.startswith(">>>") or (doctest and bool(text))
+                if doctest:
+                    self.doctests.add(number)
+
+    def comment(self, number: int, indent: str) -> t.Optional[str]:
+        # The text of a comment which can be joined with others.
+        if number not in self.comments:
+            return None
+
+        line = self.lines[number - 1]
+        lead = f"{indent}# "
+
+        if not line.startswith(lead) or _DIRECTIVE.match(line, len(indent)):
+            return None
+
+        text = line[len(lead) :]
+        return text if _is_prose(text) else None
+
+    def body(
+        self, number: int, indent: str, string: _String
+    ) -> t.Optional[str]:
+        # The text of a line inside a docstring which can be joined
+        # with others.
+        start, end, _, quote = string
+
+        if number == start or self.strings.get(number) != string:
+            return None
+
+        if number in self.doctests:
+            return None
+
+        line = self.lines[number - 1]
+        if not line.startswith(indent):
+            return None
+
+        text = line[len(indent) :]
+        if number == end:
+            text = text[: -len(quote)]
+
+        return text if _is_prose(text) else None
+
+    def continuation(
+        self, number: int, indent: str, string: t.Optional[_String]
+    ) -> t.Optional[t.Tuple[str, str]]:
+        # The prefix and text of a line indented past the paragraph
+        # before it, such as the rest of a list item.
+        if string is None:
+            if number not in self.comments:
+                return None
+
+            lead = f"{indent}#  "
+        else:
+            if number == string[0] or self.strings.get(number) != string:
+                return None
+
+            if number in self.doctests:
+                return None
+
+            lead = f"{indent} "
+
+        line = self.lines[number - 1]
+        if not line.startswith(lead):
+            return None
+
+        text = line[len(lead) :].lstrip()
+        prefix = line[: len(line) - len(text)]
+
+        if string is not None and number == string[1]:
+            text = text[: -len(string[3])]
+
+        return (prefix, text) if _is_prose(text) else None
+
+
+def _comment(source: _Source, number: int) -> t.Optional[Paragraph]:
+    indent, text = _split(source.lines[number - 1])
+    lead = f"{indent}# "
+
+    if not text.startswith("# ") or _DIRECTIVE.match(text):
+        return None
+
+    text = text[2:]
+    item = _ITEM.match(text)
+
+    if item:
+        return _item(source, number, lead, lead + " " * item.end(), text)
+
+    if not _is_prose(text):
+        return None
+
+    start = end = number
+    texts = [text]
+
+    while True:
+        previous = source.comment(start - 1, indent)
+        if previous is None or previous.endswith(":"):
+            break
+
+        texts.insert(0, previous)
+        start -= 1
+
+    while not texts[-1].endswith(":"):
+        following = source.comment(end + 1, indent)
+        if following is None:
+            break
+
+        texts.append(following)
+        end += 1
+
+    return start, end, lead, lead, "", " ".join(texts).split()
+
+
+def _item(
+    source: _Source,
+    number: int,
+    first: str,
+    hang: str,
+    text: str,
+    string: t.Optional[_String] = None,
+) -> Paragraph:
+    # A list item is wrapped with the lines indented past it, which
+    # keep their indentation, or with a hanging indent if there are
+    # none.
+    indent = first[: len(first) - len(first.lstrip())]
+    last = string[1] if string else 0
+    end = number
+    texts = [text]
+
+    while end != last and not texts[-1].endswith(":"):
+        following = source.continuation(end + 1, indent, string)
+        if following is None or (end > number and following[0] != hang):
+            break
+
+        hang, text = following
+        texts.append(text)
+        end += 1
+
+    suffix = string[3] if string and end == last else ""
+    return number, end, first, hang, suffix, " ".join(texts).split()
+
+
+def _docstring(source: _Source, number: int) -> t.Optional[Paragraph]:
+    if number in source.doctests:
+        return None
+
+    string = source.strings[number]
+    first, last, opener, quote = string
+    indent, text = _split(source.lines[number - 1])
+    quotes = ""
+
+    if number == first:
+        quotes, text = opener, text[len(opener) :]
+
+    closes = number == last
+    if closes:
+        text = text[: -len(quote)]
+
+    item = _ITEM.match(text)
+
+    if item and quote not in text:
+        hang = indent + " " * (len(quotes) + item.end())
+        return _item(source, number, indent + quotes, hang, text, string)
+
+    if not _is_prose(text):
+        return None
+
+    start = end = number
+    texts = [text]
+
+    if not quotes:
+        while True:
+            previous = source.body(start - 1, indent, string)
+            if previous is None or previous.endswith(":"):
+                break
+
+            texts.insert(0, previous)
+            start -= 1
+
+        # The paragraph may start on the line opening the docstring.
+        if start - 1 == first:
+            line = source.lines[first - 1]
+            previous = line[len(indent) + len(opener) :]
+
+            if (
+                line.startswith(f"{indent}{opener}")
+                and _is_prose(previous)
+                and not previous.endswith(":")
+            ):
+                quotes = opener
+                texts.insert(0, previous)
+                start -= 1
+
+    while not closes and not texts[-1].endswith(":"):
+        following = source.body(end + 1, indent, string)
+        if following is None:
+            break
+
+        texts.append(following)
+        end += 1
+        closes = end == last
+
+    suffix = quote if closes else ""
+    return start, end, indent + quotes, indent, suffix, " ".join(texts).split()
+
+
+def _rewrap(source: _Source, paragraph: Paragraph, width: int) -> t.List[str]:
+    start, end, first, lead, suffix, words = paragraph
+    wrapper = textwrap.TextWrapper(
+        width=width,
+        initial_indent=first,
+        subsequent_indent=lead,
+        break_long_words=False,
+        break_on_hyphens=False,
+    )
+    # The closing quotes stay attached to the last word.
+    wrapped = wrapper.wrap(" ".join(words) + suffix)
+
+    first_line, last_line = source.raw[start - 1], source.raw[end - 1]
+    ending = first_line[len(first_line.rstrip("\r\n")) :] or "\n"
+    last = last_line[len(last_line.rstrip("\r\n")) :]
+    return [f"{line}{ending}" for line in wrapped[:-1]] + [
+        f"{wrapped[-1]}{last}"
+    ]
+
+
+def _fix_data(
+    data: bytes,
+    docs_length: int,
+    lines: t.Optional[t.Container[int]] = None,
+) -> t.Optional[bytes]:
+    # The tokenizer only splits lines on "\n", so line numbers would
+    # drift in files with lone "\r" line endings.
+    if data.count(b"\r") != data.count(b"\r\n"):
+        return None
+
+    regions = find_docs(io.BytesIO(data).readline)
+
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+
+    if not regions:
+        return None
+
+    source = _Source(text, regions)
+    paragraphs: t.List[Paragraph] = []
+    done = 0
+
+    for number in sorted({*source.comments, *source.strings}):
+        if number <= done or len(source.lines[number - 1]) <= docs_length:
+            continue
+
+        if lines is not None and number not in lines:
+            continue
+
+        if number in source.comments:
+            paragraph = _comment(source, number)
+        else:
+            paragraph = _docstring(source, number)
+
+        if paragraph is not None and paragraph[0] > done:
+            paragraphs.append(paragraph)
+            done = paragraph[1]
+
+    if not paragraphs:
+        return None
+
+    # Later paragraphs are replaced first, so the line numbers of
+    # earlier ones still hold.
+    fixed = source.raw[:]
+    for paragraph in reversed(paragraphs):
+        start, end = paragraph[0], paragraph[1]
+        fixed[start - 1 : end] = _rewrap(source, paragraph, docs_length)
+
+    result = "".join(fixed).encode("utf-8")
+    return None if result == data else result
+
+
+def fix_source(source: str, docs_length: int = 72) -> str:
+    """Rewrap paragraphs of comments and docstrings which have lines
+    longer than the maximum length for documentation, keeping their
+    indentation. Comments and docstrings are found with the tokenizer,
+    so code is never changed. List items are wrapped on their own, and
+    directives such as ``# type:``, doctests, and lines indented past
+    their paragraph are left alone.
+
+    Args:
+        source: ``str``
+            The source code to fix.
+        docs_length: ``int``
+            The maximum line length for comments and documentation.
+            Defaults to ``72``.
+
+    Returns:
+        ``str``
+            The fixed source code. Words are never broken, so lines
+            with very long words may still be too long.
+    """
+    fixed = _fix_data(source.encode("utf-8"), docs_length)
+    return source if fixed is None else fixed.decode("utf-8")
+
+
+def _fix_file(
+    file: str, docs_length: int, lines: t.Optional[t.List[int]] = None
+) -> bool:
+    with open(file, "rb") as f:
+        data = f.read()
+
+    fixed = _fix_data(data, docs_length, None if lines is None else {*lines})
+    if fixed is None:
+        return False
+
+    # The fixed file is written next to the original, then moved over
+    # it, so it's never left half written.
+    directory, name = os.path.split(file)
+    fd, tmp = tempfile.mkstemp(prefix=f".{name}.", dir=directory)
+
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(fixed)
+
+        os.chmod(tmp, stat.S_IMODE(os.stat(file).st_mode))
+        os.replace(tmp, file)
+
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+    return True
+
+
+def _fix_chunk(jobs: t.List[FixJob]) -> t.List[bool]:
+    return [_fix_file(*job) for job in jobs]
@@ -0,0 +1,347 @@
+# Copyright (c) 2021-2022, Ethan Henderson, Jonxslays
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+__all__ = ["FORMATS", "Writer", "get_writer", "write_report"]
+
+import html
+import json
+import os
+import typing as t
+from pathlib import Path
+
+from len8 import __url__, __version__
+from len8.report import FORMATS, Violation
+
+_RULE = "line-too-long"
+_SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+
+def _message(violation: Violation) -> str:
+    return f"Line too long ({violation.chars}/{violation.limit})"
+
+
+def _as_dict(violation: Violation) -> t.Dict[str, t.Any]:
+    return dict(violation._asdict())
+
+
+def _relative(path: str) -> str:
+    # CI services expect paths relative to the checkout, which is the
+    # working directory.
+    try:
+        return Path(path).relative_to(os.getcwd()).as_posix()
+    except ValueError:
+        return Path(path).as_posix()
+
+
+class Writer:
+    """Writes problems to a stream as they are found, rather than
+    building the whole report first. Each file's problems are flushed
+    as soon as the next file starts. This writes the same report as
+    :func:`len8.format_report`, and is subclassed for other formats.
+
+    Args:
+        stream: ``TextIO``
+            The stream to write to.
+    """
+
+    __slots__: t.Sequence[str] = ("_stream", "_path", "_count")
+
+    def __init__(self, stream: t.TextIO) -> None:
+        self._stream = stream
+        self._path: t.Optional[str] = None
+        self._count = 0
+
+    @property
+    def count(self) -> int:
+        """The number of problems written so far.
+
+        Returns:
+            ``int``
+        """
+        return self._count
+
+    def _start(self) -> None:
+        pass
+
+    def _start_file(self, path: str) -> None:
+        self._stream.write(f"\33[1m{path}\33[0m\n")
+
+    def _end_file(self, path: str) -> None:
+        pass
+
+    def _write(self, violation: Violation) -> None:
+        self._stream.write(
+            f"  * Line {violation.line} ({violation.chars}/"
+            f"{violation.limit})\n"
+        )
+
+    def _end(self) -> None:
+        if self._count:
+            self._stream.write(
+                f"\n\33[1m\33[31mFound {self._count:,} problem(s)\33[0m\n"
+            )
+
+    def start(self) -> None:
+        """Write anything that comes before the first problem."""
+        self._start()
+
+    def write(self, violation: Violation) -> None:
+        """Write a single problem. Problems should be grouped by file,
+        as they are by :obj:`len8.Checker.iter_check`.
+
+        Args:
+            violation: ``len8.Violation``
+                The problem to write.
+        """
+        if violation.path != self._path:
+            if self._path is not None:
+                self._end_file(self._path)
+                self._stream.flush()
+
+            self._path = violation.path
+            self._start_file(violation.path)
+
+        self._write(violation)
+        self._count += 1
+
+    def finish(self) -> None:
+        """Write anything that comes after the last problem, and flush
+        the stream.
+        """
+        if self._path is not None:
+            self._end_file(self._path)
+
+        self._end()
+        self._stream.flush()
+
+
+class _JsonWriter(Writer):
+    __slots__: t.Sequence[str] = ()
+
+    def _start(self) -> None:
+        self._stream.write("[")
+
+    def _start_file(self, path: str) -> None:
+        pass
+
+    def _write(self, violation: Violation) -> None:
+        if self._count:
+            self._stream.write(",")
+
+        self._stream.write(f"\n  {json.dumps(_as_dict(violation))}")
+
+    def _end(self) -> None:
+        self._stream.write("\n]\n" if self._count else "]\n")
+
+
+class _JsonLinesWriter(Writer):
+    __slots__: t.Sequence[str] = ()
+
+    def _start_file(self, path: str) -> None:
+        pass
+
+    def _write(self, violation: Violation) -> None:
+        self._stream.write(f"{json.dumps(_as_dict(violation))}\n")
+
+    def _end(self) -> None:
+        pass
+
+
+class _SarifWriter(Writer):
+    __slots__: t.Sequence[str] = ("_suffix",)
+
+    def __init__(self, stream: t.TextIO) -> None:
+        super().__init__(stream)
+        self._suffix = ""
+
+    def _start(self) -> None:
+        driver = {
+            "name": "len8",
+            "informationUri": __url__,
+            "version": __version__,
+            "rules": [
+                {
+                    "id": _RULE,
+                    "shortDescription": {"text": "Line too long"},
+                }
+            ],
+        }
+        log = {
+            "$schema": _SARIF_SCHEMA,
+            "version": "2.1.0",
+            "runs": [{"tool": {"driver": driver}, "results": []}],
+        }
+        # The results are streamed into the empty list.
+        prefix, self._suffix = json.dumps(log).rsplit("[]", 1)
+        self._stream.write(f"{prefix}[")
+
+    def _start_file(self, path: str) -> None:
+        pass
+
+    def _write(self, violation: Violation) -> None:
+        result = {
+            "ruleId": _RULE,
+            "level": "error",
+            "message": {"text": _message(violation)},
+            "locations": [
+                {
+                    "physicalLocation": {
+                        "artifactLocation": {"uri": _relative(violation.path)},
+                        "region": {
+                            "startLine": violation.line,
+                            "startColumn": violation.limit + 1,
+                        },
+                    }
+                }
+            ],
+        }
+
+        if self._count:
+            self._stream.write(", ")
+
+        self._stream.write(json.dumps(result))
+
+    def _end(self) -> None:
+        self._stream.write(f"]{self._suffix}\n")
+
+
+class _GitHubWriter(Writer):
+    __slots__: t.Sequence[str] = ()
+
+    def _start_file(self, path: str) -> None:
+        pass
+
+    def _write(self, violation: Violation) -> None:
+        # Workflow commands escape these characters in properties.
+        file = (
+            _relative(violation.path)
+            .replace("%", "%25")
+            .replace("\r", "%0D")
+            .replace("\n", "%0A")
+            .replace(":", "%3A")
+            .replace(",", "%2C")
+        )
+        self._stream.write(
+            f"::error file={file},line={violation.line},"
+            f"col={violation.limit + 1},title=len8::{_message(violation)}\n"
+        )
+
+    def _end(self) -> None:
+        pass
+
+
+class _CheckstyleWriter(Writer):
+    __slots__: t.Sequence[str] = ()
+
+    def _start(self) -> None:
+        self._stream.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<checkstyle version="4.3">\n'
+        )
+
+    def _start_file(self, path: str) -> None:
+        self._stream.write(f'  <file name="{html.escape(path)}">\n')
+
+    def _end_file(self, path: str) -> None:
+        self._stream.write("  </file>\n")
+
+    def _write(self, violation: Violation) -> None:
+        self._stream.write(
+            f'    <error line="{violation.line}" '
+            f'column="{violation.limit + 1}" severity="error" '
+            f'message="{html.escape(_message(violation))}" '
+            f'source="len8.{_RULE}"/>\n'
+        )
+
+    def _end(self) -> None:
+        self._stream.write("</checkstyle>\n")
+
+
+_WRITERS: t.Dict[str, t.Type[Writer]] = {
+    "text": Writer,
+    "json": _JsonWriter,
+    "jsonl": _JsonLinesWriter,
+    "sarif": _SarifWriter,
+    "github": _GitHubWriter,
+    "checkstyle": _CheckstyleWriter,
+}
+
+
+def get_writer(format: str, stream: t.TextIO) -> Writer:
+    """Get a writer for the given format.
+
+    Args:
+        format: ``str``
+            One of ``"text"``, ``"json"``, ``"jsonl"``, ``"sarif"``,
+            ``"github"``, or ``"checkstyle"``.
+        stream: ``TextIO``
+            The stream to write to.
+
+    Returns:
+        ``len8.formats.Writer``
+
+    Raises:
+        :obj:`ValueError`:
+            If the format is not supported.
+    """
+    try:
+        return _WRITERS[format](stream)
+    except KeyError:
+        raise ValueError(f"unsupported format {format!r}") from None
+
+
+def write_report(
+    violations: t.Iterable[Violation], format: str, stream: t.TextIO
+) -> int:
+    """Write problems to a stream as they are found.
+
+    Args:
+        violations: ``Iterable[len8.Violation]``
+            The problems to write, grouped by file, such as those
+            yielded by :obj:`len8.Checker.iter_check`.
+        format: ``str``
+            The format to write in. See :func:`get_writer`.
+        stream: ``TextIO``
+            The stream to write to.
+
+    Returns:
+        ``int``
+            The number of problems written.
+    """
+    writer = get_writer(format, stream)
+    writer.start()
+
+    # Documents are always closed, so a check which fails part way
+    # through still leaves valid output behind.
+    try:
+        for violation in violations:
+            writer.write(violation)
+    finally:
+        writer.finish()
+
+    return writer.count
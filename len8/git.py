@@ -0,0 +1,214 @@
+# Copyright (c) 2021-2022, Ethan Henderson, Jonxslays
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+__all__ = ["changed_files", "changed_lines"]
+
+import re
+import subprocess  # nosec
+import typing as t
+from pathlib import Path
+
+from len8 import errors
+
+HUNK_PATTERN = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+SUFFIXES = ("*.py", "*.pyw")
+# The escapes git uses in quoted names, other than octal ones.
+_ESCAPES = {
+    ord("a"): 7,
+    ord("b"): 8,
+    ord("t"): 9,
+    ord("n"): 10,
+    ord("v"): 11,
+    ord("f"): 12,
+    ord("r"): 13,
+}
+
+
+def _git(*args: str, cwd: t.Optional[Path] = None) -> str:
+    try:
+        proc = subprocess.run(  # nosec
+            ["git", "-c", "core.quotePath=false", *args],
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+    except OSError as e:
+        raise errors.GitError(f"Failed to run git ({e})") from None
+
+    if proc.returncode:
+        message = proc.stderr.decode("utf-8", "replace").strip()
+        raise errors.GitError(f"git {args[0]} failed\n{message}")
+
+    return proc.stdout.decode("utf-8", "surrogateescape")
+
+
+def _diff_args(ref: t.Optional[str], staged: bool) -> t.List[str]:
+    args = ["diff", "--no-color", "--no-ext-diff", "--diff-filter=d"]
+
+    if staged:
+        args.append("--cached")
+
+    if ref:
+        args.append(ref)
+
+    return args
+
+
+def _unquote(name: str) -> str:
+    # Git ends names containing spaces with a tab in diff headers, and
+    # quotes names containing special characters, C-style.
+    if name.endswith("\t"):
+        name = name[:-1]
+
+    if len(name) < 2 or name[0] != '"' or name[-1] != '"':
+        return name
+
+    raw = name[1:-1].encode("utf-8", "surrogateescape")
+    out = bytearray()
+    i = 0
+
+    while i < len(raw):
+        if raw[i] != ord("\\") or i + 1 == len(raw):
+            out.append(raw[i])
+            i += 1
+        elif raw[i + 1 : i + 2].isdigit():
+            # Octal escapes are single bytes of the UTF-8 name.
+            out.append(int(raw[i + 1 : i + 4], 8))
+            i += 4
+        else:
+            out.append(_ESCAPES.get(raw[i + 1], raw[i + 1]))
+            i += 2
+
+    return out.decode("utf-8", "surrogateescape")
+
+
+def _root(cwd: t.Optional[Path]) -> Path:
+    return Path(_git("rev-parse", "--show-toplevel", cwd=cwd).strip())
+
+
+def changed_files(
+    ref: t.Optional[str] = None,
+    *,
+    staged: bool = False,
+    cwd: t.Optional[Path] = None,
+) -> t.List[Path]:
+    """Get the Python files that have changed in a git repository.
+
+    Args:
+        ref: ``str`` | ``None``
+            The ref to compare against. If this is not given, the
+            working tree (or the index, if :obj:`staged` is ``True``)
+            is compared against the index (or ``HEAD``).
+
+    Keyword Args:
+        staged: ``bool``
+            Whether to only consider changes that have been staged.
+            Defaults to ``False``.
+        cwd: ``pathlib.Path`` | ``None``
+            A directory inside the repository. Defaults to the current
+            working directory.
+
+    Returns:
+        ``list[pathlib.Path]``
+            The absolute paths of the changed files. Deleted files are
+            not included.
+
+    Raises:
+        :obj:`GitError`:
+            If git could not be run, or the diff failed.
+    """
+    root = _root(cwd)
+    out = _git(
+        *_diff_args(ref, staged),
+        "--name-only",
+        "-z",
+        "--",
+        *SUFFIXES,
+        cwd=root,
+    )
+    return [root / name for name in out.split("\0") if name]
+
+
+def changed_lines(
+    ref: t.Optional[str] = None,
+    *,
+    staged: bool = False,
+    cwd: t.Optional[Path] = None,
+) -> t.Dict[Path, t.List[t.Tuple[int, int]]]:
+    """Get the line ranges of the Python files that have changed in a
+    git repository. This takes the same arguments as
+    :func:`changed_files`.
+
+    Returns:
+        ``dict[pathlib.Path, list[tuple[int, int]]]``
+            The absolute paths of the changed files, mapped to the
+            inclusive ``(start, end)`` ranges of their added or
+            modified lines.
+
+    Raises:
+        :obj:`GitError`:
+            If git could not be run, or the diff failed.
+    """
+    root = _root(cwd)
+    out = _git(
+        *_diff_args(ref, staged),
+        "--no-prefix",
+        "--unified=0",
+        "--",
+        *SUFFIXES,
+        cwd=root,
+    )
+    ranges: t.Dict[Path, t.List[t.Tuple[int, int]]] = {}
+    current: t.List[t.Tuple[int, int]] = []
+
+    in_header = False
+
+    for line in out.splitlines():
+        if line.startswith("diff --git "):
+            in_header = True
+            continue
+
+        if in_header:
+            if line.startswith("+++ "):
+                current = ranges.setdefault(root / _unquote(line[4:]), [])
+
+            if not line.startswith("@@"):
+                continue
+
+            in_header = False
+
+        match = HUNK_PATTERN.match(line)
+        if not match:
+            continue
+
+        start = int(match.group(1))
+        count = int(match.group(2) or 1)
+        if count:
+            current.append((start, start + count - 1))
+
+    return ranges
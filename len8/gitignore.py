@@ -0,0 +1,246 @@
+# Copyright (c) 2021-2022, Ethan Henderson, Jonxslays
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+__all__ = ["GitIgnore", "is_ignored", "load", "load_rules"]
+
+import os
+import re
+import typing as t
+from pathlib import Path
+
+from len8.exclude import _translate
+
+Rules = t.Tuple["GitIgnore", ...]
+
+
+class GitIgnore:
+    """The patterns from a single ``.gitignore`` file.
+
+    Args:
+        base: ``str``
+            The absolute path of the directory the patterns are relative
+            to.
+        lines: ``Iterable[str]``
+            The lines of the file.
+    """
+
+    __slots__: t.Sequence[str] = ("_base", "_rules")
+
+    def __init__(self, base: str, lines: t.Iterable[str]) -> None:
+        self._base = os.path.join(base, "")
+        self._rules: t.List[t.Tuple[t.Pattern[str], bool, bool]] = []
+
+        for line in lines:
+            line = line.rstrip("\r\n")
+
+            # Trailing spaces are ignored unless they are escaped.
+            if not line.endswith("\\ "):
+                line = line.rstrip(" ")
+
+            if not line or line.startswith("#"):
+                continue
+
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            elif line.startswith(("\\!", "\\#")):
+                line = line[1:]
+
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+
+            if not line:
+                continue
+
+            # Patterns containing a slash are relative to the directory
+            # of the .gitignore file, others match at any depth.
+            if "/" in line:
+                regex = f"^{_translate(line.lstrip('/'))}$"
+            else:
+                regex = f"^(?:.*/)?{_translate(line)}$"
+
+            self._rules.append((re.compile(regex), negate, dir_only))
+
+    @classmethod
+    def from_file(cls, path: t.Union[str, Path], base: str) -> "GitIgnore":
+        """Load the patterns from a file.
+
+        Args:
+            path: ``str`` | ``pathlib.Path``
+                The file to load.
+            base: ``str``
+                The absolute path of the directory the patterns are
+                relative to.
+
+        Returns:
+            ``len8.gitignore.GitIgnore``
+
+        Raises:
+            ``OSError``
+                The file could not be read.
+        """
+        with open(path, encoding="utf-8", errors="replace") as f:
+            return cls(base, f.readlines())
+
+    @property
+    def base(self) -> str:
+        """The directory the patterns are relative to.
+
+        Returns:
+            ``str``
+        """
+        return self._base[:-1]
+
+    def __bool__(self) -> bool:
+        return bool(self._rules)
+
+    def match(self, path: str, is_dir: bool) -> t.Optional[bool]:
+        """Check a path against the patterns.
+
+        Args:
+            path: ``str``
+                The absolute path to check.
+            is_dir: ``bool``
+                Whether or not the path is a directory.
+
+        Returns:
+            ``bool`` | ``None``
+                Whether or not the last matching pattern ignores the
+                path, or ``None`` if no patterns match it.
+        """
+        if not path.startswith(self._base):
+            return None
+
+        rel = path[len(self._base) :]
+        if os.sep != "/":
+            rel = rel.replace(os.sep, "/")
+
+        for pattern, negate, dir_only in reversed(self._rules):
+            if dir_only and not is_dir:
+                continue
+
+            if pattern.match(rel):
+                return not negate
+
+        return None
+
+
+def _load(path: str, base: str) -> t.Optional[GitIgnore]:
+    try:
+        ignore = GitIgnore.from_file(path, base)
+    except OSError:
+        return None
+
+    return ignore or None
+
+
+def load(directory: str) -> t.Optional[GitIgnore]:
+    """Load the ``.gitignore`` file in a directory.
+
+    Args:
+        directory: ``str``
+            The absolute path of the directory.
+
+    Returns:
+        ``len8.gitignore.GitIgnore`` | ``None``
+            The patterns, or ``None`` if the directory has no
+            ``.gitignore`` file, or it contains no patterns.
+    """
+    return _load(os.path.join(directory, ".gitignore"), directory)
+
+
+def load_rules(directory: t.Union[str, Path], inclusive: bool = True) -> Rules:
+    """Load the ``.gitignore`` files which apply to a directory, from
+    the root of its git repository downwards.
+
+    Args:
+        directory: ``str`` | ``pathlib.Path``
+            The directory to load the rules for.
+        inclusive: ``bool``
+            Whether or not to include the directory's own
+            ``.gitignore``. Defaults to ``True``.
+
+    Returns:
+        ``tuple[len8.gitignore.GitIgnore, ...]``
+    """
+    directory = os.path.abspath(directory)
+    chain = [directory]
+
+    while not os.path.exists(os.path.join(chain[-1], ".git")):
+        parent = os.path.dirname(chain[-1])
+
+        if parent == chain[-1]:
+            # Not in a repository, so only the directory's own file
+            # applies.
+            chain = [directory]
+            break
+
+        chain.append(parent)
+
+    rules = []
+    root = chain[-1]
+
+    if os.path.isdir(os.path.join(root, ".git")):
+        ignore = _load(os.path.join(root, ".git", "info", "exclude"), root)
+        if ignore is not None:
+            rules.append(ignore)
+
+    for d in reversed(chain):
+        if d == directory and not inclusive:
+            continue
+
+        ignore = load(d)
+        if ignore is not None:
+            rules.append(ignore)
+
+    return tuple(rules)
+
+
+def is_ignored(rules: Rules, path: str, is_dir: bool) -> bool:
+    """Check whether a path is ignored by a set of rules. The rules of
+    deeper directories take precedence.
+
+    Args:
+        rules: ``tuple[len8.gitignore.GitIgnore, ...]``
+            The rules to check against, from the outermost directory
+            inwards.
+        path: ``str``
+            The absolute path to check.
+        is_dir: ``bool``
+            Whether or not the path is a directory.
+
+    Returns:
+        ``bool``
+    """
+    for ignore in reversed(rules):
+        result = ignore.match(path, is_dir)
+
+        if result is not None:
+            return result
+
+    return False
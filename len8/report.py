@@ -0,0 +1,240 @@
+# Copyright (c) 2021-2022, Ethan Henderson, Jonxslays
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+__all__ = ["FileReport", "Violation", "format_report"]
+
+import sys
+import typing as t
+from array import array
+
+# The formats problems can be reported in. They're defined here, rather
+# than with their writers, so the CLI can offer them without importing
+# the writers.
+FORMATS = ("text", "json", "jsonl", "sarif", "github", "checkstyle")
+
+
+class Violation(t.NamedTuple):
+    """A line that was too long."""
+
+    path: str
+    """The resolved path of the file the line is in."""
+
+    line: int
+    """The line number, starting at 1."""
+
+    chars: int
+    """The number of characters in the line."""
+
+    limit: int
+    """The maximum length the line was allowed to be."""
+
+
+class FileReport:
+    """The lines that were too long in a single file.
+
+    Line numbers, lengths, and limits are stored in compact unsigned
+    integer columns, and the path is stored once per file rather than
+    once per problem. Iterating over a report yields
+    :obj:`Violation` objects.
+
+    Args:
+        path: ``str``
+            The resolved path of the file.
+
+    Keyword Args:
+        regions: ``list[tuple[int, int]]`` | ``None``
+            The inclusive ``(start, end)`` line ranges which were
+            classified as documentation by the ``"tokenize"`` engine.
+            Defaults to ``None``.
+        hashes: ``dict[int, str]`` | ``None``
+            The hashes of the content of lines which were too long,
+            mapped from their line numbers. Defaults to ``None``.
+    """
+
+    __slots__: t.Sequence[str] = (
+        "_path",
+        "_lines",
+        "_chars",
+        "_limits",
+        "_regions",
+        "_hashes",
+    )
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        regions: t.Optional[t.List[t.Tuple[int, int]]] = None,
+        hashes: t.Optional[t.Dict[int, str]] = None,
+    ) -> None:
+        self._path = sys.intern(path)
+        self._lines = array("I")
+        self._chars = array("I")
+        self._limits = array("I")
+        self._regions = regions
+        self._hashes = hashes
+
+    def __repr__(self) -> str:
+        return f"FileReport(path={self._path!r}, problems={len(self)})"
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def __iter__(self) -> t.Iterator[Violation]:
+        path = self._path
+
+        for line, chars, limit in zip(self._lines, self._chars, self._limits):
+            yield Violation(path, line, chars, limit)
+
+    @property
+    def path(self) -> str:
+        """The resolved path of the file.
+
+        Returns:
+            ``str``
+        """
+        return self._path
+
+    @property
+    def lines(self) -> "array[int]":
+        """The numbers of the lines that were too long.
+
+        Returns:
+            ``array.array[int]``
+        """
+        return self._lines
+
+    @property
+    def chars(self) -> "array[int]":
+        """The number of characters in each line.
+
+        Returns:
+            ``array.array[int]``
+        """
+        return self._chars
+
+    @property
+    def limits(self) -> "array[int]":
+        """The maximum length each line was allowed to be.
+
+        Returns:
+            ``array.array[int]``
+        """
+        return self._limits
+
+    @property
+    def regions(self) -> t.Optional[t.List[t.Tuple[int, int]]]:
+        """The inclusive ``(start, end)`` line ranges which were
+        classified as documentation, or ``None`` if the file was not
+        classified by the ``"tokenize"`` engine.
+
+        Returns:
+            ``list[tuple[int, int]]`` | ``None``
+        """
+        return self._regions
+
+    @property
+    def hashes(self) -> t.Optional[t.Dict[int, str]]:
+        """The hashes of the content of lines which were too long,
+        mapped from their line numbers, which baselines match problems
+        by. ``None`` if they were not recorded when the file was
+        scanned.
+
+        Returns:
+            ``dict[int, str]`` | ``None``
+        """
+        return self._hashes
+
+    def append(self, line: int, chars: int, limit: int) -> None:
+        """Add a line that was too long to this report.
+
+        Args:
+            line: ``int``
+                The line number, starting at 1.
+            chars: ``int``
+                The number of characters in the line.
+            limit: ``int``
+                The maximum length the line was allowed to be.
+        """
+        self._lines.append(line)
+        self._chars.append(chars)
+        self._limits.append(limit)
+
+    def filter(self, ranges: t.Iterable[t.Tuple[int, int]]) -> "FileReport":
+        """Create a new report containing only the lines within the
+        given ranges.
+
+        Args:
+            ranges: ``Iterable[tuple[int, int]]``
+                The inclusive ``(start, end)`` line ranges to keep.
+
+        Returns:
+            ``len8.FileReport``
+        """
+        ranges = list(ranges)
+        report = FileReport(self._path, hashes=self._hashes)
+
+        for line, chars, limit in zip(self._lines, self._chars, self._limits):
+            if any(s <= line <= e for s, e in ranges):
+                report.append(line, chars, limit)
+
+        return report
+
+
+def format_report(violations: t.Iterable[Violation]) -> t.Optional[str]:
+    """Format problems into the report shown by the CLI. Problems are
+    grouped by file, in the order each file was first seen.
+
+    Args:
+        violations: ``Iterable[len8.Violation]``
+            The problems to format.
+
+    Returns:
+        ``str`` | ``None``
+            The formatted report, or ``None`` if there were no problems.
+    """
+    files: t.Dict[str, t.List[str]] = {}
+    count = 0
+
+    for path, line, chars, limit in violations:
+        files.setdefault(path, []).append(
+            f"  * Line {line} ({chars}/{limit})\n"
+        )
+        count += 1
+
+    if not count:
+        return None
+
+    parts = []
+
+    for path, lines in files.items():
+        parts.append(f"\33[1m{path}\33[0m\n")
+        parts.extend(lines)
+
+    parts.append(f"\n\33[1m\33[31mFound {count:,} problem(s)\33[0m")
+    return "".join(parts)
@@ -0,0 +1,262 @@
+# Copyright (c) 2021-2022, Ethan Henderson, Jonxslays
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+__all__ = ["Stats"]
+
+import heapq
+import time
+import typing as t
+
+from len8.report import FileReport
+
+FileStartHook = t.Callable[[str], t.Any]
+FileDoneHook = t.Callable[[str, FileReport, float], t.Any]
+# The bytes and lines in a file, and the seconds spent reading and
+# scanning it. Files whose results came from the cache have no timing.
+FileTiming = t.Tuple[int, int, float, float]
+T = t.TypeVar("T")
+
+PHASES = ("walk", "filter", "read", "scan", "report")
+
+
+class Stats:
+    """Statistics recorded while checking files.
+
+    Pass an instance to :obj:`len8.Checker` to enable recording. When
+    checking with several processes, the read and scan times of each
+    process are added together.
+
+    Keyword Args:
+        slowest: ``int``
+            How many of the slowest files to keep. Defaults to ``10``.
+        on_file_start: ``Callable[[str], Any]`` | ``None``
+            Called with the path of each file before it is checked.
+            When checking with several processes, it is called for
+            every file before any are checked. Defaults to ``None``.
+        on_file_done: ``Callable[[str, FileReport, float], Any]``
+            Called with the path of each file, its report, and the
+            seconds spent reading and scanning it once it has been
+            checked. Defaults to ``None``.
+    """
+
+    __slots__: t.Sequence[str] = (
+        "_bytes_read",
+        "_cache_hits",
+        "_dirs_skipped",
+        "_dirs_visited",
+        "_files_skipped",
+        "_files_visited",
+        "_lines_scanned",
+        "_on_file_done",
+        "_on_file_start",
+        "_slowest",
+        "_slowest_files",
+        "_times",
+    )
+
+    def __init__(
+        self,
+        *,
+        slowest: int = 10,
+        on_file_start: t.Optional[FileStartHook] = None,
+        on_file_done: t.Optional[FileDoneHook] = None,
+    ) -> None:
+        if slowest < 0:
+            raise ValueError("'slowest' cannot be less than 0")
+
+        self._slowest = slowest
+        self._on_file_start = on_file_start
+        self._on_file_done = on_file_done
+        self.reset()
+
+    def __str__(self) -> str:
+        times = self._times
+        out = [
+            f"Checked {self._files_visited:,} file(s) "
+            f"({self._cache_hits:,} from cache)",
+            f"Skipped {self._files_skipped:,} file(s) and "
+            f"{self._dirs_skipped:,} dir(s), "
+            f"visited {self._dirs_visited:,} dir(s)",
+            f"Read {self._bytes_read:,} byte(s) and scanned "
+            f"{self._lines_scanned:,} line(s)",
+            f"Walk {times['walk']:.3f}s (filter {times['filter']:.3f}s), "
+            f"read {times['read']:.3f}s, scan {times['scan']:.3f}s, "
+            f"report {times['report']:.3f}s",
+        ]
+
+        if self._slowest_files:
+            out.append("Slowest files:")
+            out.extend(f"  {s:.4f}s {f}" for f, s in self.slowest)
+
+        return "\n".join(out)
+
+    @property
+    def files_visited(self) -> int:
+        """The number of files which were checked.
+
+        Returns:
+            ``int``
+        """
+        return self._files_visited
+
+    @property
+    def files_skipped(self) -> int:
+        """The number of Python files which were excluded or ignored.
+
+        Returns:
+            ``int``
+        """
+        return self._files_skipped
+
+    @property
+    def dirs_visited(self) -> int:
+        """The number of directories which were walked.
+
+        Returns:
+            ``int``
+        """
+        return self._dirs_visited
+
+    @property
+    def dirs_skipped(self) -> int:
+        """The number of directories which were excluded or ignored,
+        and so never walked.
+
+        Returns:
+            ``int``
+        """
+        return self._dirs_skipped
+
+    @property
+    def bytes_read(self) -> int:
+        """The number of bytes read from files.
+
+        Returns:
+            ``int``
+        """
+        return self._bytes_read
+
+    @property
+    def lines_scanned(self) -> int:
+        """The number of lines in the files which were read.
+
+        Returns:
+            ``int``
+        """
+        return self._lines_scanned
+
+    @property
+    def cache_hits(self) -> int:
+        """The number of files whose results came from the cache.
+
+        Returns:
+            ``int``
+        """
+        return self._cache_hits
+
+    @property
+    def times(self) -> t.Dict[str, float]:
+        """The seconds spent in each phase: walking directories
+        (``"walk"``), matching excludes while walking (``"filter"``),
+        reading files (``"read"``), scanning lines (``"scan"``), and
+        formatting reports (``"report"``).
+
+        Returns:
+            ``dict[str, float]``
+        """
+        return dict(self._times)
+
+    @property
+    def slowest(self) -> t.List[t.Tuple[str, float]]:
+        """The slowest files to read and scan, and the seconds they
+        took, slowest first.
+
+        Returns:
+            ``list[tuple[str, float]]``
+        """
+        return [(f, s) for s, f in sorted(self._slowest_files, reverse=True)]
+
+    def reset(self) -> None:
+        """Reset all statistics."""
+        self._bytes_read = 0
+        self._cache_hits = 0
+        self._dirs_skipped = 0
+        self._dirs_visited = 0
+        self._files_skipped = 0
+        self._files_visited = 0
+        self._lines_scanned = 0
+        self._slowest_files: t.List[t.Tuple[float, str]] = []
+        self._times = dict.fromkeys(PHASES, 0.0)
+
+    def _add_time(self, phase: str, seconds: float) -> None:
+        self._times[phase] += seconds
+
+    def _timed(self, it: t.Iterable[T], phase: str) -> t.Iterator[T]:
+        # Records the time spent producing each item.
+        it = iter(it)
+        times = self._times
+
+        while True:
+            start = time.perf_counter()
+
+            try:
+                item = next(it)
+            except StopIteration:
+                times[phase] += time.perf_counter() - start
+                return
+
+            times[phase] += time.perf_counter() - start
+            yield item
+
+    def _file_start(self, file: str) -> None:
+        if self._on_file_start is not None:
+            self._on_file_start(file)
+
+    def _file_done(
+        self, file: str, report: FileReport, timing: t.Optional[FileTiming]
+    ) -> None:
+        self._files_visited += 1
+        seconds = 0.0
+
+        if timing is None:
+            self._cache_hits += 1
+        else:
+            size, lines, read, scan = timing
+            seconds = read + scan
+            self._bytes_read += size
+            self._lines_scanned += lines
+            self._times["read"] += read
+            self._times["scan"] += scan
+
+            if len(self._slowest_files) < self._slowest:
+                heapq.heappush(self._slowest_files, (seconds, file))
+            elif self._slowest and seconds > self._slowest_files[0][0]:
+                heapq.heapreplace(self._slowest_files, (seconds, file))
+
+        if self._on_file_done is not None:
+            self._on_file_done(file, report, seconds)
@@ -0,0 +1,417 @@
+# Copyright (c) 2021-2022, Ethan Henderson, Jonxslays
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+__all__ = ["Watcher"]
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+import typing as t
+from pathlib import Path
+
+from len8.checker import Checker
+from len8.report import FileReport
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (
+    IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+)
+EVENT_HEADER = struct.Struct("iIII")
+# The path an event happened to, whether it's a directory, and whether
+# it was moved away or deleted.
+Event = t.Tuple[str, bool, bool]
+
+
+class _Inotify:
+    __slots__: t.Sequence[str] = ("_libc", "_fd", "_dirs")
+
+    def __init__(self) -> None:
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_CLOEXEC)
+        self._dirs: t.Dict[int, str] = {}
+
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+    @staticmethod
+    def available() -> bool:
+        if not sys.platform.startswith("linux"):
+            return False
+
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"))
+        except OSError:
+            return False
+
+        return hasattr(libc, "inotify_init1")
+
+    def add(self, directory: Path) -> None:
+        wd = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(directory), WATCH_MASK
+        )
+
+        if wd >= 0:
+            self._dirs[wd] = os.fspath(directory)
+
+    def remove(self, directory: str) -> None:
+        # Stop watching a directory which was moved away or deleted,
+        # and everything under it. Watches on moved directories would
+        # otherwise report changes under their old paths.
+        prefix = os.path.join(directory, "")
+
+        for wd, d in list(self._dirs.items()):
+            if d == directory or d.startswith(prefix):
+                # Watches on deleted directories are already gone.
+                self._libc.inotify_rm_watch(self._fd, wd)
+                del self._dirs[wd]
+
+    def read(self, timeout: t.Optional[float]) -> t.Optional[t.Set[Event]]:
+        # Returns None if the event queue overflowed, and changes might
+        # have been missed.
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        events: t.Set[Event] = set()
+
+        if not ready:
+            return events
+
+        data = os.read(self._fd, 1 << 16)
+        offset = 0
+
+        while offset < len(data):
+            wd, mask, _, size = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset : offset + size].rstrip(b"\0")
+            offset += size
+
+            if mask & IN_Q_OVERFLOW:
+                return None
+
+            if mask & IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+
+            directory = self._dirs.get(wd)
+            if directory is not None and name:
+                path = os.path.join(directory, os.fsdecode(name))
+                removed = bool(mask & (IN_MOVED_FROM | IN_DELETE))
+                events.add((path, bool(mask & IN_ISDIR), removed))
+
+        return events
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class Watcher:
+    """An object used to keep the results of a check up to date as
+    files change. After an initial check, only files which have been
+    created, modified, or deleted are rechecked.
+
+    Changes are detected using inotify on Linux, and by comparing
+    modification times and sizes between polls everywhere else.
+
+    Args:
+        checker: ``len8.Checker``
+            The checker to check files with. Its exclusions also apply
+            to changes.
+        *paths: ``pathlib.Path`` | ``str``
+            The path or paths to watch.
+
+    Keyword Args:
+        interval: ``float``
+            How often to look for changes when polling, in seconds.
+            Defaults to ``1.0``.
+        polling: ``bool``
+            Whether to always poll for changes, even if inotify is
+            available. Defaults to ``False``.
+    """
+
+    __slots__: t.Sequence[str] = (
+        "_checker",
+        "_paths",
+        "_interval",
+        "_inotify",
+        "_reports",
+        "_snapshot",
+    )
+
+    def __init__(
+        self,
+        checker: Checker,
+        *paths: t.Union[Path, str],
+        interval: float = 1.0,
+        polling: bool = False,
+    ) -> None:
+        self._checker = checker
+        self._paths = [Path(p) for p in paths]
+        self._interval = interval
+        self._reports: t.Dict[str, FileReport] = {}
+        self._snapshot: t.Dict[str, t.Tuple[int, int]] = {}
+        self._inotify: t.Optional[_Inotify] = None
+
+        if not polling and _Inotify.available():
+            self._inotify = _Inotify()
+
+    def __enter__(self) -> "Watcher":
+        self.start()
+        return self
+
+    def __exit__(self, *exc: t.Any) -> None:
+        self.close()
+
+    @property
+    def polling(self) -> bool:
+        """Whether changes are detected by polling.
+
+        Returns:
+            ``bool``
+        """
+        return self._inotify is None
+
+    @property
+    def reports(self) -> t.List[FileReport]:
+        """The current reports for each file that contains lines that
+        are too long.
+
+        Returns:
+            ``list[len8.FileReport]``
+        """
+        return [r for r in self._reports.values() if len(r)]
+
+    def _scan(self, roots: t.Iterable[Path]) -> t.Iterator[Path]:
+        for root in roots:
+            if root.is_dir():
+                dirs: t.List[Path] = []
+                yield from self._checker._walk(root, dirs)
+
+                if self._inotify is not None:
+                    for d in dirs:
+                        self._inotify.add(d)
+
+            elif self._checker._is_valid(root):
+                if self._inotify is not None:
+                    self._inotify.add(root.parent)
+
+                yield root
+
+    def _wanted(self, path: Path) -> bool:
+        if path.suffix not in (".py", ".pyw"):
+            return False
+
+        if self._checker._is_excluded(path):
+            return False
+
+        if self._checker._is_ignored(path):
+            return False
+
+        # Files passed directly only have their parent watched, so
+        # changes to their siblings are ignored.
+        path = path.absolute()
+
+        for root in self._paths:
+            if root.is_dir():
+                if root.absolute() in path.parents:
+                    return True
+
+            elif root.absolute() == path:
+                return True
+
+        return False
+
+    def _recheck(self, path: Path) -> None:
+        file = f"{path.resolve()}"
+
+        try:
+            stat = os.stat(file)
+        except OSError:
+            self._reports.pop(file, None)
+            self._snapshot.pop(file, None)
+            return
+
+        self._snapshot[file] = (stat.st_mtime_ns, stat.st_size)
+        report = self._checker._check(path)
+        self._reports[file] = self._checker._without_known(report)
+
+    def _forget(self, directory: Path) -> t.List[Path]:
+        # Drop everything under a directory which is gone, returning the
+        # files which were dropped.
+        prefix = os.path.join(f"{directory.resolve()}", "")
+        files = [
+            f
+            for f in {*self._reports, *self._snapshot}
+            if f.startswith(prefix)
+        ]
+
+        for f in files:
+            self._reports.pop(f, None)
+            self._snapshot.pop(f, None)
+
+        return [Path(f) for f in sorted(files)]
+
+    def _poll(self) -> t.List[Path]:
+        # Walk the whole tree again, but only stat each file rather
+        # than reading it.
+        snapshot: t.Dict[str, t.Tuple[int, int]] = {}
+
+        for p in self._scan(self._paths):
+            file = f"{p.resolve()}"
+
+            try:
+                stat = os.stat(file)
+            except OSError:
+                continue
+
+            snapshot[file] = (stat.st_mtime_ns, stat.st_size)
+
+        changed = {
+            f for f, s in snapshot.items() if self._snapshot.get(f) != s
+        }
+        changed.update(f for f in self._snapshot if f not in snapshot)
+        return [Path(f) for f in sorted(changed)]
+
+    def _wait(self, timeout: t.Optional[float]) -> t.List[Path]:
+        assert self._inotify is not None
+        events = self._inotify.read(timeout)
+
+        if events:
+            # Give the writer a moment to finish, so a save that touches
+            # several files is handled as one batch.
+            time.sleep(0.05)
+            more = self._inotify.read(0)
+            events = None if more is None else events | more
+
+        if events is None:
+            # Changes were missed, so recheck everything.
+            stale = list(self._reports)
+            self.start()
+            return [Path(f) for f in stale + list(self._reports)]
+
+        paths: t.Dict[Path, None] = {}
+
+        # Removals are handled first, so a directory replaced by another
+        # in the same batch is watched again.
+        for name, is_dir, removed in sorted(
+            events, key=lambda e: (not e[2], e)
+        ):
+            path = Path(name)
+
+            if not is_dir:
+                if self._wanted(path):
+                    paths[path] = None
+
+            elif removed or not path.is_dir():
+                self._inotify.remove(name)
+                paths.update(dict.fromkeys(self._forget(path)))
+
+            elif (
+                path.is_dir()
+                and not self._checker._is_excluded(path)
+                and not self._checker._is_ignored(path)
+            ):
+                # Watch new directories, and check any files which were
+                # created in them before the watch was added.
+                paths.update(dict.fromkeys(self._scan([path])))
+
+        return list(paths)
+
+    def start(self) -> None:
+        """Check every file, and start watching for changes."""
+        cache = self._checker.cache
+        if cache is not None:
+            cache.load()
+
+        self._reports = {}
+        self._snapshot = {}
+
+        for p in self._scan(self._paths):
+            self._recheck(p)
+
+    def poll(self, timeout: t.Optional[float] = None) -> t.List[str]:
+        """Wait for files to change, and recheck them.
+
+        Args:
+            timeout: ``float`` | ``None``
+                The maximum time to wait for changes, in seconds.
+                Passing ``None`` waits until something changes.
+
+        Returns:
+            ``list[str]``
+                The resolved paths of the files that were rechecked or
+                removed, which is empty if the timeout expired.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            remaining = None
+            if deadline is not None:
+                remaining = max(0.0, deadline - time.monotonic())
+
+            if self._inotify is None:
+                paths = self._poll()
+            else:
+                paths = self._wait(remaining)
+
+            if paths:
+                break
+
+            if remaining == 0.0:
+                return []
+
+            if self._inotify is None:
+                time.sleep(min(self._interval, remaining or self._interval))
+
+        for p in paths:
+            self._recheck(p)
+
+        return [f"{p.resolve()}" for p in paths]
+
+    def close(self) -> None:
+        """Stop watching for changes, and save the checker's cache if
+        it has one.
+        """
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+        cache = self._checker.cache
+        if cache is not None:
+            cache.save(self._paths)
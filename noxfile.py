@@ -35,12 +35,14 @@ import nox
 
 PROJECT_DIR = Path(__file__).parent
 TEST_DIR = PROJECT_DIR / "tests"
+BENCHMARK_DIR = PROJECT_DIR / "benchmarks"
 
 PROJECT_NAME = Path(__file__).parent.stem
 
 CHECK_PATHS = (
     str(PROJECT_DIR / PROJECT_NAME),
     str(TEST_DIR),
+    str(BENCHMARK_DIR),
     str(PROJECT_DIR / "noxfile.py"),
     str(PROJECT_DIR / "setup.py"),
 )
@@ -84,6 +86,14 @@ def tests(session: nox.Session) -> None:
     session.run("coverage", "report", "-m")
 
 
+@nox.session(reuse_venv=True)  # type: ignore
+def benchmarks(session: nox.Session) -> None:
+    # Pass options through to the runner, for example:
+    # nox -s benchmarks -- --files 5000 --output results.json
+    session.install(".")
+    session.run("python", "-m", "benchmarks", *session.posargs)
+
+
 @nox.session(reuse_venv=True)  # type: ignore
 def check_formatting(session: nox.Session) -> None:
     session.install(*fetch_installs("Formatting"))
@@ -120,6 +130,7 @@ def check_licensing(session: nox.Session) -> None:
     for p in [
         *(PROJECT_DIR / PROJECT_NAME).rglob("*.py"),
         *TEST_DIR.glob("*.py"),
+        *BENCHMARK_DIR.glob("*.py"),
         *PROJECT_DIR.glob("*.py"),
     ]:
         with open(p) as f:
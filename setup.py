@@ -109,5 +109,5 @@ setuptools.setup(
     entry_points={"console_scripts": ["len8 = len8.cli:len8"]},
     python_requires=">=3.6.0,<3.12",
     include_package_data=True,
-    packages=setuptools.find_packages(),
+    packages=setuptools.find_packages(exclude=("benchmarks", "benchmarks.*")),
 )
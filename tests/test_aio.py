@@ -0,0 +1,103 @@
+# Copyright (c) 2021-2022, Ethan Henderson, Jonxslays
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import asyncio
+import typing as t
+from pathlib import Path
+
+import pytest
+
+import len8
+from len8.errors import BadLines
+
+TEST_FILE = Path(__file__).parent / "testdata.py"
+T = t.TypeVar("T")
+
+
+def _run(coro: t.Awaitable[T]) -> T:
+    loop = asyncio.new_event_loop()
+
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+@pytest.fixture()  # type: ignore
+def project(tmp_path: Path) -> Path:
+    for i in range(20):
+        (tmp_path / f"mod{i:02}.py").write_text("y" * (80 + i) + "\n")
+
+    return tmp_path
+
+
+def test_async_matches_sync(project: Path) -> None:
+    checker = len8.Checker()
+    expected = checker.check(project)
+    reports = checker.reports
+
+    async def _check() -> t.Optional[str]:
+        return await len8.AsyncChecker(checker, max_open_files=3).check(
+            project
+        )
+
+    assert _run(_check()) == expected
+    assert [r.path for r in checker.reports] == [r.path for r in reports]
+
+
+def test_async_iter_check() -> None:
+    async def _collect() -> t.List[len8.Violation]:
+        return [v async for v in len8.AsyncChecker().iter_check(TEST_FILE)]
+
+    assert _run(_collect()) == list(len8.Checker().iter_check(TEST_FILE))
+
+
+def test_async_strict() -> None:
+    checker = len8.AsyncChecker(len8.Checker(strict=True))
+
+    with pytest.raises(BadLines):
+        _run(checker.check(TEST_FILE))
+
+    with pytest.raises(len8.InvalidPath):
+        _run(checker.check("invalid_dir"))
+
+
+def test_async_early_close(project: Path) -> None:
+    async def _first() -> len8.FileReport:
+        reports = len8.AsyncChecker(max_open_files=2).iter_reports(project)
+        report = await reports.__anext__()
+        await reports.aclose()  # type: ignore
+        return report
+
+    assert _run(_first()).path == f"{project.resolve() / 'mod00.py'}"
+
+
+def test_bad_async_init() -> None:
+    with pytest.raises(ValueError) as exc:
+        len8.AsyncChecker(max_open_files=0)
+    assert f"{exc.value}" == "'max_open_files' cannot be less than 1"
@@ -0,0 +1,157 @@
+# Copyright (c) 2021-2022, Ethan Henderson, Jonxslays
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import asyncio
+import gzip
+import typing as t
+from pathlib import Path
+
+import pytest
+
+import len8
+from len8 import baseline as baseline_module
+from len8 import checker as checker_module
+from len8 import errors
+from len8.watch import Watcher
+
+LONG_LINE = "x = " + "1" * 90 + "\n"
+OTHER_LINE = "y = " + "2" * 90 + "\n"
+
+
+@pytest.fixture()  # type: ignore
+def project(tmp_path: Path) -> Path:
+    (tmp_path / "a.py").write_text(LONG_LINE + "a = 1\n" + LONG_LINE)
+    (tmp_path / "b.py").write_text(OTHER_LINE)
+    return tmp_path
+
+
+def _baseline(project: Path) -> len8.Baseline:
+    baseline = len8.Baseline(project)
+    assert baseline.add(len8.Checker().iter_check(project)) == 3
+    return baseline
+
+
+def _lines(checker: len8.Checker, path: Path) -> t.List[t.Tuple[str, int]]:
+    return [(Path(v.path).name, v.line) for v in checker.iter_check(path)]
+
+
+def test_baseline_hides_known_problems(project: Path) -> None:
+    checker = len8.Checker(baseline=_baseline(project))
+    assert checker.check(project) is None
+
+    # Known lines stay known when they move, but new copies of them and
+    # new problems are reported.
+    (project / "a.py").write_text(
+        "a = 1\n" + LONG_LINE + LONG_LINE + OTHER_LINE + LONG_LINE
+    )
+    assert _lines(checker, project) == [("a.py", 4), ("a.py", 5)]
+
+
+def test_baseline_applies_everywhere(project: Path) -> None:
+    checker = len8.Checker(baseline=_baseline(project))
+    assert checker.check(project) is None
+    assert list(checker.recheck(project / "a.py")) == []
+
+    async def _check() -> t.Optional[str]:
+        return await len8.AsyncChecker(checker).check(project)
+
+    loop = asyncio.new_event_loop()
+    try:
+        assert loop.run_until_complete(_check()) is None
+    finally:
+        loop.close()
+
+    with Watcher(checker, project, polling=True) as watcher:
+        assert watcher.reports == []
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "options",
+    [{}, {"prefetch": 2}, {"workers": 2}, {"cache": True}, {"mapped": True}],
+)
+def test_baseline_uses_scanned_lines(
+    project: Path, monkeypatch: pytest.MonkeyPatch, options: t.Dict[str, t.Any]
+) -> None:
+    baseline = _baseline(project)
+
+    def fail(file: str) -> None:
+        raise AssertionError(f"'{file}' was read again")
+
+    monkeypatch.setattr(baseline_module, "_read_lines", fail)
+
+    if options.pop("mapped", False):
+        # Long lines are hashed in place, a chunk at a time.
+        monkeypatch.setattr(checker_module, "MMAP_THRESHOLD", 1)
+        monkeypatch.setattr(checker_module, "_CHUNK_SIZE", 8)
+
+    if options.pop("cache", False):
+        options["cache"] = len8.Cache(project / ".len8_cache")
+
+    checker = len8.Checker(baseline=baseline, **options)
+    assert checker.check(project) is None
+
+    # Cached reports keep the hashes they were scanned with.
+    assert checker.check(project) is None
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "name", ["baseline.json", "baseline.json.gz"]
+)
+def test_baseline_round_trip(project: Path, name: str) -> None:
+    file = project / name
+    baseline = _baseline(project)
+    baseline.save(file)
+
+    loaded = len8.Baseline.load(file)
+    assert loaded.root == project.resolve()
+    assert len(loaded) == 3
+    assert len8.Checker(baseline=loaded).check(project) is None
+
+    # Saving is deterministic, so unchanged baselines don't churn.
+    data = file.read_bytes()
+    assert data.startswith(b"\x1f\x8b") == name.endswith(".gz")
+    loaded.save(file)
+    assert file.read_bytes() == data
+
+    if not name.endswith(".gz"):
+        assert b'"a.py":[' in data
+
+
+def test_bad_baseline(tmp_path: Path) -> None:
+    file = tmp_path / "baseline.json"
+
+    with pytest.raises(errors.ConfigurationError):
+        len8.Baseline.load(file)
+
+    file.write_text('{"version": 1}')
+    with pytest.raises(errors.ConfigurationError):
+        len8.Baseline.load(file)
+
+    file.write_bytes(gzip.compress(b"not json"))
+    with pytest.raises(errors.ConfigurationError):
+        len8.Baseline.load(file)
@@ -0,0 +1,171 @@
+# Copyright (c) 2021-2022, Ethan Henderson, Jonxslays
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+import threading
+import typing as t
+from pathlib import Path
+
+import pytest
+
+import len8
+from len8 import checker as checker_module
+
+LONG_LINE = "x = " + "1" * 90 + "\n"
+
+
+@pytest.fixture()  # type: ignore
+def project(tmp_path: Path) -> Path:
+    (tmp_path / "a.py").write_text(LONG_LINE)
+    (tmp_path / "b.py").write_text("b = 1\n")
+    return tmp_path
+
+
+def _check(
+    path: Path, cache: len8.Cache, extend: int = 0, workers: int = 1
+) -> str:
+    checker = len8.Checker(cache=cache, extend=extend, workers=workers)
+    output = checker.check(path)
+    assert output is not None
+    return output
+
+
+def test_cache_round_trip(project: Path, tmp_path: Path) -> None:
+    cache = len8.Cache(tmp_path / ".len8_cache")
+    uncached = len8.Checker().check(project)
+
+    assert _check(project, cache) == uncached
+    assert cache.file.is_file()
+    assert (cache.directory / ".gitignore").is_file()
+
+    cache = len8.Cache(tmp_path / ".len8_cache")
+    cache.load()
+    assert len(cache) == 2
+    assert _check(project, cache) == uncached
+
+
+def test_cache_skips_unchanged_files(
+    project: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = len8.Cache(tmp_path / ".len8_cache")
+    expected = _check(project, cache)
+
+    def _fail(*args: object) -> None:
+        pytest.fail("unchanged file was rescanned")
+
+    monkeypatch.setattr(checker_module, "_scan_cached", _fail)
+    assert _check(project, cache) == expected
+
+    # Touching a file without changing it only needs a digest check.
+    st = os.stat(project / "a.py")
+    os.utime(project / "a.py", ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    monkeypatch.undo()
+    assert _check(project, cache) == expected
+
+
+def test_cache_invalidation(project: Path, tmp_path: Path) -> None:
+    cache = len8.Cache(tmp_path / ".len8_cache")
+    _check(project, cache)
+
+    assert "Line 1 (94/79)" in _check(project, cache)
+    assert "Line 1 (94/88)" in _check(project, cache, extend=1)
+
+    (project / "a.py").write_text("a = 1\n" + LONG_LINE)
+    assert "Line 2 (94/79)" in _check(project, cache)
+
+
+def test_cache_eviction_and_clearing(project: Path, tmp_path: Path) -> None:
+    cache = len8.Cache(tmp_path / ".len8_cache")
+    _check(project, cache)
+    assert len(cache) == 2
+
+    # Only entries under the checked paths are evicted.
+    (project / "b.py").unlink()
+    _check(project / "a.py", cache)
+    assert len(cache) == 2
+
+    _check(project, cache)
+    assert len(cache) == 1
+
+    cache.clear()
+    assert len(cache) == 0
+    assert not cache.directory.exists()
+
+
+def test_concurrent_saves(project: Path, tmp_path: Path) -> None:
+    directory = tmp_path / ".len8_cache"
+    errors: t.List[BaseException] = []
+
+    def run() -> None:
+        try:
+            _check(project, len8.Cache(directory))
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    names = sorted(p.name for p in directory.iterdir())
+    assert names == [".gitignore", "results.json"]
+    cache = len8.Cache(directory)
+    cache.load()
+    assert len(cache) == 2
+
+
+def test_failed_save_is_not_fatal(project: Path, tmp_path: Path) -> None:
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    cache = len8.Cache(blocker / ".len8_cache")
+    _check(project, cache)
+    assert len(cache) == 2
+
+
+def test_cache_version_mismatch(project: Path, tmp_path: Path) -> None:
+    cache = len8.Cache(tmp_path / ".len8_cache")
+    _check(project, cache)
+    cache.file.write_text('{"version": "0.0.0", "files": {}}')
+
+    cache.load()
+    assert len(cache) == 0
+
+    cache.file.write_text("not json")
+    cache.load()
+    assert len(cache) == 0
+
+
+def test_parallel_cache(project: Path, tmp_path: Path) -> None:
+    cache = len8.Cache(tmp_path / ".len8_cache")
+    expected = len8.Checker().check(project)
+
+    assert _check(project, cache, workers=2) == expected
+    assert _check(project, cache, workers=2) == expected
+    assert len(cache) == 2
@@ -26,11 +26,15 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import os
+import pickle  # nosec
+import typing as t
 from pathlib import Path
 
 import pytest
 
 import len8
+from len8 import checker as checker_module
 from len8.errors import BadLines, InvalidPath
 
 TEST_FILE = Path(__file__).parent / "testdata.py"
@@ -291,3 +295,383 @@ def test_checker_from_valid_config(valid_config: len8.Config) -> None:
         Path("venv"),
         Path("tests/exclude.py"),
     ]
+
+
+def test_walk_prunes_excluded_dirs(
+    default_checker: len8.Checker,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    (tmp_path / ".venv" / "lib").mkdir(parents=True)
+    (tmp_path / ".venv" / "lib" / "site.py").write_text("x" * 100 + "\n")
+    (tmp_path / "pkg" / "sub").mkdir(parents=True)
+    (tmp_path / "pkg" / "b.py").write_text("b = 1\n")
+    (tmp_path / "pkg" / "sub" / "a.py").write_text("a = 1\n")
+    (tmp_path / "pkg" / "notes.txt").write_text("x" * 100 + "\n")
+    (tmp_path / "top.py").write_text("x" * 100 + "\n")
+
+    scanned = []
+    scandir = os.scandir
+
+    def _scandir(path: t.Any) -> t.Any:
+        scanned.append(Path(path))
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", _scandir)
+    walked = list(default_checker._walk(tmp_path))
+
+    assert walked == [
+        tmp_path / "top.py",
+        tmp_path / "pkg" / "b.py",
+        tmp_path / "pkg" / "sub" / "a.py",
+    ]
+    assert tmp_path / ".venv" not in scanned
+    output = default_checker.check(tmp_path)
+    assert output is not None
+    assert str(tmp_path / ".venv") not in output
+
+
+def test_bad_workers() -> None:
+    with pytest.raises(ValueError) as exc:
+        len8.Checker(workers=-1)
+    assert f"{exc.value}" == "'workers' cannot be less than 0"
+
+
+def test_parallel_output_matches_serial(tmp_path: Path) -> None:
+    for i in range(20):
+        pkg = tmp_path / f"pkg{i % 3}"
+        pkg.mkdir(exist_ok=True)
+        (pkg / f"mod{i}.py").write_text(f"x = {i}\n" + "y" * (80 + i) + "\n")
+
+    serial = len8.Checker().check(tmp_path)
+    parallel = len8.Checker(workers=2).check(tmp_path)
+
+    assert serial is not None
+    assert parallel == serial
+    assert parallel.endswith("Found 20 problem(s)\33[0m")
+
+
+def test_bad_prefetch() -> None:
+    with pytest.raises(ValueError) as exc:
+        len8.Checker(prefetch=-1)
+    assert f"{exc.value}" == "'prefetch' cannot be less than 0"
+
+    with pytest.raises(ValueError) as exc:
+        len8.Checker(prefetch_bytes=0)
+    assert f"{exc.value}" == "'prefetch_bytes' cannot be less than 1"
+
+
+@pytest.mark.parametrize("prefetch_bytes", [1, 1024 * 1024])  # type: ignore
+def test_prefetch_output_matches_serial(
+    tmp_path: Path, prefetch_bytes: int
+) -> None:
+    for i in range(20):
+        pkg = tmp_path / f"pkg{i % 3}"
+        pkg.mkdir(exist_ok=True)
+        (pkg / f"mod{i}.py").write_text(f"x = {i}\n" + "y" * (80 + i) + "\n")
+
+    serial = len8.Checker().check(tmp_path)
+    checker = len8.Checker(prefetch=4, prefetch_bytes=prefetch_bytes)
+    assert checker.check(tmp_path) == serial
+
+    checker.cache = len8.MemoryCache()
+    checker.stats = len8.Stats()
+    assert checker.check(tmp_path) == serial
+    assert checker.check(tmp_path) == serial
+    assert checker.stats.cache_hits == 20
+
+    # Stopping early doesn't leave readers waiting on the budget.
+    reports = t.cast(
+        t.Generator[len8.Violation, None, None], checker.iter_check(tmp_path)
+    )
+    next(reports)
+    reports.close()
+
+
+def test_byte_scanning(default_checker: len8.Checker, tmp_path: Path) -> None:
+    p = tmp_path / "bytes.py"
+    p.write_bytes(
+        b"x = 1\r\n"
+        + ("s = '" + "é" * 70 + "'\r\n").encode()
+        + ("s = '" + "é" * 80 + "'\r\n").encode()
+        + b'def f():\r\n    """'
+        + b"d" * 70
+        + b'\r\n    """\r\n'
+        + b"y" * 80
+    )
+    output = (
+        f"\33[1m{p}\33[0m\n"
+        "  * Line 3 (86/79)\n"
+        "  * Line 5 (77/72)\n"
+        "  * Line 7 (80/79)\n\n"
+        f"\33[1m\33[31mFound 3 problem(s)\33[0m"
+    )
+    assert default_checker.check(p) == output
+
+
+@pytest.mark.parametrize("chunk_size", [3, 16, 1024])  # type: ignore
+def test_mapped_scanning(
+    default_checker: len8.Checker,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    chunk_size: int,
+) -> None:
+    expected = default_checker.check(TEST_FILE)
+    stats = len8.Stats()
+    default_checker.stats = stats
+
+    # Map every file, and split it across many chunks.
+    monkeypatch.setattr(checker_module, "MMAP_THRESHOLD", 1)
+    monkeypatch.setattr(checker_module, "_CHUNK_SIZE", chunk_size)
+    assert default_checker.check(TEST_FILE) == expected
+    assert stats.lines_scanned == TEST_FILE.read_bytes().count(b"\n")
+
+    p = tmp_path / "empty.py"
+    p.write_bytes(b"")
+    assert default_checker.check(p) is None
+
+
+@pytest.mark.parametrize("chunk_size", [3, 4, 7, 64])  # type: ignore
+def test_mapped_long_lines(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, chunk_size: int
+) -> None:
+    data = (
+        "# License\n"
+        f"x = '{'é' * 90}'  \t \n"
+        f'"""{"d" * 80}\r'
+        f"{'ü' * 75}{' ' * 40}\r\n"
+        f'{"q" * 100}"""\n'
+        "\n"
+        f"# {'c' * 100}"
+    ).encode("utf-8")
+    file = tmp_path / "long.py"
+    file.write_bytes(data)
+    expected = list(checker_module._scan_data(data, f"{file}", 79, 72))
+    assert len(expected) == 5
+
+    # Lines longer than a chunk are measured in place, a chunk at a
+    # time, with characters split across chunks.
+    monkeypatch.setattr(checker_module, "MMAP_THRESHOLD", 1)
+    monkeypatch.setattr(checker_module, "_CHUNK_SIZE", chunk_size)
+    assert list(checker_module._scan(f"{file}", 79, 72)) == expected
+
+
+def test_iter_check(default_checker: len8.Checker) -> None:
+    violations = default_checker.iter_check(TEST_FILE)
+
+    assert next(violations) == len8.Violation(f"{TEST_FILE}", 4, 76, 72)
+    assert list(violations) == [
+        len8.Violation(f"{TEST_FILE}", 5, 83, 79),
+        len8.Violation(f"{TEST_FILE}", 11, 78, 72),
+    ]
+    assert default_checker.bad_lines is None
+
+    default_checker.strict = True
+    assert len(list(default_checker.iter_check(TEST_FILE))) == 3
+
+
+def test_format_report() -> None:
+    assert len8.format_report([]) is None
+    assert len8.format_report(
+        [
+            len8.Violation("a.py", 1, 80, 79),
+            len8.Violation("b.py", 2, 80, 79),
+            len8.Violation("a.py", 3, 1_000, 72),
+        ]
+    ) == (
+        "\33[1ma.py\33[0m\n"
+        "  * Line 1 (80/79)\n"
+        "  * Line 3 (1000/72)\n"
+        "\33[1mb.py\33[0m\n"
+        "  * Line 2 (80/79)\n\n"
+        "\33[1m\33[31mFound 3 problem(s)\33[0m"
+    )
+
+
+def test_file_report(default_checker: len8.Checker) -> None:
+    default_checker.check(TEST_FILE)
+    (report,) = default_checker.reports
+
+    assert report.path == f"{TEST_FILE}"
+    assert len(report) == 3
+    assert list(report.lines) == [4, 5, 11]
+    assert list(report.chars) == [76, 83, 78]
+    assert list(report.limits) == [72, 79, 72]
+    assert list(report)[1] == len8.Violation(f"{TEST_FILE}", 5, 83, 79)
+    assert list(report.filter([(1, 4), (10, 20)]).lines) == [4, 11]
+    assert repr(report) == f"FileReport(path='{TEST_FILE}', problems=3)"
+
+    copy = pickle.loads(pickle.dumps(report))
+    assert list(copy) == list(report)
+
+
+def test_check_source(default_checker: len8.Checker) -> None:
+    source = TEST_FILE.read_text()
+    output = (
+        "\33[1m<string>\33[0m\n"
+        "  * Line 4 (76/72)\n"
+        "  * Line 5 (83/79)\n"
+        "  * Line 11 (78/72)\n\n"
+        f"\33[1m\33[31mFound 3 problem(s)\33[0m"
+    )
+    assert default_checker.check_source(source) == output
+    assert default_checker.check_source(source.encode()) == output
+    assert default_checker.check_source(memoryview(source.encode())) == output
+    assert default_checker.check_source("x = 1\n") is None
+
+    default_checker.strict = True
+    with pytest.raises(BadLines) as exc:
+        default_checker.check_source(bytearray(source.encode()))
+    assert f"{exc.value}" == output
+
+
+def test_check_sources(default_checker: len8.Checker) -> None:
+    output = default_checker.check_sources(
+        {"a.py": "x = 1\n", "b.py": "y" * 80, "c.py": b"# " + b"z" * 80}
+    )
+    assert output == (
+        "\33[1mb.py\33[0m\n"
+        "  * Line 1 (80/79)\n\n"
+        f"\33[1m\33[31mFound 1 problem(s)\33[0m"
+    )
+    assert [r.path for r in default_checker.reports] == ["b.py"]
+
+
+def test_recheck(default_checker: len8.Checker, tmp_path: Path) -> None:
+    file = tmp_path / "edited.py"
+    lines = ["x = 1\n"] * 10 + ["y = " + "2" * 80 + "\n"]
+    file.write_text("".join(lines))
+
+    report = default_checker.recheck(file)
+    assert [(v.line, v.limit) for v in report] == [(11, 79)]
+
+    # Opening a docstring changes how every later line is classified.
+    lines[2] = '"""' + "d" * 76 + "\n"
+    file.write_text("".join(lines))
+    report = default_checker.recheck(file, [(3, 3)])
+    assert [(v.line, v.limit) for v in report] == [(3, 72), (11, 72)]
+
+    # Inserting lines moves the problems after them.
+    lines[5:5] = ["z = 3\n", '"""\n']
+    file.write_text("".join(lines))
+    report = default_checker.recheck(file, [(6, 7)])
+    assert [(v.line, v.limit) for v in report] == [(3, 72), (13, 79)]
+
+    # Deleting lines is marked by the line after them.
+    del lines[0:2]
+    file.write_text("".join(lines))
+    report = default_checker.recheck(file, [(1, 1)])
+    assert [(v.line, v.limit) for v in report] == [(1, 72), (11, 79)]
+    assert default_checker.reports == [report]
+
+    expected = checker_module._scan_data(
+        file.read_bytes(), report.path, 79, 72
+    )
+    assert list(report) == list(expected)
+    assert list(default_checker.recheck(file, [])) == list(expected)
+
+
+@pytest.mark.parametrize("mapped", [False, True])  # type: ignore
+def test_tokenize_lone_carriage_returns(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, mapped: bool
+) -> None:
+    file = tmp_path / "cr.py"
+    file.write_bytes(b'x = "a\rb"\r\ny = ' + b"1" * 81 + b'\n"""Docs."""\n')
+    expected = len8.Checker().check(file)
+    assert expected is not None and "Line 3 (85/79)" in expected
+
+    if mapped:
+        monkeypatch.setattr(checker_module, "MMAP_THRESHOLD", 1)
+        monkeypatch.setattr(checker_module, "_CHUNK_SIZE", 5)
+
+    assert len8.Checker(engine="tokenize").check(file) == expected
+
+
+@pytest.mark.parametrize("engine", checker_module.ENGINES)  # type: ignore
+@pytest.mark.parametrize("chunk_size", [None, 16])  # type: ignore
+def test_suppression_markers(
+    engine: str,
+    chunk_size: t.Optional[int],
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    if chunk_size is not None:
+        # Map the file, so long lines are left in the mapping.
+        monkeypatch.setattr(checker_module, "MMAP_THRESHOLD", 1)
+        monkeypatch.setattr(checker_module, "_CHUNK_SIZE", chunk_size)
+
+    long = "x = " + "1" * 80
+    file = tmp_path / "marked.py"
+    file.write_text(
+        "\n".join(
+            [
+                f"{long}  # len8: ignore",
+                long,
+                "# len8: off",
+                long,
+                long,
+                "#len8:on",
+                long,
+                f"{long}  # len8: ignored",
+                "# len8: off",
+                long,
+            ]
+        )
+        + "\n"
+    )
+
+    checker = len8.Checker(engine=engine)
+    assert [v.line for v in checker.iter_check(file)] == [2, 7, 8]
+
+    # Rechecks suppress lines too, even when only a marker changed.
+    assert [v.line for v in checker.recheck(file)] == [2, 7, 8]
+    lines = file.read_text().splitlines(True)
+    lines[5] = "x = 1\n"
+    file.write_text("".join(lines))
+    assert [v.line for v in checker.recheck(file, [(6, 6)])] == [2]
+
+
+def test_config_resolver(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    (tmp_path / "pyproject.toml").write_text("[tool.len8]\ndocs-length = 40\n")
+    sub = tmp_path / "a" / "sub"
+    sub.mkdir(parents=True)
+    (tmp_path / "a" / "pyproject.toml").write_text(
+        "[tool.len8]\ncode-length = 100\n"
+    )
+    (sub / "pyproject.toml").write_text("[build-system]\n")
+    (tmp_path / "b").mkdir()
+
+    parsed: t.List[str] = []
+    load_toml = checker_module._load_toml
+
+    def _load_toml(text: str) -> t.Dict[str, t.Any]:
+        parsed.append(text)
+        return load_toml(text)
+
+    monkeypatch.setattr(checker_module, "_load_toml", _load_toml)
+    resolver = len8.ConfigResolver()
+
+    config = resolver.resolve(sub)
+    assert config is not None and config.code_length == 100
+    assert resolver.resolve(tmp_path / "a") is config
+    config = resolver.resolve(tmp_path / "b")
+    assert config is not None and config.docs_length == 40
+    assert resolver.resolve(tmp_path) is config
+    assert len(parsed) == 3
+
+    line = "x = " + "1" * 90 + "\n# " + "c" * 50 + "\n"
+    (sub / "m.py").write_text(line)
+    (tmp_path / "b" / "m.py").write_text(line)
+    for workers in (1, 2):
+        checker = len8.Checker(resolver=resolver, workers=workers)
+        checker.check(tmp_path)
+        assert [(r.path, list(r.limits)) for r in checker.reports] == [
+            (f"{(tmp_path / 'b' / 'm.py').resolve()}", [79, 40]),
+        ]
+
+    checker.set_lengths(code=120)
+    checker.check(tmp_path)
+    assert [list(r.limits) for r in checker.reports] == [[40]]
+    assert len(parsed) == 3
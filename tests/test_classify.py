@@ -0,0 +1,155 @@
+# Copyright (c) 2021-2022, Ethan Henderson, Jonxslays
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import io
+import typing as t
+from pathlib import Path
+
+import pytest
+
+import len8
+from len8 import classify
+from len8.classify import find_docs
+
+SOURCE = (
+    "# License header.\n"
+    '"""Module docstring."""\n'
+    "import os\n"
+    'x = """not\n'
+    'docs"""\n'
+    "def f():\n"
+    "    '''Single\n"
+    "    quoted.'''\n"
+    "    y = 1  # Trailing comment.\n"
+    "    # Own line.\n"
+    '    rb"""Raw\n'
+    '    """\n'
+    '    s = "has \\"\\"\\" inside"\n'
+    '    u"implicit" "concatenation"\n'
+    '    "statement"; z = 2\n'
+)
+
+
+def _find(source: str) -> t.Optional[t.List[t.Tuple[int, int]]]:
+    return find_docs(io.BytesIO(source.encode()).readline)
+
+
+def test_find_docs() -> None:
+    assert _find(SOURCE) == [
+        (1, 1),
+        (2, 2),
+        (7, 8),
+        (10, 10),
+        (11, 12),
+        (14, 14),
+        (15, 15),
+    ]
+
+
+def test_find_docs_bad_source() -> None:
+    assert _find('x = """unterminated\n') is None
+    assert _find("def f():\n  x = 1\n y = 2\n") is None
+
+
+def test_tokenize_engine(tmp_path: Path) -> None:
+    p = tmp_path / "engine.py"
+    p.write_text(
+        "def f():\n"
+        "    '''" + "d" * 70 + "\n"
+        "    '''\n"
+        '    x = """' + "c" * 70 + '"""\n'
+    )
+
+    fast = len8.Checker()
+    fast.check(p)
+    assert [(v.line, v.limit) for v in fast.reports[0]] == [(4, 79)]
+
+    accurate = len8.Checker(engine="tokenize")
+    accurate.check(p)
+    assert [(v.line, v.limit) for v in accurate.reports[0]] == [
+        (2, 72),
+        (4, 79),
+    ]
+    assert accurate.reports[0].regions == [(2, 3)]
+
+
+def test_bad_engine() -> None:
+    with pytest.raises(ValueError) as exc:
+        len8.Checker(engine="regex")
+    assert f"{exc.value}" == "'engine' should be 'fast' or 'tokenize'"
+
+
+def test_bad_engine_config(tmp_path: Path) -> None:
+    p = tmp_path / "pyproject.toml"
+    p.write_text('[tool.len8]\nengine = "regex"\n')
+
+    with pytest.raises(len8.ConfigurationError) as exc:
+        len8.Config(p)
+    assert f"{exc.value}" == (
+        f"'engine' in '{p}' should be 'fast' or 'tokenize'"
+    )
+
+
+def test_tokenize_engine_skips_clean_files(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def fail(readline: t.Callable[[], bytes]) -> None:
+        raise AssertionError("clean files should not be tokenized")
+
+    monkeypatch.setattr(classify, "find_docs", fail)
+    p = tmp_path / "clean.py"
+    p.write_text("x = 1\n")
+    assert len8.Checker(engine="tokenize").check(p) is None
+
+
+def test_tokenize_engine_falls_back(tmp_path: Path) -> None:
+    p = tmp_path / "broken.py"
+    p.write_text('x = """' + "d" * 80 + "\n")
+    checker = len8.Checker(engine="tokenize")
+    assert checker.check(p) == len8.Checker().check(p)
+
+
+def test_tokenize_engine_caches_regions(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    p = tmp_path / "cached.py"
+    p.write_text(SOURCE + "x = " + "1" * 90 + "\n")
+    cache = len8.MemoryCache()
+    checker = len8.Checker(cache=cache, engine="tokenize")
+    expected = checker.check(p)
+    assert cache.get_regions(f"{p.resolve()}") is not None
+
+    # Regions are reused when only the line lengths change.
+    def fail(readline: t.Callable[[], bytes]) -> None:
+        raise AssertionError("regions should come from the cache")
+
+    monkeypatch.setattr(classify, "find_docs", fail)
+    checker.set_lengths(code=100)
+    assert checker.check(p) is None
+    checker.set_lengths(code=None)
+    assert checker.check(p) == expected
@@ -0,0 +1,106 @@
+# Copyright (c) 2021-2022, Ethan Henderson, Jonxslays
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import socket
+import threading
+import time
+import typing as t
+from pathlib import Path
+
+import pytest
+
+import len8
+from len8 import daemon
+
+TEST_FILE = Path(__file__).parent / "testdata.py"
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="requires Unix domain sockets"
+)
+
+
+@pytest.fixture()  # type: ignore
+def socket_path(tmp_path: Path) -> t.Iterator[Path]:
+    path = tmp_path / "d.sock"
+    thread = threading.Thread(
+        target=daemon.serve, args=(len8.Checker(), path), daemon=True
+    )
+    thread.start()
+
+    for _ in range(100):
+        if path.exists():
+            break
+        time.sleep(0.01)
+
+    yield path
+
+    if path.exists():
+        daemon.stop(path)
+    thread.join(5)
+
+
+def test_daemon_check(socket_path: Path, tmp_path: Path) -> None:
+    expected = len8.Checker().check(TEST_FILE)
+
+    assert daemon.send(TEST_FILE, socket_path=socket_path) == (1, expected)
+    assert daemon.send(TEST_FILE, socket_path=socket_path) == (1, expected)
+
+    clean = tmp_path / "clean.py"
+    clean.write_text("x = 1\n")
+    assert daemon.send(clean, socket_path=socket_path) == (0, None)
+
+    status, output = daemon.send(tmp_path / "missing", socket_path=socket_path)
+    assert status == 1
+    assert output is not None and "is not a valid path" in output
+
+
+def test_daemon_stop(socket_path: Path) -> None:
+    daemon.stop(socket_path)
+
+    for _ in range(100):
+        if not socket_path.exists():
+            break
+        time.sleep(0.01)
+
+    with pytest.raises(len8.DaemonError):
+        daemon.send(TEST_FILE, socket_path=socket_path)
+
+
+def test_daemon_already_running(socket_path: Path) -> None:
+    with pytest.raises(len8.DaemonError):
+        daemon.serve(len8.Checker(), socket_path)
+
+
+def test_daemon_client(
+    socket_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    assert daemon.main([f"{TEST_FILE}", "--socket", f"{socket_path}"]) == 1
+    assert "Found 3 problem(s)" in capsys.readouterr().out
+
+    assert daemon.main(["--socket", f"{socket_path}.missing"]) == 2
+    assert "Could not connect" in capsys.readouterr().err
@@ -0,0 +1,68 @@
+# Copyright (c) 2021-2022, Ethan Henderson, Jonxslays
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from pathlib import Path
+
+from len8.exclude import ExcludeMatcher
+
+
+def test_relative_literals() -> None:
+    matcher = ExcludeMatcher([Path("build"), "pkg/generated"])
+    assert matcher.match(Path("build"))
+    assert matcher.match(Path("src/build/module.py"))
+    assert matcher.match(Path("pkg/generated/module.py"))
+    assert matcher.match(Path("/root/pkg/generated"))
+    assert not matcher.match(Path("pkg/module.py"))
+    assert not matcher.match(Path("generated/pkg/module.py"))
+    assert not matcher.match(Path("builder/module.py"))
+
+
+def test_absolute_literals() -> None:
+    root = Path("tests").absolute()
+    matcher = ExcludeMatcher([root])
+    assert matcher.match(root)
+    assert matcher.match(root / "test_exclude.py")
+    assert matcher.match(Path("tests/test_exclude.py"))
+    assert not matcher.match(Path("len8/checker.py"))
+
+
+def test_globs() -> None:
+    matcher = ExcludeMatcher(["**/migrations/*.py", "*_pb2.py", "v[0-9]"])
+    assert matcher.match(Path("app/migrations/0001_initial.py"))
+    assert matcher.match(Path("a/b/migrations/0002.py"))
+    assert matcher.match(Path("migrations/0003.py"))
+    assert matcher.match(Path("proto/service_pb2.py"))
+    assert matcher.match(Path("api/v1/routes.py"))
+    assert not matcher.match(Path("app/migrations/data/0001.txt.py"))
+    assert not matcher.match(Path("app/migrations.py"))
+    assert not matcher.match(Path("api/v10/routes.py"))
+
+
+def test_empty() -> None:
+    matcher = ExcludeMatcher([])
+    assert not matcher.match(Path("anything.py"))
@@ -0,0 +1,150 @@
+# Copyright (c) 2021-2022, Ethan Henderson, Jonxslays
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+import stat
+from pathlib import Path
+
+import pytest
+
+import len8
+from len8.fix import fix_source
+
+LONG = "word " * 20
+
+
+def test_fix_comments() -> None:
+    source = (
+        f"# {LONG}\n"
+        "x = 1\n"
+        "if x:\n"
+        f"    # {LONG}\n"
+        "    # and the rest.\n"
+        "    #\n"
+        "    # Next paragraph.\n"
+        f"    # - {LONG}\n"
+        f"    y = 2  # {LONG}\n"
+        f"    # type: ignore {LONG}\n"
+    )
+    assert fix_source(source, docs_length=40) == (
+        f"# {LONG}\n"
+        "x = 1\n"
+        "if x:\n"
+        "    # word word word word word word word\n"
+        "    # word word word word word word word\n"
+        "    # word word word word word word and\n"
+        "    # the rest.\n"
+        "    #\n"
+        "    # Next paragraph.\n"
+        "    # - word word word word word word\n"
+        "    #   word word word word word word\n"
+        "    #   word word word word word word\n"
+        "    #   word word\n"
+        f"    y = 2  # {LONG}\n"
+        f"    # type: ignore {LONG}\n"
+    )
+
+
+def test_fix_docstrings() -> None:
+    source = (
+        "def f():\n"
+        f'    """{LONG}\n'
+        "    more.\n"
+        "\n"
+        "    >>> f()\n"
+        f"    {LONG}\n"
+        "\n"
+        f'    {LONG}end."""\n'
+        "\n"
+        "\n"
+        "def g():\n"
+        f'    """{LONG.strip()}."""\n'
+        f"    return '{LONG}'\n"
+    )
+    assert fix_source(source, docs_length=40) == (
+        "def f():\n"
+        '    """word word word word word word\n'
+        "    word word word word word word word\n"
+        "    word word word word word word word\n"
+        "    more.\n"
+        "\n"
+        "    >>> f()\n"
+        f"    {LONG}\n"
+        "\n"
+        "    word word word word word word word\n"
+        "    word word word word word word word\n"
+        "    word word word word word word\n"
+        '    end."""\n'
+        "\n"
+        "\n"
+        "def g():\n"
+        '    """word word word word word word\n'
+        "    word word word word word word word\n"
+        "    word word word word word word\n"
+        '    word."""\n'
+        f"    return '{LONG}'\n"
+    )
+
+
+def test_fix_leaves_other_lines() -> None:
+    source = f"# {LONG}\n\nx = '''{LONG}'''\n"
+    assert fix_source(source, docs_length=40) == source
+
+    # Line endings are kept.
+    source = f'"""{LONG}"""\r\n'
+    fixed = fix_source(source, docs_length=60)
+    assert fixed.count("\r\n") == 2
+    assert fix_source(fixed, docs_length=60) == fixed
+
+
+@pytest.mark.parametrize("workers", [1, 2])  # type: ignore
+def test_checker_fix(tmp_path: Path, workers: int) -> None:
+    source = f'x = 1\n# {LONG}\ndef f():\n    """{LONG}"""\n'
+    for i in range(3):
+        (tmp_path / f"bad{i}.py").write_text(source)
+    (tmp_path / "good.py").write_text("x = 1\n")
+    os.chmod(tmp_path / "bad0.py", 0o755)
+    # Windows ignores most mode bits, so only compare them.
+    mode = stat.S_IMODE(os.stat(tmp_path / "bad0.py").st_mode)
+
+    checker = len8.Checker(cache=len8.MemoryCache(), workers=workers)
+    assert checker.check(tmp_path) is not None
+
+    fixed = checker.fix(tmp_path)
+    assert sorted(fixed) == [
+        f"{(tmp_path / f'bad{i}.py').resolve()}" for i in range(3)
+    ]
+    assert checker.check(tmp_path) is None
+    assert checker.fix(tmp_path) == []
+    assert stat.S_IMODE(os.stat(tmp_path / "bad0.py").st_mode) == mode
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "bad0.py",
+        "bad1.py",
+        "bad2.py",
+        "good.py",
+    ]
@@ -0,0 +1,145 @@
+# Copyright (c) 2021-2022, Ethan Henderson, Jonxslays
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import io
+import json
+import os
+import typing as t
+from pathlib import Path
+from xml.etree import ElementTree
+
+import pytest
+
+from len8 import errors, formats
+from len8.report import Violation, format_report
+
+CWD = os.getcwd()
+VIOLATIONS = [
+    Violation(os.path.join(CWD, "a.py"), 4, 76, 72),
+    Violation(os.path.join(CWD, "a.py"), 5, 83, 79),
+    Violation(os.path.join(CWD, "b,c.py"), 1, 80, 79),
+]
+
+
+def write(format: str, violations: t.List[Violation]) -> str:
+    stream = io.StringIO()
+    assert formats.write_report(violations, format, stream) == len(violations)
+    return stream.getvalue()
+
+
+def test_unsupported_format() -> None:
+    with pytest.raises(ValueError) as exc:
+        formats.get_writer("yaml", io.StringIO())
+    assert f"{exc.value}" == "unsupported format 'yaml'"
+
+
+def test_text() -> None:
+    assert write("text", VIOLATIONS) == f"{format_report(VIOLATIONS)}\n"
+    assert write("text", []) == ""
+
+
+@pytest.mark.parametrize("violations", [VIOLATIONS, []])  # type: ignore
+def test_json(violations: t.List[Violation]) -> None:
+    data = json.loads(write("json", violations))
+    assert [Violation(**v) for v in data] == violations
+
+
+def test_jsonl() -> None:
+    lines = write("jsonl", VIOLATIONS).splitlines()
+    assert [Violation(**json.loads(v)) for v in lines] == VIOLATIONS
+    assert write("jsonl", []) == ""
+
+
+@pytest.mark.parametrize("violations", [VIOLATIONS, []])  # type: ignore
+def test_sarif(violations: t.List[Violation]) -> None:
+    log = json.loads(write("sarif", violations))
+    assert log["version"] == "2.1.0"
+    (run,) = log["runs"]
+    assert run["tool"]["driver"]["name"] == "len8"
+    assert [
+        (
+            r["locations"][0]["physicalLocation"]["artifactLocation"]["uri"],
+            r["locations"][0]["physicalLocation"]["region"]["startLine"],
+            r["message"]["text"],
+        )
+        for r in run["results"]
+    ] == [
+        (
+            os.path.basename(v.path),
+            v.line,
+            f"Line too long ({v.chars}/{v.limit})",
+        )
+        for v in violations
+    ]
+
+
+def test_github() -> None:
+    assert write("github", VIOLATIONS).splitlines() == [
+        "::error file=a.py,line=4,col=73,title=len8::Line too long (76/72)",
+        "::error file=a.py,line=5,col=80,title=len8::Line too long (83/79)",
+        "::error file=b%2Cc.py,line=1,col=80,title=len8::"
+        "Line too long (80/79)",
+    ]
+
+
+def test_checkstyle() -> None:
+    root = ElementTree.fromstring(write("checkstyle", VIOLATIONS))
+    assert [(f.get("name"), [e.get("line") for e in f]) for f in root] == [
+        (VIOLATIONS[0].path, ["4", "5"]),
+        (VIOLATIONS[2].path, ["1"]),
+    ]
+
+    root = ElementTree.fromstring(write("checkstyle", []))
+    assert list(root) == []
+
+
+def test_streaming() -> None:
+    stream = io.StringIO()
+    writer = formats.get_writer("jsonl", stream)
+    writer.start()
+    writer.write(VIOLATIONS[0])
+    assert stream.getvalue().count("\n") == 1
+    assert writer.count == 1
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "format", ["json", "sarif", "checkstyle"]
+)
+def test_closed_on_error(format: str) -> None:
+    def violations() -> t.Iterator[Violation]:
+        yield VIOLATIONS[0]
+        raise errors.InvalidPath(Path("nope.py"))
+
+    stream = io.StringIO()
+    with pytest.raises(errors.InvalidPath):
+        formats.write_report(violations(), format, stream)
+
+    if format == "checkstyle":
+        ElementTree.fromstring(stream.getvalue())
+    else:
+        json.loads(stream.getvalue())
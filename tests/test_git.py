@@ -0,0 +1,121 @@
+# Copyright (c) 2021-2022, Ethan Henderson, Jonxslays
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+import shutil
+import subprocess  # nosec
+from pathlib import Path
+
+import pytest
+
+import len8
+from len8 import git
+
+LONG_LINE = "x = " + "1" * 90 + "\n"
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("git") is None, reason="git is not installed"
+)
+
+
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(  # nosec
+        ["git", "-c", "user.name=len8", "-c", "user.email=len8@len8", *args],
+        cwd=repo,
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+@pytest.fixture()  # type: ignore
+def repo(tmp_path: Path) -> Path:
+    tmp_path = tmp_path.resolve()
+    _git(tmp_path, "init", "-q")
+    (tmp_path / "old.py").write_text(LONG_LINE)
+    (tmp_path / "same.py").write_text(LONG_LINE)
+    (tmp_path / "gone.py").write_text("")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-qm", "initial")
+
+    (tmp_path / "old.py").write_text(LONG_LINE + "y = 1\n" + LONG_LINE)
+    (tmp_path / "new.py").write_text(LONG_LINE)
+    (tmp_path / "notes.txt").write_text(LONG_LINE)
+    (tmp_path / "gone.py").unlink()
+    _git(tmp_path, "add", "new.py", "notes.txt")
+    return tmp_path
+
+
+def test_changed_files(repo: Path) -> None:
+    assert git.changed_files(cwd=repo) == [repo / "old.py"]
+    assert git.changed_files(staged=True, cwd=repo) == [repo / "new.py"]
+    assert sorted(git.changed_files("HEAD", cwd=repo)) == [
+        repo / "new.py",
+        repo / "old.py",
+    ]
+
+
+def test_changed_lines(repo: Path) -> None:
+    assert git.changed_lines("HEAD", cwd=repo) == {
+        repo / "new.py": [(1, 1)],
+        repo / "old.py": [(2, 3)],
+    }
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "name", ["my file.py", 'quo"te.py', "tab\tbed.py", "naïve é.py"]
+)
+def test_changed_lines_special_names(repo: Path, name: str) -> None:
+    if os.name == "nt" and ('"' in name or "\t" in name):
+        pytest.skip("names can't contain quotes or tabs on Windows")
+
+    (repo / name).write_text(LONG_LINE)
+    _git(repo, "add", name)
+    assert git.changed_lines(staged=True, cwd=repo) == {
+        repo / "new.py": [(1, 1)],
+        repo / name: [(1, 1)],
+    }
+
+
+def test_check_changed_lines(repo: Path) -> None:
+    ranges = git.changed_lines("HEAD", cwd=repo)
+    output = (
+        f"\33[1m{repo / 'new.py'}\33[0m\n"
+        "  * Line 1 (94/79)\n"
+        f"\33[1m{repo / 'old.py'}\33[0m\n"
+        "  * Line 3 (94/79)\n\n"
+        f"\33[1m\33[31mFound 2 problem(s)\33[0m"
+    )
+    assert len8.Checker().check(*ranges, lines=ranges) == output
+
+
+def test_git_errors(tmp_path: Path) -> None:
+    with pytest.raises(len8.GitError):
+        git.changed_files(cwd=tmp_path)
+
+    with pytest.raises(len8.GitError):
+        git.changed_files("not-a-ref", cwd=Path(__file__).parent)
@@ -0,0 +1,105 @@
+# Copyright (c) 2021-2022, Ethan Henderson, Jonxslays
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+import typing as t
+from pathlib import Path
+
+import len8
+from len8.gitignore import GitIgnore, is_ignored, load_rules
+
+LONG_LINE = "x = " + "1" * 90 + "\n"
+
+
+def test_patterns() -> None:
+    ignore = GitIgnore(
+        os.path.abspath("repo"),
+        [
+            "# comment\n",
+            "\n",
+            "build/\n",
+            "*_pb2.py\n",
+            "/top.py\n",
+            "docs/**/*.py\n",
+            "!keep_pb2.py\n",
+        ],
+    )
+
+    def match(path: str, is_dir: bool = False) -> t.Optional[bool]:
+        return ignore.match(os.path.abspath(path), is_dir)
+
+    assert match("repo/build", True)
+    assert match("repo/src/build", True)
+    assert match("repo/build") is None
+    assert match("repo/src/service_pb2.py")
+    assert match("repo/src/keep_pb2.py") is False
+    assert match("repo/top.py")
+    assert match("repo/src/top.py") is None
+    assert match("repo/docs/a/b/conf.py")
+    assert match("repo/src/module.py") is None
+    assert match("other/service_pb2.py") is None
+
+
+def test_deeper_rules_take_precedence() -> None:
+    outer = GitIgnore(os.path.abspath("repo"), ["*.py\n"])
+    inner = GitIgnore(os.path.abspath("repo/src"), ["!*.py\n"])
+    path = os.path.abspath("repo/src/module.py")
+    assert is_ignored((outer,), path, False)
+    assert not is_ignored((outer, inner), path, False)
+
+
+def test_load_rules(tmp_path: Path) -> None:
+    (tmp_path / ".git" / "info").mkdir(parents=True)
+    (tmp_path / ".git" / "info" / "exclude").write_text("local.py\n")
+    (tmp_path / ".gitignore").write_text("build/\n")
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / ".gitignore").write_text("*_pb2.py\n")
+
+    assert [r.base for r in load_rules(tmp_path / "src")] == [
+        f"{tmp_path}",
+        f"{tmp_path}",
+        f"{tmp_path / 'src'}",
+    ]
+    assert len(load_rules(tmp_path / "src", inclusive=False)) == 2
+
+
+def test_walk_respects_gitignore(tmp_path: Path) -> None:
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".gitignore").write_text("build/\n*_pb2.py\n")
+    for name in ("build/gen.py", "src/module.py", "src/service_pb2.py"):
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).write_text(LONG_LINE)
+
+    checker = len8.Checker()
+    assert len(list(checker._walk(tmp_path))) == 3
+
+    checker.respect_gitignore = True
+    assert list(checker._walk(tmp_path)) == [tmp_path / "src" / "module.py"]
+    assert list(checker._walk(tmp_path / "src")) == [
+        tmp_path / "src" / "module.py"
+    ]
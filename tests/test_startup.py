@@ -0,0 +1,103 @@
+# Copyright (c) 2021-2022, Ethan Henderson, Jonxslays
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import subprocess  # nosec
+import sys
+import typing as t
+
+import pytest
+
+import len8
+
+# Modules which checking a couple of files never needs, and which are
+# slow to import.
+HEAVY_MODULES = (
+    "asyncio",
+    "concurrent.futures",
+    "ctypes",
+    "gzip",
+    "hashlib",
+    "importlib.metadata",
+    "json",
+    "multiprocessing",
+    "shutil",
+    "socketserver",
+    "tempfile",
+    "toml",
+    "tomllib",
+    "urllib.request",
+    "xml.sax",
+)
+
+
+def _imported(*args: str) -> t.Tuple[str, t.Set[str]]:
+    proc = subprocess.run(  # nosec
+        [sys.executable, "-X", "importtime", *args],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    modules = {
+        line.rsplit("|", 1)[-1].strip()
+        for line in proc.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+    return proc.stdout, modules
+
+
+@pytest.mark.skipif(  # type: ignore
+    sys.version_info < (3, 7), reason="-X importtime requires Python 3.7"
+)
+def test_version_startup() -> None:
+    stdout, modules = _imported("-m", "len8", "--version")
+    assert stdout.strip().endswith(f"version {len8.__version__}")
+    assert not modules.intersection(HEAVY_MODULES)
+
+
+def _modules_after(code: str) -> t.Set[str]:
+    proc = subprocess.run(  # nosec
+        [sys.executable, "-c", f"{code}\nimport sys\nprint(*sys.modules)"],
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    return set(proc.stdout.split())
+
+
+def test_import_is_lazy() -> None:
+    modules = _modules_after("import len8")
+    assert "len8.checker" not in modules
+    assert "len8.aio" not in modules
+
+    modules = _modules_after("from len8 import Checker")
+    assert "len8.checker" in modules
+    assert "len8.aio" not in modules
+    assert not modules.intersection(HEAVY_MODULES)
+    # Click imports tokenize itself, so this can only be checked here.
+    assert "tokenize" not in modules
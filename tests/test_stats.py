@@ -0,0 +1,100 @@
+# Copyright (c) 2021-2022, Ethan Henderson, Jonxslays
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import typing as t
+from pathlib import Path
+
+import pytest
+
+import len8
+
+LONG_LINE = "x = " + "1" * 90 + "\n"
+
+
+@pytest.fixture()  # type: ignore
+def tree(tmp_path: Path) -> Path:
+    (tmp_path / "venv").mkdir()
+    (tmp_path / "venv" / "lib.py").write_text(LONG_LINE)
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "a.py").write_text("x = 1\n" + LONG_LINE)
+    (tmp_path / "pkg" / "b.py").write_text("y = 2")
+    (tmp_path / "pkg" / "skip.py").write_text(LONG_LINE)
+    return tmp_path
+
+
+def test_bad_slowest() -> None:
+    with pytest.raises(ValueError) as exc:
+        len8.Stats(slowest=-1)
+    assert f"{exc.value}" == "'slowest' cannot be less than 0"
+
+
+@pytest.mark.parametrize("workers", [1, 2])  # type: ignore
+def test_stats(tree: Path, workers: int) -> None:
+    started: t.List[str] = []
+    done: t.List[t.Tuple[str, int]] = []
+    stats = len8.Stats(
+        slowest=1,
+        on_file_start=started.append,
+        on_file_done=lambda f, r, s: done.append((Path(f).name, len(r))),
+    )
+    checker = len8.Checker(exclude=["skip.py"], stats=stats, workers=workers)
+    checker.check(tree)
+
+    assert stats.files_visited == 2
+    assert stats.files_skipped == 1
+    assert stats.dirs_skipped == 1
+    assert stats.dirs_visited == 2
+    assert stats.bytes_read == len("x = 1\n" + LONG_LINE) + len("y = 2")
+    assert stats.lines_scanned == 3
+    assert stats.cache_hits == 0
+    assert set(stats.times) == {"walk", "filter", "read", "scan", "report"}
+    assert len(stats.slowest) == 1
+    assert [Path(f).name for f in started] == ["a.py", "b.py"]
+    assert done == [("a.py", 1), ("b.py", 0)]
+    assert "Checked 2 file(s) (0 from cache)" in f"{stats}"
+
+    stats.reset()
+    assert stats.files_visited == 0
+    assert stats.slowest == []
+
+
+def test_stats_with_cache(tree: Path) -> None:
+    stats = len8.Stats()
+    checker = len8.Checker(cache=len8.MemoryCache(), stats=stats)
+    checker.check(tree)
+    checker.check(tree)
+
+    assert stats.files_visited == 6
+    assert stats.cache_hits == 3
+
+
+def test_stats_disabled(tree: Path) -> None:
+    checker = len8.Checker()
+    assert checker.stats is None
+    checker.check(tree)
+    assert len(checker.reports) == 2
@@ -0,0 +1,150 @@
+# Copyright (c) 2021-2022, Ethan Henderson, Jonxslays
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+import typing as t
+from pathlib import Path
+
+import pytest
+
+import len8
+from len8.watch import Watcher, _Inotify
+
+LONG_LINE = "x = " + "1" * 90 + "\n"
+
+backends = pytest.mark.parametrize(
+    "polling",
+    [
+        True,
+        pytest.param(
+            False,
+            marks=pytest.mark.skipif(
+                not _Inotify.available(), reason="inotify is not available"
+            ),
+        ),
+    ],
+)
+
+
+@pytest.fixture()  # type: ignore
+def project(tmp_path: Path) -> Path:
+    tmp_path = tmp_path.resolve()
+    (tmp_path / "a.py").write_text(LONG_LINE)
+    (tmp_path / "b.py").write_text("b = 1\n")
+    (tmp_path / ".venv").mkdir()
+    return tmp_path
+
+
+def _paths(watcher: Watcher) -> t.List[str]:
+    return [r.path for r in watcher.reports]
+
+
+@backends  # type: ignore
+def test_watch(project: Path, polling: bool) -> None:
+    watcher = Watcher(len8.Checker(), project, interval=0.01, polling=polling)
+    assert watcher.polling is polling
+
+    with watcher:
+        assert _paths(watcher) == [f"{project / 'a.py'}"]
+
+        (project / "b.py").write_text("b = 1\n" + LONG_LINE)
+        assert watcher.poll(5) == [f"{project / 'b.py'}"]
+        assert _paths(watcher) == [
+            f"{project / 'a.py'}",
+            f"{project / 'b.py'}",
+        ]
+        assert list(watcher.reports[1].lines) == [2]
+
+        (project / "a.py").unlink()
+        assert watcher.poll(5) == [f"{project / 'a.py'}"]
+        assert _paths(watcher) == [f"{project / 'b.py'}"]
+
+        (project / "pkg").mkdir()
+        (project / "pkg" / "c.py").write_text(LONG_LINE)
+        assert f"{project / 'pkg' / 'c.py'}" in watcher.poll(5)
+        assert _paths(watcher) == [
+            f"{project / 'b.py'}",
+            f"{project / 'pkg' / 'c.py'}",
+        ]
+
+
+@backends  # type: ignore
+def test_watch_ignores_excluded(project: Path, polling: bool) -> None:
+    checker = len8.Checker(exclude=["b.py"])
+
+    with Watcher(checker, project, interval=0.01, polling=polling) as w:
+        (project / ".venv" / "site.py").write_text(LONG_LINE)
+        (project / "b.py").write_text(LONG_LINE)
+        (project / "notes.txt").write_text(LONG_LINE)
+        assert w.poll(0.3) == []
+        assert _paths(w) == [f"{project / 'a.py'}"]
+
+
+@backends  # type: ignore
+def test_watch_single_file(project: Path, polling: bool) -> None:
+    checker = len8.Checker()
+
+    with Watcher(
+        checker, project / "b.py", interval=0.01, polling=polling
+    ) as w:
+        assert w.reports == []
+
+        (project / "a.py").write_text(LONG_LINE * 2)
+        assert w.poll(0.3) == []
+
+        (project / "b.py").write_text(LONG_LINE)
+        assert w.poll(5) == [f"{project / 'b.py'}"]
+        assert _paths(w) == [f"{project / 'b.py'}"]
+
+
+@backends  # type: ignore
+def test_watch_moved_directory(
+    project: Path, tmp_path_factory: pytest.TempPathFactory, polling: bool
+) -> None:
+    (project / "pkg" / "sub").mkdir(parents=True)
+    (project / "pkg" / "sub" / "c.py").write_text(LONG_LINE)
+    outside = tmp_path_factory.mktemp("outside") / "pkg"
+    c = f"{project / 'pkg' / 'sub' / 'c.py'}"
+
+    with Watcher(len8.Checker(), project, interval=0.01, polling=polling) as w:
+        assert _paths(w) == [f"{project / 'a.py'}", c]
+
+        os.rename(project / "pkg", outside)
+        assert w.poll(5) == [c]
+        assert _paths(w) == [f"{project / 'a.py'}"]
+
+        # Moving it back under another name only lists its files once,
+        # and changes to it are still seen.
+        os.rename(outside, project / "lib")
+        moved = f"{project / 'lib' / 'sub' / 'c.py'}"
+        assert moved in w.poll(5)
+        assert _paths(w) == [f"{project / 'a.py'}", moved]
+
+        (project / "lib" / "sub" / "c.py").write_text("c = 1\n")
+        assert w.poll(5) == [moved]
+        assert _paths(w) == [f"{project / 'a.py'}"]